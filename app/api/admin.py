@@ -0,0 +1,49 @@
+import logging
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.api.schemas import ReloadRequest
+from app.core import artifacts
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin_token(x_admin_token: str | None = Header(default=None)) -> None:
+    """
+    Admin endpoints are enabled only when ADMIN_TOKEN is set
+    and must be called with a matching X-Admin-Token header.
+    """
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+@router.get("/artifacts", dependencies=[Depends(require_admin_token)])
+def artifact_status():
+    """Loaded vs published version of each hot-reloadable artifact in this worker."""
+    return {name: reloader.status() for name, reloader in artifacts.get_reloaders().items()}
+
+
+@router.post("/reload", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin_token)])
+def reload_artifacts(payload: ReloadRequest | None = None):
+    """
+    Start background reloads (all artifacts, or the ones listed).
+    Returns immediately; requests keep using the current version until the swap.
+    Note: with several uvicorn workers this reaches one worker, use ARTIFACT_POLL_SECONDS for all.
+    """
+    reloaders = artifacts.get_reloaders()
+    names = payload.artifacts if payload and payload.artifacts else list(reloaders)
+
+    unknown = [name for name in names if name not in reloaders]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown artifact: {', '.join(unknown)}")
+
+    triggered = {name: reloaders[name].trigger() for name in names}
+    logger.info("Admin reload requested artifacts=%s", triggered)
+    return {"triggered": triggered}
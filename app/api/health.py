@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core import warmup
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+def live():
+    """Process is up and serving requests (does not wait for warm-up)."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready():
+    """
+    200 once startup warm-up has finished (model, embeddings, FAISS index loaded),
+    503 before that or when a component still failed after its retries.
+    Includes per-component status and load time in seconds.
+    """
+    payload = warmup.status()
+    return JSONResponse(payload, status_code=200 if payload["ready"] else 503)
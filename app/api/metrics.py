@@ -0,0 +1,61 @@
+import os
+import secrets
+import time
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.core.metrics import HTTP_IN_FLIGHT, http_children
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(authorization: str | None = Header(default=None)) -> Response:
+    """
+    Prometheus text format. With METRICS_TOKEN set, scrapes must send
+    `Authorization: Bearer <token>` (the API is publicly reachable on Container Apps).
+    """
+    expected = os.getenv("METRICS_TOKEN")
+    if expected and not (authorization and secrets.compare_digest(authorization, f"Bearer {expected}")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """
+    Per-route request count, latency and in-flight gauge.
+
+    Plain ASGI (no BaseHTTPMiddleware task/queue overhead, streaming untouched). Routes are
+    labelled by their template (/tickets/{ticket_id}/classify), so label cardinality stays fixed;
+    requests that match no route share the label "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            requests, latency = http_children(scope["method"], getattr(route, "path", "unmatched"), str(status_code))
+            requests.inc()
+            latency.observe(elapsed)
@@ -0,0 +1,58 @@
+import logging
+
+from app.core.request_context import current, end_request, format_timings, server_timing, start_request
+
+logger = logging.getLogger(__name__)
+
+
+class RequestContextMiddleware:
+    """
+    Give every request an id and a per-stage timing breakdown.
+
+    The id is taken from an incoming X-Request-ID header (so a caller such as the mailbox
+    ingester can pick it) or generated, and is used as AuditLog.request_id. Responses carry
+    `X-Request-ID` and `Server-Timing` (stages finished before the headers were sent; for
+    streamed answers that excludes the LLM). The full breakdown is logged when the request ends.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                incoming = value.decode("latin-1")
+                break
+
+        token = start_request(incoming)
+        timings = current()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", timings.request_id.encode("latin-1")))
+                headers.append((b"server-timing", server_timing(timings).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = scope.get("route")
+            logger.info(
+                "Request finished request_id=%s method=%s route=%s status=%s timings=%s",
+                timings.request_id,
+                scope["method"],
+                getattr(route, "path", scope["path"]),
+                status_code,
+                format_timings(timings),
+            )
+            end_request(token)
@@ -1,13 +1,23 @@
-import uuid
+import json
+import re
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 import logging
 
+from app.db.database import SessionLocal
 from app.db.deps import get_db
 from app.db import models
-from app.api.schemas import TicketCreate, TicketOut, PredictionOut
-from app.core.classifier import classify_ticket
+from app.api.schemas import (
+    TicketCreate, TicketOut, PredictionOut, BatchClassifyRequest, BatchPredictionOut, FeedbackCreate, FeedbackOut,
+)
+from app.core.classifier import classify_ticket_async, classify_tickets
+from app.core.executors import run_cpu
+from app.core.metrics import stage
+from app.core.request_context import current_request_id, format_timings
 from app.core.utils import sha256_text
+from app.ml.model import CATEGORY_PRIORITIES, priority_from_category
 from app.auth.dependencies import get_current_user
 
 logger = logging.getLogger(__name__)
@@ -51,23 +61,21 @@ def get_ticket(ticket_id: str, db: Session = Depends(get_db), current_user=Depen
 
 
 @router.post("/tickets/{ticket_id}/classify", response_model=PredictionOut)
-def classify(ticket_id: str, db: Session = Depends(get_db), current_user=Depends(get_current_user),):
+async def classify(ticket_id: str, db: Session = Depends(get_db), current_user=Depends(get_current_user),):
     """
     Run classification for a ticket.
     Stores prediction + audit log.
+
+    Async: DB work runs in the threadpool, inference goes through the
+    micro-batcher / CPU pool, so the event loop is never blocked.
     """
     
     logger.info("Classification requested ticket_id=%s user_id=%s", ticket_id, current_user.id)
     
-    ticket = db.get(models.Ticket, ticket_id)
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket not found")
-    
-    if ticket.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
+    ticket = await run_in_threadpool(_get_owned_ticket, db, ticket_id, current_user)
 
-    request_id = str(uuid.uuid4())
-    result = classify_ticket(ticket.subject or "", ticket.body or "")
+    request_id = current_request_id()
+    result = await classify_ticket_async(ticket.subject or "", ticket.body or "")
     
     logger.info(
         "Classification completed ticket_id=%s category=%s priority=%s model=%s",
@@ -77,8 +85,26 @@ def classify(ticket_id: str, db: Session = Depends(get_db), current_user=Depends
         result.model_version,
     )
 
+    prediction_id = await run_in_threadpool(_store_classification, db, ticket, result, request_id, current_user.id)
+    return PredictionOut(prediction_id=prediction_id, **result.__dict__)
+
+
+def _get_owned_ticket(db: Session, ticket_id: str, current_user) -> models.Ticket:
+    with stage("db_fetch"):
+        ticket = db.get(models.Ticket, ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    
+    if ticket.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return ticket
+
+
+def _store_classification(db: Session, ticket: models.Ticket, result, request_id: str, actor: str) -> str:
     # Store prediction
     pred = models.TicketPrediction(
+        id=models.gen_uuid(),
         ticket_id=ticket.id,
         category=result.category,
         priority=result.priority,
@@ -92,58 +118,304 @@ def classify(ticket_id: str, db: Session = Depends(get_db), current_user=Depends
     audit = models.AuditLog(
         request_id=request_id,
         action="ticket.classify",
-        actor=current_user.id,
+        actor=actor,
         input_hash=input_hash,
-        details=(
-            f"category={result.category};"
-            f"priority={result.priority};"
-            f"confidence={result.confidence};"
-            f"model_version={result.model_version}"
-        ),
+        details=_classification_details(result),
     )
     db.add(audit)
 
     db.commit()
-    return PredictionOut(**result.__dict__)
+    return pred.id
+
+
+@router.post("/tickets/classify:batch", response_model=list[BatchPredictionOut])
+async def classify_batch(payload: BatchClassifyRequest, db: Session = Depends(get_db), current_user=Depends(get_current_user),):
+    """
+    Run classification for many tickets in one call.
+    The model runs once over all texts; predictions + audit logs are stored in a single transaction.
+    Results are returned in the order of `ticket_ids`.
+
+    Async like /classify: DB work runs in the threadpool, the model call on the bounded CPU pool.
+    """
+
+    logger.info("Batch classification requested tickets=%s user_id=%s", len(payload.ticket_ids), current_user.id)
+
+    tickets = await run_in_threadpool(_get_owned_tickets, db, payload.ticket_ids, current_user)
+
+    request_id = current_request_id()
+    results = await run_cpu(classify_tickets, [(t.subject or "", t.body or "") for t in tickets])
+
+    prediction_ids = await run_in_threadpool(
+        _store_batch_classification, db, tickets, results, request_id, current_user.id
+    )
+
+    logger.info("Batch classification completed tickets=%s request_id=%s", len(tickets), request_id)
+
+    # Tickets are in payload order; their ids come from the payload (the commit expired the ORM objects)
+    return [
+        BatchPredictionOut(ticket_id=ticket_id, prediction_id=prediction_id, **result.__dict__)
+        for ticket_id, result, prediction_id in zip(payload.ticket_ids, results, prediction_ids)
+    ]
+
+
+def _get_owned_tickets(db: Session, ticket_ids: list[str], current_user) -> list[models.Ticket]:
+    # In the order of `ticket_ids`; any unknown or foreign ticket fails the whole batch
+    with stage("db_fetch"):
+        found = db.query(models.Ticket).filter(models.Ticket.id.in_(set(ticket_ids))).all()
+    tickets_by_id = {t.id: t for t in found}
+
+    tickets = []
+    for ticket_id in ticket_ids:
+        ticket = tickets_by_id.get(ticket_id)
+        if not ticket:
+            raise HTTPException(status_code=404, detail=f"Ticket not found: {ticket_id}")
+        if ticket.owner_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Access denied")
+        tickets.append(ticket)
+    return tickets
+
+
+def _store_batch_classification(db: Session, tickets: list[models.Ticket], results, request_id: str, actor: str) -> list[str]:
+    prediction_ids = []
+    for ticket, result in zip(tickets, results):
+        prediction_ids.append(models.gen_uuid())
+        db.add(models.TicketPrediction(
+            id=prediction_ids[-1],
+            ticket_id=ticket.id,
+            category=result.category,
+            priority=result.priority,
+            confidence=result.confidence,
+            model_version=result.model_version,
+        ))
+        db.add(models.AuditLog(
+            request_id=request_id,
+            action="ticket.classify",
+            actor=actor,
+            input_hash=sha256_text(f"{ticket.subject}\n{ticket.body}"),
+            details=_classification_details(result),
+        ))
+
+    db.commit()
+    return prediction_ids
+
+
+@router.post("/predictions/{prediction_id}/feedback", response_model=FeedbackOut, status_code=201)
+def record_feedback(prediction_id: str, payload: FeedbackCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user),):
+    """
+    Record an agent's corrected category / priority for a stored prediction.
+    Pending corrections are folded into the model by the feedback updater (app/ml/feedback.py).
+    """
+    with stage("db_fetch"):
+        prediction = db.get(models.TicketPrediction, prediction_id)
+        owner_id = prediction.ticket.owner_id if prediction else None
+    if not prediction:
+        raise HTTPException(status_code=404, detail="Prediction not found")
+
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    if payload.category not in CATEGORY_PRIORITIES:
+        raise HTTPException(status_code=422, detail=f"Unknown category: {payload.category}")
+
+    feedback = models.PredictionFeedback(
+        prediction_id=prediction.id,
+        category=payload.category,
+        priority=payload.priority or priority_from_category(payload.category),
+        actor=current_user.id,
+    )
+    db.add(feedback)
+    db.add(models.AuditLog(
+        request_id=current_request_id(),
+        action="ticket.feedback",
+        actor=current_user.id,
+        details=(
+            f"prediction_id={prediction.id};"
+            f"predicted={prediction.category}/{prediction.priority};"
+            f"corrected={feedback.category}/{feedback.priority};"
+            f"model_version={prediction.model_version}"
+        ),
+    ))
+    db.commit()
+    db.refresh(feedback)
 
+    logger.info(
+        "Feedback recorded prediction_id=%s predicted=%s corrected=%s user_id=%s",
+        prediction.id,
+        prediction.category,
+        feedback.category,
+        current_user.id,
+    )
+    return feedback
 
 
-from app.rag.query import rag_answer, IndexNotReadyError
-from app.llm.synthesis import synthesize_answer
+def _classification_details(result) -> str:
+    # timings: per-stage milliseconds of this request so far (see app/core/request_context.py)
+    return (
+        f"category={result.category};"
+        f"priority={result.priority};"
+        f"confidence={result.confidence};"
+        f"model_version={result.model_version};"
+        f"timings={format_timings()}"
+    )
+
+
+
+from app.rag.errors import IndexNotReadyError
+from app.llm.synthesis import synthesize_answer_async, stream_answer_async
+
+def rag_answer(question: str, k: int = 3) -> dict:
+    # The RAG stack (langchain, faiss, torch) is imported on first use (or by the startup
+    # warm-up), so the API starts serving before it is loaded
+    from app.rag.query import rag_answer as _rag_answer
+    return _rag_answer(question, k=k)
+
 
 @router.post("/tickets/{ticket_id}/answer")
-def suggest_answer(ticket_id: str, db: Session = Depends(get_db),current_user=Depends(get_current_user),):
+async def suggest_answer(ticket_id: str, db: Session = Depends(get_db),current_user=Depends(get_current_user),):
+    """
+    Suggest a grounded reply.
+    Embedding + FAISS search run on the bounded CPU pool, the LLM call is async I/O,
+    so slow LLM calls do not occupy threads needed by cheap endpoints.
+    """
     
     logger.info("Answer generation requested ticket_id=%s user_id=%s", ticket_id, current_user.id)
     
-    ticket = db.get(models.Ticket, ticket_id)
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket not found")
-    
-    if ticket.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
+    ticket = await run_in_threadpool(_get_owned_ticket, db, ticket_id, current_user)
 
     ticket_text = f"{ticket.subject}\n{ticket.body}"
 
     try:
-        result = rag_answer(ticket_text)
+        result = await run_cpu(rag_answer, ticket_text)
     except IndexNotReadyError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     # Try LLM synthesis; fallback to extractive answer if not configured
-    llm_answer = synthesize_answer(ticket_text, result["sources"])
-    final_answer = llm_answer if llm_answer else result["answer"]
+    llm_answer = await synthesize_answer_async(ticket_text, result["sources"])
+    final_answer = llm_answer.text if llm_answer else result["answer"]
+    answer_mode = _answer_mode(llm_answer)
     
     logger.info(
-        "Answer generated ticket_id=%s answer_mode=%s sources=%s",
+        "Answer generated ticket_id=%s answer_mode=%s sources=%s reranked=%s",
         ticket_id,
-        "llm" if llm_answer else "extractive",
+        answer_mode,
         len(result["sources"]),
+        result.get("reranked", False),
     )
 
+    await run_in_threadpool(_store_answer_audit, db, ticket, result, answer_mode, current_user.id)
+
     return {
         "ticket_id": ticket.id,
         "suggested_answer": final_answer,
         "sources": result["sources"],
-        "answer_mode": "llm" if llm_answer else "extractive",  
+        "answer_mode": answer_mode,
+        "reranked": result.get("reranked", False),
     }
+
+
+def _store_answer_audit(db: Session, ticket: models.Ticket, result: dict, answer_mode: str, actor: str) -> None:
+    db.add(models.AuditLog(
+        request_id=current_request_id(),
+        action="ticket.answer",
+        actor=actor,
+        input_hash=sha256_text(f"{ticket.subject}\n{ticket.body}"),
+        details=(
+            f"ticket_id={ticket.id};"
+            f"answer_mode={answer_mode};"
+            f"sources={len(result['sources'])};"
+            f"reranked={result.get('reranked', False)};"
+            f"timings={format_timings()}"
+        ),
+    ))
+    db.commit()
+
+
+def _answer_mode(llm_answer) -> str:
+    # "llm_cached" = served from the answer cache without a new LLM call
+    if llm_answer is None:
+        return "extractive"
+    return "llm_cached" if llm_answer.cached else "llm"
+
+
+@router.post("/tickets/{ticket_id}/answer/stream")
+async def suggest_answer_stream(ticket_id: str, db: Session = Depends(get_db),current_user=Depends(get_current_user),):
+    """
+    Streaming variant of /answer (Server-Sent Events).
+
+    Events, in order:
+    - `sources`: retrieved KB sources, sent as soon as retrieval is done
+    - `token`:   answer text chunks as the LLM produces them (extractive answer is chunked too)
+    - `done`:    final `answer_mode` + the full `suggested_answer`
+    - `error`:   sent instead of `done` if generation fails mid-stream
+    """
+
+    logger.info("Streaming answer requested ticket_id=%s user_id=%s", ticket_id, current_user.id)
+
+    ticket = await run_in_threadpool(_get_owned_ticket, db, ticket_id, current_user)
+
+    ticket_text = f"{ticket.subject}\n{ticket.body}"
+
+    # Retrieval errors are still reported as a plain HTTP 400 before the stream starts
+    try:
+        result = await run_cpu(rag_answer, ticket_text)
+    except IndexNotReadyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        yield _sse_event(
+            "sources",
+            {"ticket_id": ticket.id, "sources": result["sources"], "reranked": result.get("reranked", False)},
+        )
+
+        parts = []
+        try:
+            llm_stream = await stream_answer_async(ticket_text, result["sources"])
+            if llm_stream is None:
+                answer_mode = "extractive"
+                for piece in _text_chunks(result["answer"]):
+                    parts.append(piece)
+                    yield _sse_event("token", {"text": piece})
+            else:
+                answer_mode = "llm_cached" if llm_stream.cached else "llm"
+                async for piece in llm_stream.chunks:
+                    parts.append(piece)
+                    yield _sse_event("token", {"text": piece})
+        except Exception:
+            logger.exception("Streaming answer failed ticket_id=%s", ticket_id)
+            yield _sse_event("error", {"detail": "Answer generation failed"})
+            return
+
+        logger.info(
+            "Streaming answer generated ticket_id=%s answer_mode=%s sources=%s",
+            ticket_id,
+            answer_mode,
+            len(result["sources"]),
+        )
+        # The request's session is closed once the response has started, so the audit gets its own.
+        # The answer is already out: a failed audit write is logged, not sent as a stream error.
+        try:
+            with SessionLocal() as audit_db:
+                await run_in_threadpool(_store_answer_audit, audit_db, ticket, result, answer_mode, current_user.id)
+        except Exception:
+            logger.exception("Answer audit failed ticket_id=%s", ticket_id)
+        # Server-Timing went out with the headers, before the LLM ran; `timings` has the full breakdown
+        yield _sse_event(
+            "done",
+            {"answer_mode": answer_mode, "suggested_answer": "".join(parts).strip(), "timings": format_timings()},
+        )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _text_chunks(text: str, words_per_chunk: int = 8) -> list[str]:
+    # Split into small word groups, keeping the original whitespace
+    words = re.findall(r"\S+\s*|\s+", text)
+    return ["".join(words[i:i + words_per_chunk]) for i in range(0, len(words), words_per_chunk)]
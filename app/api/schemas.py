@@ -32,3 +32,30 @@ class PredictionOut(BaseModel):
     priority: int        # priority level (1 = highest)
     confidence: float    # model confidence (0.0 - 1.0)
     model_version: str   # which model produced the prediction
+    prediction_id: str | None = None   # stored prediction, for corrections (POST /predictions/{id}/feedback)
+
+class BatchClassifyRequest(BaseModel):
+    # Input for bulk classification (POST /tickets/classify:batch)
+    ticket_ids: list[str] = Field(min_length=1, max_length=1000)
+
+class BatchPredictionOut(PredictionOut):
+    # One classification result per requested ticket, in request order
+    ticket_id: str
+
+class FeedbackCreate(BaseModel):
+    # Agent correction for a stored prediction (POST /predictions/{prediction_id}/feedback)
+    category: str = Field(min_length=1, max_length=80)
+    priority: int | None = Field(default=None, ge=1, le=4)   # default: derived from category
+
+class FeedbackOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    prediction_id: str
+    category: str
+    priority: int
+    applied_version: str | None = None   # model version that includes the correction (None = pending)
+
+class ReloadRequest(BaseModel):
+    # Artifacts to reload (POST /admin/reload); empty = all
+    artifacts: list[str] = Field(default_factory=list)
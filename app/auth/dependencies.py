@@ -4,6 +4,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.auth.security import SECRET_KEY, ALGORITHM
+from app.core.metrics import stage
 from app.db.deps import get_db
 from app.db import models
 
@@ -16,9 +17,13 @@ def get_current_user(
 ):
     """
     Resolve the currently authenticated user from a bearer token.
+    Token check + user lookup are timed as stage "auth".
     """
-    token = credentials.credentials
+    with stage("auth"):
+        return _resolve_user(credentials.credentials, db)
 
+
+def _resolve_user(token: str, db: Session):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
@@ -0,0 +1,199 @@
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Versioned artifact layout (FAISS index, classifier model):
+#   <root>/versions/<version>/...   immutable, one directory per published version
+#   <root>/CURRENT                  name of the active version, replaced atomically
+# A root without CURRENT is the legacy flat layout and is used as-is.
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+
+
+def current_version(root: str | Path) -> str | None:
+    pointer = Path(root) / CURRENT_FILE
+    if not pointer.exists():
+        return None
+    return pointer.read_text(encoding="utf-8").strip() or None
+
+
+def version_dir(root: str | Path, version: str | None) -> Path:
+    """Directory of a version (the root itself for the legacy flat layout)."""
+    if version is None:
+        return Path(root)
+    return Path(root) / VERSIONS_DIR / version
+
+
+def current_dir(root: str | Path) -> Path:
+    """Directory of the active version."""
+    return version_dir(root, current_version(root))
+
+
+def staging_dir(root: str | Path) -> Path:
+    """Fresh directory to write a new version into before it is published."""
+    path = Path(root) / VERSIONS_DIR / f".staging-{uuid.uuid4().hex[:8]}"
+    path.mkdir(parents=True)
+    return path
+
+
+def activate(root: str | Path, version: str) -> None:
+    # os.replace is atomic: readers see either the old or the new pointer, never a partial file
+    root = Path(root)
+    tmp = root / f"{CURRENT_FILE}.{uuid.uuid4().hex[:8]}.tmp"
+    tmp.write_text(version, encoding="utf-8")
+    os.replace(tmp, root / CURRENT_FILE)
+
+
+def publish(root: str | Path, staging: Path, version: str, keep: int | None = None) -> Path:
+    """
+    Move a fully written staging directory to versions/<version> and make it current.
+    Older versions beyond `keep` (default ARTIFACT_KEEP_VERSIONS, 3) are removed.
+    """
+    target = Path(root) / VERSIONS_DIR / version
+    if target.exists():
+        # Same content was published before (versions are content hashes)
+        shutil.rmtree(staging)
+    else:
+        os.replace(staging, target)
+    activate(root, version)
+    _prune(root, keep=keep if keep is not None else int(os.getenv("ARTIFACT_KEEP_VERSIONS", "3")))
+    return target
+
+
+def _prune(root: str | Path, keep: int) -> None:
+    active = current_version(root)
+    versions = sorted(
+        (p for p in (Path(root) / VERSIONS_DIR).iterdir() if p.is_dir() and not p.name.startswith(".")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for path in versions[max(keep, 1):]:
+        if path.name != active:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class HotReloader:
+    """
+    Reloads one artifact in a background thread when a new version is published.
+
+    `reload` loads the current version and swaps it in (a single reference assignment),
+    so requests already running keep the object they started with and no request waits on the load.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        root: Callable[[], str | Path],
+        loaded_version: Callable[[], str | None],
+        reload: Callable[[], str | None],
+    ):
+        self.name = name
+        self._root = root
+        self._loaded_version = loaded_version
+        self._reload = reload
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.last_error: str | None = None
+        self.last_reload_seconds: float | None = None
+
+    def is_stale(self) -> bool:
+        # Nothing loaded yet: the first (lazy) load picks up the current version anyway
+        loaded = self._loaded_version()
+        current = current_version(self._root())
+        return loaded is not None and current is not None and current != loaded
+
+    def trigger(self) -> bool:
+        """Start a background reload; False if one is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._run, name=f"reload-{self.name}", daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout: float | None = None) -> None:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            version = self._reload()
+            self.last_error = None
+            logger.info("Reloaded artifact=%s version=%s", self.name, version)
+        except Exception as e:
+            # Keep serving the previous version
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.exception("Reload failed artifact=%s", self.name)
+        finally:
+            self.last_reload_seconds = time.perf_counter() - started
+
+    def status(self) -> dict:
+        thread = self._thread
+        return {
+            "loaded_version": self._loaded_version(),
+            "current_version": current_version(self._root()),
+            "reloading": thread is not None and thread.is_alive(),
+            "last_reload_seconds": self.last_reload_seconds,
+            "last_error": self.last_error,
+        }
+
+
+_reloaders: dict[str, HotReloader] = {}
+_watcher: threading.Thread | None = None
+_watcher_stop = threading.Event()
+
+
+def register(reloader: HotReloader) -> None:
+    _reloaders[reloader.name] = reloader
+
+
+def get_reloaders() -> dict[str, HotReloader]:
+    return dict(_reloaders)
+
+
+def check_for_updates() -> list[str]:
+    """Trigger a background reload for every artifact whose CURRENT pointer moved."""
+    triggered = []
+    for name, reloader in _reloaders.items():
+        if reloader.is_stale() and reloader.trigger():
+            triggered.append(name)
+    return triggered
+
+
+def _watch(poll_seconds: float) -> None:
+    while not _watcher_stop.wait(poll_seconds):
+        try:
+            check_for_updates()
+        except Exception:
+            logger.exception("Artifact watcher check failed")
+
+
+def start_watcher() -> None:
+    """
+    ARTIFACT_POLL_SECONDS: how often each worker checks the CURRENT pointers (0 disables;
+    reloads can still be triggered via POST /admin/reload).
+    """
+    global _watcher
+    poll_seconds = float(os.getenv("ARTIFACT_POLL_SECONDS", "0"))
+    if poll_seconds <= 0 or (_watcher is not None and _watcher.is_alive()):
+        return
+    _watcher_stop.clear()
+    _watcher = threading.Thread(target=_watch, args=(poll_seconds,), name="artifact-watcher", daemon=True)
+    _watcher.start()
+
+
+def stop_watcher() -> None:
+    global _watcher
+    _watcher_stop.set()
+    if _watcher is not None:
+        _watcher.join(timeout=5)
+    _watcher = None
@@ -0,0 +1,137 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable
+
+from app.core.metrics import BATCH_SIZE, BATCHES
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collect single items submitted from many threads and process them in batches.
+
+    A background worker waits for the first item, then keeps gathering items
+    until `window_ms` has passed or `max_batch_size` is reached, and calls
+    `fn(items)` once. `fn` must return one result per item, in the same order.
+    Each caller gets a Future with its own result, so the extra latency per call
+    is bounded by the window plus one batch execution.
+    Batch sizes go to ticketcopilot_batch_size{batcher=name} on /metrics.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[list[Any]], list[Any]],
+        window_ms: float,
+        max_batch_size: int,
+        name: str = "micro-batcher",
+    ):
+        self._fn = fn
+        self._window = max(window_ms, 0.0) / 1000.0
+        self._max_batch_size = max(int(max_batch_size), 1)
+        self._name = name
+
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._max_seen = 0
+        self._last_size = 0
+
+        self._size_metric = BATCH_SIZE.labels(name)
+        self._ok_metric = BATCHES.labels(name, "ok")
+        self._error_metric = BATCHES.labels(name, "error")
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item and return a Future resolved with its result."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def stats(self) -> dict:
+        """Batch-size statistics since process start."""
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "mean_batch_size": (self._items / self._batches) if self._batches else 0.0,
+                "max_batch_size": self._max_seen,
+                "last_batch_size": self._last_size,
+                "window_ms": self._window * 1000.0,
+                "max_batch_size_limit": self._max_batch_size,
+            }
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> list[tuple[Any, Future]]:
+        # Block until at least one item is there, then fill the batch until the window closes
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._window
+
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    # Window is over: still take whatever is already waiting, but don't wait for more
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+
+            self._size_metric.observe(len(batch))
+
+            try:
+                results = list(self._fn(items))
+                if len(results) != len(batch):
+                    # zip() would leave some callers waiting forever, and the order is unreliable anyway
+                    raise RuntimeError(f"{self._name}: {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                logger.exception("Batch failed name=%s size=%s", self._name, len(batch))
+                self._error_metric.inc()
+                for _, future in batch:
+                    _resolve(future, exception=e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                _resolve(future, result)
+            self._ok_metric.inc()
+
+            with self._stats_lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._max_seen = max(self._max_seen, len(batch))
+                self._last_size = len(batch)
+
+            logger.debug("Batch processed name=%s size=%s", self._name, len(batch))
+
+
+def _resolve(future: Future, result: Any = None, exception: BaseException | None = None) -> None:
+    # A caller may have cancelled its future (e.g. a disconnected request): the worker must survive it
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
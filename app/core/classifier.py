@@ -1,5 +1,14 @@
+import asyncio
+import os
+import threading
+import time
 from dataclasses import dataclass
-from app.ml.model import load_model, predict, priority_from_category, MODEL_VERSION
+from app.core import artifacts
+from app.core.batching import MicroBatcher
+from app.core.executors import run_cpu
+from app.core.metrics import stage
+from app.core.request_context import record_timing
+from app.ml.model import load_model, predict, predict_batch, priority_from_category, MODEL_DIR, MODEL_FILE, MODEL_VERSION
 
 @dataclass
 class ClassificationResult:
@@ -8,24 +17,130 @@ class ClassificationResult:
     confidence: float
     model_version: str
 
+# (model, version) swapped as one tuple, so a prediction always reports the version that made it
 _model = None
+_batcher = None
+_batcher_lock = threading.Lock()
 
 def _get_model():
+    return _get_loaded_model()[0]
+
+def _get_loaded_model() -> tuple:
     global _model
-    if _model is None:
-        _model = load_model()
+    if _model is None or _model[0] is None:
+        _model = _load_current_model()
     return _model
 
+def _load_current_model() -> tuple:
+    # Resolve CURRENT once so the version label matches the loaded file;
+    # models in the legacy flat layout report MODEL_VERSION
+    version = artifacts.current_version(MODEL_DIR)
+    model = load_model(artifacts.version_dir(MODEL_DIR, version) / MODEL_FILE)
+    return model, (version or MODEL_VERSION)
+
+def reload_model() -> str | None:
+    """
+    Load the model CURRENT points to and swap it in (runs in a background thread).
+    Calls already predicting finish on the model reference they hold.
+    """
+    global _model
+    loaded = _load_current_model()
+    if loaded[0] is None:
+        raise FileNotFoundError(f"No model found under {MODEL_DIR}")
+    _model = loaded
+    return loaded[1]
+
+def loaded_model_version() -> str | None:
+    # None before the first load (or when there is no model and rules are used)
+    loaded = _model
+    if loaded is None or loaded[0] is None:
+        return None
+    return loaded[1]
+
+artifacts.register(artifacts.HotReloader("classifier_model", lambda: MODEL_DIR, loaded_model_version, reload_model))
+
+def _get_batcher() -> MicroBatcher | None:
+    """
+    Lazily build the micro-batcher for concurrent classify calls.
+
+    CLASSIFY_BATCH_WINDOW_MS: how long to gather requests into one batch (0 disables batching)
+    CLASSIFY_MAX_BATCH_SIZE: flush earlier when this many requests are waiting
+    """
+    global _batcher
+    if _batcher is None:
+        window_ms = float(os.getenv("CLASSIFY_BATCH_WINDOW_MS", "2"))
+        max_batch_size = int(os.getenv("CLASSIFY_MAX_BATCH_SIZE", "32"))
+        if window_ms <= 0 or max_batch_size <= 1:
+            return None
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = MicroBatcher(
+                    classify_tickets,
+                    window_ms=window_ms,
+                    max_batch_size=max_batch_size,
+                    name="classify-batcher",
+                )
+    return _batcher
+
+def batch_stats() -> dict:
+    """Batch-size stats of the classify micro-batcher (empty when batching is disabled)."""
+    batcher = _get_batcher()
+    return batcher.stats() if batcher is not None else {}
+
+def _ticket_text(subject: str, body: str) -> str:
+    return f"{subject} {body}".strip()
+
 def classify_ticket(subject: str, body: str) -> ClassificationResult:
-    text = f"{subject} {body}".strip()
+    # Concurrent callers are merged into one vectorized predict_proba call
+    batcher = _get_batcher()
+    if batcher is not None:
+        started = time.perf_counter()
+        result = batcher.submit((subject, body)).result()
+        record_timing("inference", time.perf_counter() - started)
+        return result
+
+    text = _ticket_text(subject, body)
 
-    model = _get_model()
+    model, version = _get_loaded_model()
     if model is not None:
-        cat, conf = predict(model, text)
+        with stage("inference"):
+            cat, conf = predict(model, text)
         prio = priority_from_category(cat)
-        return ClassificationResult(cat, prio, conf, MODEL_VERSION)
+        return ClassificationResult(cat, prio, conf, version)
+
+    return _classify_with_rules(text)
+
+async def classify_ticket_async(subject: str, body: str) -> ClassificationResult:
+    # Await the batch result without holding a thread; otherwise run on the CPU pool
+    batcher = _get_batcher()
+    if batcher is not None:
+        # The batch is timed on the batcher thread; the request records its own wait, queueing included
+        started = time.perf_counter()
+        result = await asyncio.wrap_future(batcher.submit((subject, body)))
+        record_timing("inference", time.perf_counter() - started)
+        return result
+    return await run_cpu(classify_ticket, subject, body)
+
+def classify_tickets(items: list[tuple[str, str]]) -> list[ClassificationResult]:
+    """
+    Classify many (subject, body) pairs at once.
+    The ML pipeline runs a single predict_proba over all texts; results keep input order.
+    """
+    texts = [_ticket_text(subject, body) for subject, body in items]
+
+    model, version = _get_loaded_model()
+    if model is not None:
+        with stage("inference"):
+            predictions = predict_batch(model, texts)
+        return [
+            ClassificationResult(cat, priority_from_category(cat), conf, version)
+            for cat, conf in predictions
+        ]
+
+    return [_classify_with_rules(text) for text in texts]
 
-    # Fallback 
+def _classify_with_rules(text: str) -> ClassificationResult:
+    # Fallback
     lower = text.lower()
     if any(k in lower for k in ["vpn", "login", "password", "account locked"]):
         return ClassificationResult("access", 2, 0.62, "rules-v0")
@@ -0,0 +1,64 @@
+import asyncio
+import contextvars
+import functools
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import anyio.to_thread
+
+from app.core.metrics import CPU_IN_FLIGHT
+
+# Dedicated, bounded pools so expensive endpoints cannot starve cheap ones:
+# - CPU_POOL_SIZE: threads for embedding / FAISS search / model inference
+# - LLM_MAX_CONCURRENCY: concurrent in-flight LLM calls per worker (async, no threads)
+# - SYNC_POOL_SIZE: FastAPI's default threadpool used by plain `def` endpoints and dependencies
+
+_cpu_executor: ThreadPoolExecutor | None = None
+_llm_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _cpu_pool_size() -> int:
+    return int(os.getenv("CPU_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    global _cpu_executor
+    if _cpu_executor is None:
+        _cpu_executor = ThreadPoolExecutor(max_workers=_cpu_pool_size(), thread_name_prefix="cpu")
+    return _cpu_executor
+
+
+async def run_cpu(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking, CPU-heavy call on the dedicated CPU pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    # Copy contextvars so request-scoped state is visible inside the worker thread
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    with CPU_IN_FLIGHT.track_inprogress():
+        return await loop.run_in_executor(get_cpu_executor(), call)
+
+
+def llm_semaphore() -> asyncio.Semaphore:
+    """Per-event-loop semaphore bounding concurrent LLM calls."""
+    loop = asyncio.get_running_loop()
+    sem = _llm_semaphores.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "16")))
+        _llm_semaphores[loop] = sem
+    return sem
+
+
+def configure_threadpool() -> None:
+    """Resize the default threadpool used for sync endpoints (call from inside the event loop)."""
+    size = os.getenv("SYNC_POOL_SIZE")
+    if size:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = int(size)
+
+
+def shutdown_executors() -> None:
+    global _cpu_executor
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=False, cancel_futures=True)
+        _cpu_executor = None
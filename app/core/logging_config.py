@@ -1,5 +1,7 @@
 import logging
 
+from app.core.request_context import current
+
 
 def mask_email(email: str) -> str:
     """
@@ -20,12 +22,25 @@ def mask_email(email: str) -> str:
     return f"{masked_local}@{domain}"
 
 
+class RequestIdFilter(logging.Filter):
+    """Add `request_id` of the request being served ("-" outside requests) to every record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        timings = current()
+        record.request_id = timings.request_id if timings is not None else "-"
+        return True
+
+
 def configure_logging() -> None:
     """
     Configure application-wide logging.
     Logs are sent to stdout, which works well both locally and in Azure.
+    Each line carries the request id, matching AuditLog.request_id and the X-Request-ID header.
     """
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    )
\ No newline at end of file
+        format="%(asctime)s | %(levelname)s | %(name)s | %(request_id)s | %(message)s",
+    )
+    for handler in logging.getLogger().handlers:
+        if not any(isinstance(f, RequestIdFilter) for f in handler.filters):
+            handler.addFilter(RequestIdFilter())
\ No newline at end of file
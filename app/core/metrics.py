@@ -0,0 +1,131 @@
+"""
+Prometheus metrics (scraped from GET /metrics, see app/api/metrics.py).
+
+Hot-path cost is one lock + a few float adds per observation: label children are bound once,
+cache hit/miss counts are read from the caches' own counters at scrape time.
+Stage timings also go into the current request's breakdown (app/core/request_context.py).
+"""
+import sys
+import time
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from app.core.request_context import record_timing
+
+# Spans a ~50 µs NumPy prediction up to a multi-second LLM call
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template (streamed bodies included)",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served")
+# Bounded: route templates x methods x status codes
+_http_children: dict[tuple[str, str, str], tuple] = {}
+
+STAGES = ("auth", "db_fetch", "inference", "embedding", "vector_search", "rerank", "llm", "db_commit")
+STAGE_LATENCY = Histogram(
+    "ticketcopilot_stage_duration_seconds", "Time spent per processing stage",
+    ["stage"], buckets=LATENCY_BUCKETS,
+)
+_stage_children = {name: STAGE_LATENCY.labels(name) for name in STAGES}
+
+# Micro-batcher batches (app/core/batching.py); the histogram _sum is the number of items
+BATCH_SIZE = Histogram(
+    "ticketcopilot_batch_size", "Items per micro-batch",
+    ["batcher"], buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+BATCHES = Counter("ticketcopilot_batches", "Micro-batches run, by outcome (ok / error)", ["batcher", "outcome"])
+
+LLM_IN_FLIGHT = Gauge("ticketcopilot_llm_calls_in_flight", "Azure OpenAI calls waiting for a response")
+CPU_IN_FLIGHT = Gauge("ticketcopilot_cpu_tasks_in_flight", "Calls queued or running on the CPU pool")
+
+
+def observe_stage(name: str, seconds: float) -> None:
+    _stage_children[name].observe(seconds)
+    record_timing(name, seconds)
+
+
+class stage:
+    """
+    Time the block into ticketcopilot_stage_duration_seconds{stage=name} and the request breakdown.
+    A plain class rather than @contextmanager: no generator per call.
+    """
+
+    __slots__ = ("_name", "_histogram", "_started")
+
+    def __init__(self, name: str):
+        self._name = name
+        self._histogram = _stage_children[name]
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self._started
+        self._histogram.observe(elapsed)
+        record_timing(self._name, elapsed)
+
+
+def http_children(method: str, route: str, status: str) -> tuple:
+    """(request counter, latency histogram) children, bound once per label combination."""
+    key = (method, route, status)
+    children = _http_children.get(key)
+    if children is None:
+        children = _http_children[key] = (HTTP_REQUESTS.labels(method, route, status), HTTP_LATENCY.labels(method, route))
+    return children
+
+
+class _CacheCollector:
+    """Hit / miss totals and hit ratio of the in-process caches, read when scraped."""
+
+    def collect(self):
+        hits = CounterMetricFamily("ticketcopilot_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("ticketcopilot_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("ticketcopilot_cache_hit_ratio", "Cache hits / lookups since start", labels=["cache"])
+        for name, stats in _cache_stats().items():
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            ratio.add_metric([name], stats["hit_ratio"])
+        yield from (hits, misses, ratio)
+
+
+def _cache_stats() -> dict[str, dict]:
+    # Only caches that exist already: scraping must not import langchain / FAISS
+    stats = {}
+    query = sys.modules.get("app.rag.query")
+    if query is not None:
+        for name, cache in (("query_embeddings", query._embedding_cache), ("retrieval", query._retrieval_cache)):
+            if cache is not None:
+                stats[name] = cache.stats()
+    llm_cache = sys.modules.get("app.llm.cache")
+    if llm_cache is not None and llm_cache._cache is not None:
+        stats["llm_answers"] = llm_cache._cache.stats()
+    return stats
+
+
+REGISTRY.register(_CacheCollector())
+
+
+def _before_commit(session) -> None:
+    session.info["commit_started"] = time.perf_counter()
+
+
+def _after_commit(session) -> None:
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        observe_stage("db_commit", time.perf_counter() - started)
+
+
+def instrument_sessions(session_factory) -> None:
+    """Record every ORM commit (flush + COMMIT) of sessions from `session_factory` as stage db_commit."""
+    from sqlalchemy import event
+
+    if not event.contains(session_factory, "before_commit", _before_commit):
+        event.listen(session_factory, "before_commit", _before_commit)
+        event.listen(session_factory, "after_commit", _after_commit)
@@ -0,0 +1,76 @@
+"""
+Request id and per-stage timing breakdown of the request being served.
+
+Set by RequestContextMiddleware (app/api/request_context.py); stages timed with
+app.core.metrics.stage add to it. Context variables follow the request into the threadpool
+and the CPU pool (both copy the context), and the timings dict is shared, not copied.
+"""
+import re
+import time
+import uuid
+from contextvars import ContextVar
+
+# Accepted from the X-Request-ID header; anything else gets a fresh id
+_REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+
+class RequestTimings:
+    __slots__ = ("request_id", "started", "stages")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        # Stage name -> seconds, in first-seen order
+        self.stages: dict[str, float] = {}
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def valid_request_id(value: str | None) -> bool:
+    return bool(value) and _REQUEST_ID_PATTERN.fullmatch(value) is not None
+
+
+def start_request(request_id: str | None = None):
+    """Begin a timed request; returns the token for end_request()."""
+    if not valid_request_id(request_id):
+        request_id = str(uuid.uuid4())
+    return _current.set(RequestTimings(request_id))
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current() -> RequestTimings | None:
+    return _current.get()
+
+
+def current_request_id() -> str:
+    """The id of the request being served (a fresh one outside a request, e.g. in scripts)."""
+    timings = _current.get()
+    return timings.request_id if timings is not None else str(uuid.uuid4())
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """Add `seconds` to stage `name` of the current request (no-op outside a request)."""
+    timings = _current.get()
+    if timings is not None:
+        timings.stages[name] = timings.stages.get(name, 0.0) + seconds
+
+
+def format_timings(timings: RequestTimings | None = None) -> str:
+    """'auth:1.2,db_fetch:0.4,inference:0.3,total:5.1' (milliseconds), for audit details and logs."""
+    timings = timings or _current.get()
+    if timings is None:
+        return ""
+    parts = [f"{name}:{seconds * 1000:.1f}" for name, seconds in timings.stages.items()]
+    parts.append(f"total:{(time.perf_counter() - timings.started) * 1000:.1f}")
+    return ",".join(parts)
+
+
+def server_timing(timings: RequestTimings) -> str:
+    """Server-Timing header value: 'auth;dur=1.2, db_fetch;dur=0.4, total;dur=5.1'."""
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.stages.items()]
+    parts.append(f"total;dur={(time.perf_counter() - timings.started) * 1000:.1f}")
+    return ", ".join(parts)
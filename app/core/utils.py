@@ -3,3 +3,7 @@ import hashlib
 def sha256_text(text: str) -> str:
     """Hash text so we can log traceability without storing raw sensitive content."""
     return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and case so trivially different copies of a text share cache keys."""
+    return " ".join(text.split()).lower()
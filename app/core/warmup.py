@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXT = "warm-up: cannot login to vpn"
+
+# Component name -> {"status": pending|ok|skipped|missing|error, "seconds": float, "error": str}
+_components: dict[str, dict] = {}
+_started = False
+_finished = threading.Event()
+_lock = threading.Lock()
+
+
+def _warm_classifier() -> None:
+    from app.core.classifier import _get_model, classify_tickets
+
+    # joblib load + one predict_proba (first call allocates the sparse/BLAS buffers)
+    _get_model()
+    classify_tickets([("warm-up", WARMUP_TEXT)])
+
+
+def _warm_embeddings() -> None:
+    from app.rag.query import _get_embeddings
+
+    # Model load + first torch inference; bypasses the query-embedding cache
+    _get_embeddings().inner.embed_query(WARMUP_TEXT)
+
+
+def _warm_index() -> None:
+    from app.rag.query import _get_store
+
+    store = _get_store()
+    store.similarity_search(WARMUP_TEXT, k=1)
+
+
+def _warm_reranker() -> str | None:
+    from app.rag.rerank import get_reranker, rerank_settings
+
+    enabled, _, _ = rerank_settings()
+    if not enabled:
+        return "skipped"
+    # Also seeds the per-pair cost estimate used for the latency budget
+    get_reranker().score(WARMUP_TEXT, [WARMUP_TEXT] * 2, deadline=float("inf"))
+    return None
+
+
+# A warm function may return "skipped" (component disabled); otherwise success is "ok"
+COMPONENTS: list[tuple[str, Callable[[], str | None]]] = [
+    ("classifier_model", _warm_classifier),
+    ("embeddings", _warm_embeddings),
+    ("faiss_index", _warm_index),
+    ("reranker", _warm_reranker),
+]
+
+
+def retry_settings() -> tuple[int, float]:
+    """
+    WARMUP_RETRIES: extra attempts for components that failed (default 2)
+    WARMUP_RETRY_DELAY_SECONDS: pause before each retry round (default 2)
+    """
+    return int(os.getenv("WARMUP_RETRIES", "2")), float(os.getenv("WARMUP_RETRY_DELAY_SECONDS", "2"))
+
+
+def _warm_one(name: str, warm: Callable[[], str | None], attempt: int) -> dict:
+    from app.rag.query import IndexNotReadyError
+
+    started = time.perf_counter()
+    try:
+        result = {"status": warm() or "ok"}
+    except IndexNotReadyError as e:
+        # No index yet (ingest not run): /answer returns 400 either way
+        result = {"status": "missing", "error": str(e)}
+    except Exception as e:
+        logger.exception("Warm-up failed component=%s attempt=%s", name, attempt)
+        result = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    result["attempts"] = attempt
+    logger.info("Warm-up component=%s status=%s seconds=%.3f", name, result["status"], result["seconds"])
+    return result
+
+
+def run_warmup() -> dict:
+    """
+    Load every lazily-initialized component once and run a dummy inference,
+    so the first real /classify or /answer does not pay for it.
+    A component that fails is retried (WARMUP_RETRIES) while the others are still warmed;
+    if it still fails, readiness stays 503 instead of sending traffic down the cold path.
+    """
+    retries, delay = retry_settings()
+
+    with _lock:
+        for name, _ in COMPONENTS:
+            _components[name] = {"status": "pending"}
+
+    total_started = time.perf_counter()
+    pending = list(COMPONENTS)
+    for attempt in range(1, retries + 2):
+        if attempt > 1:
+            time.sleep(delay)
+        for name, warm in pending:
+            _components[name] = _warm_one(name, warm, attempt)
+        pending = [(name, warm) for name, warm in pending if _components[name]["status"] == "error"]
+        if not pending:
+            break
+
+    _finished.set()
+    logger.info("Warm-up finished seconds=%.3f", time.perf_counter() - total_started)
+    return status()
+
+
+def start_warmup() -> None:
+    """
+    Warm up in a background thread, so the server already answers /health/live meanwhile.
+    WARMUP_ON_STARTUP=0 skips warm-up (readiness is then reported immediately).
+    """
+    global _started
+    if os.getenv("WARMUP_ON_STARTUP", "1") != "1":
+        _finished.set()
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=run_warmup, name="warmup", daemon=True).start()
+
+
+def is_ready() -> bool:
+    # "missing" (no index yet) and "skipped" (disabled) are fine; "error" means the cold path is back
+    return _finished.is_set() and not any(info["status"] == "error" for info in _components.values())
+
+
+def status() -> dict:
+    return {
+        "ready": is_ready(),
+        "components": {name: dict(info) for name, info in _components.items()},
+    }
@@ -42,6 +42,29 @@ class TicketPrediction(Base):
 
     ticket: Mapped["Ticket"] = relationship(back_populates="predictions")
 
+    feedback: Mapped[list["PredictionFeedback"]] = relationship(
+        back_populates="prediction",
+        cascade="all, delete-orphan"
+    )
+
+class PredictionFeedback(Base):
+    __tablename__ = "prediction_feedback"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=gen_uuid)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    prediction_id: Mapped[str] = mapped_column(String(36), ForeignKey("ticket_predictions.id"), index=True)
+
+    # Agent's correction
+    category: Mapped[str] = mapped_column(String(80))
+    priority: Mapped[int] = mapped_column(Integer)   # 1..4
+    actor: Mapped[str] = mapped_column(String(120), default="anonymous")
+
+    # Model version that folded this correction in; NULL = not applied yet (the updater's delta)
+    applied_version: Mapped[str | None] = mapped_column(String(40), nullable=True, index=True)
+
+    prediction: Mapped["TicketPrediction"] = relationship(back_populates="feedback")
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.core.utils import sha256_text
+
+
+def answer_cache_key(**parts: Any) -> str:
+    """Stable hash over everything that influences the LLM output."""
+    return sha256_text(json.dumps(parts, sort_keys=True, ensure_ascii=False))
+
+
+class AnswerCache:
+    """
+    Persistent cache of LLM answers in a local SQLite file.
+
+    Survives restarts and is shared by all workers on the same host
+    (SQLite WAL mode allows concurrent readers + one writer).
+    Entries expire after `ttl_seconds`; the least recently used ones are
+    evicted once the table grows beyond `max_entries`.
+    """
+
+    def __init__(self, path: str | Path, ttl_seconds: float, max_entries: int):
+        self.path = Path(path)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = int(max_entries)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_answers ("
+                " key TEXT PRIMARY KEY,"
+                " answer TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_answers_last_used ON llm_answers(last_used_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Short-lived connections: safe to use from any thread / worker process
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT answer, created_at FROM llm_answers WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self.ttl_seconds > 0 and row[1] + self.ttl_seconds < now:
+                conn.execute("DELETE FROM llm_answers WHERE key = ?", (key,))
+                row = None
+
+            if row is not None:
+                conn.execute("UPDATE llm_answers SET last_used_at = ? WHERE key = ?", (now, key))
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def set(self, key: str, answer: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_answers (key, answer, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                (key, answer, now, now),
+            )
+            # Keep the table bounded: drop least recently used entries
+            conn.execute(
+                "DELETE FROM llm_answers WHERE key IN ("
+                " SELECT key FROM llm_answers ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_answers")
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+            }
+
+
+_cache: AnswerCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache | None:
+    """
+    Process-wide answer cache.
+    LLM_CACHE_PATH: SQLite file (shared by workers on one host)
+    LLM_CACHE_TTL_SECONDS: entry lifetime
+    LLM_CACHE_MAX_ENTRIES: max cached answers (0 disables the cache)
+    """
+    global _cache
+    max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+    if max_entries <= 0:
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnswerCache(
+                    path=os.getenv("LLM_CACHE_PATH", ".cache/llm_answers.sqlite3"),
+                    ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+                    max_entries=max_entries,
+                )
+    return _cache
+
+
+def reset_answer_cache() -> None:
+    """Used by tests to point the cache at a different LLM_CACHE_PATH."""
+    global _cache
+    _cache = None
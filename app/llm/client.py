@@ -1,18 +1,122 @@
+from __future__ import annotations
 
+import asyncio
 import os
-from openai import AzureOpenAI
+import threading
+import weakref
+from typing import TYPE_CHECKING
 
-def get_client() -> AzureOpenAI | None:
+# openai / httpx are imported when the first client is built (API cold start)
+if TYPE_CHECKING:
+    import httpx
+    from openai import AzureOpenAI, AsyncAzureOpenAI
+
+# Process-wide clients, so connections (and TLS sessions) are reused across calls.
+# They are rebuilt only when endpoint/key/version or pool settings change.
+_lock = threading.Lock()
+_client: AzureOpenAI | None = None
+_client_key: tuple | None = None
+
+# httpx.AsyncClient pools are tied to the event loop they were used on
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[tuple, AsyncAzureOpenAI]]" = weakref.WeakKeyDictionary()
+
+def _settings() -> tuple[str | None, str | None, str]:
     endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
     api_key = os.getenv("AZURE_OPENAI_API_KEY")
     api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+    return endpoint, api_key, api_version
+
+def _pool_settings() -> tuple[int, float, float]:
+    """
+    LLM_POOL_SIZE: max open connections to Azure OpenAI per worker
+    LLM_KEEPALIVE_SECONDS: how long idle connections are kept for reuse
+    LLM_TIMEOUT_SECONDS: request timeout
+    """
+    pool_size = int(os.getenv("LLM_POOL_SIZE", "20"))
+    keepalive = float(os.getenv("LLM_KEEPALIVE_SECONDS", "60"))
+    timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+    return pool_size, keepalive, timeout
+
+def _client_config() -> tuple | None:
+    endpoint, api_key, api_version = _settings()
 
     if not endpoint or not api_key:
         return None
 
-    return AzureOpenAI(
+    return (endpoint, api_key, api_version, *_pool_settings())
+
+def _limits(pool_size: int, keepalive: float) -> httpx.Limits:
+    import httpx
+
+    return httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=keepalive,
+    )
+
+def get_client() -> AzureOpenAI | None:
+    global _client, _client_key
+
+    config = _client_config()
+    if config is None:
+        return None
+
+    if _client is not None and _client_key == config:
+        return _client
+
+    import httpx
+    from openai import AzureOpenAI
+
+    with _lock:
+        if _client is None or _client_key != config:
+            endpoint, api_key, api_version, pool_size, keepalive, timeout = config
+            # The previous client is not closed here: in-flight calls may still use it
+            _client = AzureOpenAI(
+                api_key=api_key,
+                azure_endpoint=endpoint,
+                api_version=api_version,
+                timeout=timeout,
+                http_client=httpx.Client(limits=_limits(pool_size, keepalive), timeout=timeout),
+            )
+            _client_key = config
+    return _client
+
+def get_async_client() -> AsyncAzureOpenAI | None:
+    """Async variant for async request handlers (non-blocking HTTP I/O), one pooled client per event loop."""
+    config = _client_config()
+    if config is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+    cached = _async_clients.get(loop)
+    if cached is not None and cached[0] == config:
+        return cached[1]
+
+    import httpx
+    from openai import AsyncAzureOpenAI
+
+    endpoint, api_key, api_version, pool_size, keepalive, timeout = config
+    client = AsyncAzureOpenAI(
         api_key=api_key,
         azure_endpoint=endpoint,
         api_version=api_version,
+        timeout=timeout,
+        http_client=httpx.AsyncClient(limits=_limits(pool_size, keepalive), timeout=timeout),
     )
+    _async_clients[loop] = (config, client)
+    return client
+
+async def close_clients() -> None:
+    """Close pooled connections (called on app shutdown)."""
+    global _client, _client_key
+
+    with _lock:
+        client, _client, _client_key = _client, None, None
+    if client is not None:
+        client.close()
+
+    loop = asyncio.get_running_loop()
+    cached = _async_clients.pop(loop, None)
+    if cached is not None:
+        await cached[1].close()
 
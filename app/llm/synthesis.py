@@ -1,22 +1,39 @@
+import asyncio
 import os
-from typing import List, Dict, Any
-from app.llm.client import get_client
+from dataclasses import dataclass
+from typing import List, Dict, Any, AsyncIterator
+from app.core.executors import llm_semaphore
+from app.core.metrics import LLM_IN_FLIGHT, stage
+from app.llm.cache import answer_cache_key, get_answer_cache
+from app.llm.client import get_client, get_async_client
 
-def synthesize_answer(ticket_text: str, sources: List[Dict[str, Any]]) -> str | None:
-    """
-    Create a concise, professional reply using retrieved sources.
-    Returns None if LLM is not configured.
-    """
-    client = get_client()
-    if client is None:
-        return None
+TEMPERATURE = 0.2
+MAX_TOKENS = 350
 
-    deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
-    if not deployment:
-        return None
+# Bump whenever the prompt changes, so cached answers from the old prompt are not reused
+PROMPT_VERSION = "v1"
+
+@dataclass
+class LLMAnswer:
+    text: str
+    cached: bool = False
 
-    api_version = getattr(client, "_azure_api_version", "2024-02-15-preview")
+@dataclass
+class LLMStream:
+    chunks: AsyncIterator[str]
+    cached: bool = False
 
+def _cache_key(ticket_text: str, sources: List[Dict[str, Any]], deployment: str) -> str:
+    return answer_cache_key(
+        ticket=ticket_text,
+        sources=[[s.get("source", "unknown"), s.get("snippet") or ""] for s in sources],
+        deployment=deployment,
+        prompt_version=PROMPT_VERSION,
+        temperature=TEMPERATURE,
+        max_tokens=MAX_TOKENS,
+    )
+
+def _build_messages(ticket_text: str, sources: List[Dict[str, Any]]) -> list[dict]:
     # Build context with citations
     context_lines = []
     for i, s in enumerate(sources, start=1):
@@ -42,17 +59,128 @@ def synthesize_answer(ticket_text: str, sources: List[Dict[str, Any]]) -> str |
         "Write the suggested reply."
     )
 
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+
+def synthesize_answer(ticket_text: str, sources: List[Dict[str, Any]]) -> LLMAnswer | None:
+    """
+    Create a concise, professional reply using retrieved sources.
+    Returns None if LLM is not configured.
+    Identical requests are served from the persistent answer cache (cached=True).
+    """
+    client = get_client()
+    if client is None:
+        return None
+
+    deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+    if not deployment:
+        return None
+
+    cache = get_answer_cache()
+    key = _cache_key(ticket_text, sources, deployment)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return LLMAnswer(cached, cached=True)
+
     # Chat Completions style call via SDK base_url + deployments.
     # Note: Azure requires api-version query parameter.
-    resp = client.chat.completions.create(
-        model=deployment,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
-        temperature=0.2,
-        max_tokens=350,
-        
-    )
+    with LLM_IN_FLIGHT.track_inprogress(), stage("llm"):
+        resp = client.chat.completions.create(
+            model=deployment,
+            messages=_build_messages(ticket_text, sources),
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
+        )
+
+    answer = resp.choices[0].message.content.strip()
+    if cache is not None:
+        cache.set(key, answer)
+    return LLMAnswer(answer)
+
+async def synthesize_answer_async(ticket_text: str, sources: List[Dict[str, Any]]) -> LLMAnswer | None:
+    """
+    Async variant of synthesize_answer for async handlers.
+    The HTTP call does not hold a thread; concurrency is bounded by LLM_MAX_CONCURRENCY.
+    """
+    client = get_async_client()
+    if client is None:
+        return None
+
+    deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+    if not deployment:
+        return None
+
+    # SQLite lookups are quick but blocking, keep them off the event loop
+    cache = get_answer_cache()
+    key = _cache_key(ticket_text, sources, deployment)
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return LLMAnswer(cached, cached=True)
+
+    async with llm_semaphore():
+        with LLM_IN_FLIGHT.track_inprogress(), stage("llm"):
+            resp = await client.chat.completions.create(
+                model=deployment,
+                messages=_build_messages(ticket_text, sources),
+                temperature=TEMPERATURE,
+                max_tokens=MAX_TOKENS,
+            )
+
+    answer = resp.choices[0].message.content.strip()
+    if cache is not None:
+        await asyncio.to_thread(cache.set, key, answer)
+    return LLMAnswer(answer)
+
+async def stream_answer_async(ticket_text: str, sources: List[Dict[str, Any]]) -> LLMStream | None:
+    """
+    Streaming variant: returns an async iterator of answer chunks as the LLM produces them.
+    Returns None if LLM is not configured. A cache hit is replayed as a single chunk.
+    The complete answer is written to the cache once the stream finishes.
+    """
+    client = get_async_client()
+    if client is None:
+        return None
+
+    deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+    if not deployment:
+        return None
+
+    cache = get_answer_cache()
+    key = _cache_key(ticket_text, sources, deployment)
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return LLMStream(_replay(cached), cached=True)
+
+    async def chunks() -> AsyncIterator[str]:
+        parts = []
+        # Stage "llm" covers the whole stream, up to the last chunk
+        async with llm_semaphore():
+            with LLM_IN_FLIGHT.track_inprogress(), stage("llm"):
+                stream = await client.chat.completions.create(
+                    model=deployment,
+                    messages=_build_messages(ticket_text, sources),
+                    temperature=TEMPERATURE,
+                    max_tokens=MAX_TOKENS,
+                    stream=True,
+                )
+                async for event in stream:
+                    # Azure may send chunks without choices (e.g. content filter results)
+                    if not event.choices:
+                        continue
+                    text = event.choices[0].delta.content
+                    if text:
+                        parts.append(text)
+                        yield text
+
+        if cache is not None:
+            await asyncio.to_thread(cache.set, key, "".join(parts).strip())
+
+    return LLMStream(chunks())
 
-    return resp.choices[0].message.content.strip()
+async def _replay(text: str) -> AsyncIterator[str]:
+    yield text
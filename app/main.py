@@ -1,12 +1,47 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.api.admin import router as admin_router
+from app.api.health import router as health_router
+from app.api.metrics import MetricsMiddleware, router as metrics_router
+from app.api.request_context import RequestContextMiddleware
 from app.api.routes import router as api_router
 from app.auth.routes import router as auth_router
+from app.core.artifacts import start_watcher, stop_watcher
+from app.core.executors import configure_threadpool, shutdown_executors
 from app.core.logging_config import configure_logging
+from app.core.metrics import instrument_sessions
+from app.db.database import SessionLocal
+from app.core.warmup import start_warmup
+from app.llm.client import close_clients
+from app.ml.feedback import start_updater, stop_updater
 
 configure_logging()
+instrument_sessions(SessionLocal)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_threadpool()
+    # Load model / embeddings / index in the background; /health/ready reports when done
+    start_warmup()
+    start_watcher()
+    start_updater()
+    yield
+    stop_updater()
+    stop_watcher()
+    shutdown_executors()
+    await close_clients()
 
-app = FastAPI(title="Ticket/Email Copilot", version="0.1.0")
+
+app = FastAPI(title="Ticket/Email Copilot", version="0.1.0", lifespan=lifespan)
 
 app.include_router(api_router)
-app.include_router(auth_router)
\ No newline at end of file
+app.include_router(auth_router)
+app.include_router(admin_router)
+app.include_router(health_router)
+app.include_router(metrics_router)
+
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestContextMiddleware)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+# Compact export of the fitted TF-IDF + LogisticRegression pipeline, next to the joblib file:
+# a directory of uncompressed .npy arrays (memory-mapped by the API) + the vectorizer options
+FAST_MODEL_FILE = "ticket_clf.fast"
+# Single-file export of versions published before the .npy layout (cannot be memory-mapped)
+LEGACY_FAST_MODEL_FILE = "ticket_clf.npz"
+
+_ARRAYS = ("terms", "idf", "coef_t", "intercept", "classes")
+_CONFIG_FILE = "config.json"
+
+
+def find_fast_model(version_dir: str | Path) -> Path | None:
+    """The fast export inside a model version directory, if it has one."""
+    for name in (FAST_MODEL_FILE, LEGACY_FAST_MODEL_FILE):
+        path = Path(version_dir) / name
+        if path.exists():
+            return path
+    return None
+
+
+def export_fast_model(pipeline: Pipeline, path: str | Path) -> None:
+    """
+    Compile the fitted pipeline into plain arrays: vocabulary, idf weights,
+    LR coefficients (transposed, one row per term) and intercepts.
+    Only the vectorizer options reproduced by FastTicketModel are accepted.
+    """
+    tfidf = pipeline.named_steps["tfidf"]
+    clf = pipeline.named_steps["clf"]
+
+    unsupported = {
+        "analyzer": tfidf.analyzer != "word",
+        "preprocessor": tfidf.preprocessor is not None,
+        "tokenizer": tfidf.tokenizer is not None,
+        "strip_accents": tfidf.strip_accents is not None,
+        "stop_words": tfidf.stop_words is not None,
+        "binary": tfidf.binary,
+        "norm": tfidf.norm not in ("l2", None),
+    }
+    if any(unsupported.values()):
+        raise ValueError(f"Vectorizer options not supported by the fast model: {[k for k, v in unsupported.items() if v]}")
+
+    vocabulary = tfidf.vocabulary_
+    terms = np.empty(len(vocabulary), dtype=object)
+    for term, i in vocabulary.items():
+        terms[i] = term
+
+    idf = tfidf.idf_ if tfidf.use_idf else np.ones(len(vocabulary))
+
+    # Binary LR has a single coefficient row (positive class); multinomial vs one-vs-rest
+    # decides how scores become probabilities
+    multinomial = clf.coef_.shape[0] > 1 and getattr(clf, "multi_class", "auto") != "ovr" and clf.solver != "liblinear"
+
+    arrays = {
+        "terms": terms.astype(str),
+        "idf": idf.astype(np.float64),
+        "coef_t": np.ascontiguousarray(clf.coef_.T, dtype=np.float64),
+        "intercept": clf.intercept_.astype(np.float64),
+        "classes": np.asarray(clf.classes_).astype(str),
+    }
+    config = {
+        "ngram_range": [int(n) for n in tfidf.ngram_range],
+        "token_pattern": tfidf.token_pattern,
+        "lowercase": bool(tfidf.lowercase),
+        "sublinear_tf": bool(tfidf.sublinear_tf),
+        "l2_norm": tfidf.norm == "l2",
+        "multinomial": bool(multinomial),
+    }
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        # Plain .npy (not .npz): np.load can memory-map it
+        np.save(path / f"{name}.npy", array)
+    (path / _CONFIG_FILE).write_text(json.dumps(config, indent=2), encoding="utf-8")
+
+
+class FastTicketModel:
+    """
+    NumPy-only inference for the exported pipeline.
+
+    Same probabilities as Pipeline.predict_proba (parity-tested), without sklearn input
+    validation, sparse matrix construction or estimator dispatch: a ticket is tokenized,
+    its few known terms are looked up, and the class scores are one small dot product.
+    Exposes `classes_` and `predict_proba`, so predict/predict_batch work unchanged.
+    """
+
+    def __init__(self, data):
+        # The term -> index dict is built per process; the weight arrays may be memory-mapped
+        self._vocabulary = {str(term): i for i, term in enumerate(data["terms"])}
+        # asarray: plain ndarray views of np.memmap (no copy, no memmap subclass in the hot path)
+        self._idf = np.asarray(data["idf"])
+        self._coef_t = np.asarray(data["coef_t"])
+        self._intercept = np.asarray(data["intercept"])
+        self.classes_ = np.asarray(data["classes"])
+        self._min_n, self._max_n = (int(n) for n in data["ngram_range"])
+        self._token_re = re.compile(str(data["token_pattern"]))
+        self._lowercase = bool(data["lowercase"])
+        self._sublinear_tf = bool(data["sublinear_tf"])
+        self._l2_norm = bool(data["l2_norm"])
+        self._multinomial = bool(data["multinomial"])
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True) -> "FastTicketModel":
+        """
+        Load an export directory; mmap=True maps idf / coefficients read-only, so all workers
+        on the host share those pages. Legacy .npz exports are read into memory.
+        """
+        path = Path(path)
+        if path.suffix == ".npz":
+            with np.load(path) as data:
+                return cls({key: data[key] for key in data.files})
+
+        data = json.loads((path / _CONFIG_FILE).read_text(encoding="utf-8"))
+        for name in _ARRAYS:
+            data[name] = np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None)
+        return cls(data)
+
+    def _ngrams(self, text: str) -> list[str]:
+        # Same n-grams as sklearn's word analyzer
+        if self._lowercase:
+            text = text.lower()
+        tokens = self._token_re.findall(text)
+        grams = []
+        for n in range(self._min_n, min(self._max_n, len(tokens)) + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def _scores(self, text: str) -> np.ndarray:
+        counts = Counter(i for i in map(self._vocabulary.get, self._ngrams(text)) if i is not None)
+        if not counts:
+            return self._intercept.copy()
+
+        idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self._sublinear_tf:
+            tf = 1 + np.log(tf)
+
+        weights = tf * self._idf[idx]
+        if self._l2_norm:
+            weights /= np.sqrt(weights @ weights)
+        return weights @ self._coef_t[idx] + self._intercept
+
+    def predict_proba(self, texts) -> np.ndarray:
+        scores = np.vstack([self._scores(text) for text in texts])
+
+        if scores.shape[1] == 1:
+            positive = 1 / (1 + np.exp(-scores[:, 0]))
+            return np.column_stack([1 - positive, positive])
+
+        if self._multinomial:
+            scores = scores - scores.max(axis=1, keepdims=True)
+            proba = np.exp(scores)
+        else:
+            proba = 1 / (1 + np.exp(-scores))
+        return proba / proba.sum(axis=1, keepdims=True)
@@ -0,0 +1,213 @@
+"""
+Incremental model updates from agent feedback (POST /predictions/{id}/feedback).
+
+Only corrections not yet applied (prediction_feedback.applied_version IS NULL) are read,
+so an update costs O(new feedback), not O(history):
+
+    hashing-sgd models (app.ml.train --streaming)   SGDClassifier.partial_fit on the delta
+    tfidf-logreg models                             warm-started refit of the LR weights on the delta,
+                                                    anchored to the current weights (vocabulary frozen)
+
+The updated model is published to the registry as a new version (CURRENT moves atomically)
+and the corrections are marked with that version.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+
+from app.core import artifacts
+
+logger = logging.getLogger(__name__)
+
+_update_lock = threading.Lock()
+_updater: threading.Thread | None = None
+_updater_stop = threading.Event()
+
+
+def feedback_settings() -> tuple[float, int, float, int]:
+    """
+    FEEDBACK_UPDATE_SECONDS: how often the background updater checks for new feedback (0 disables)
+    FEEDBACK_MIN_BATCH: corrections needed before a new version is published
+    FEEDBACK_ANCHOR: pull towards the current LR weights during a refit (higher = smaller updates)
+    FEEDBACK_REFIT_STEPS: gradient steps of an LR refit
+    """
+    interval = float(os.getenv("FEEDBACK_UPDATE_SECONDS", "0"))
+    min_batch = int(os.getenv("FEEDBACK_MIN_BATCH", "20"))
+    anchor = float(os.getenv("FEEDBACK_ANCHOR", "0.1"))
+    steps = int(os.getenv("FEEDBACK_REFIT_STEPS", "100"))
+    return interval, min_batch, anchor, steps
+
+
+def pending_feedback(db) -> list[tuple[str, str, str]]:
+    """(feedback id, ticket text, corrected category) of all corrections not applied yet, oldest first."""
+    from app.core.classifier import _ticket_text
+    from app.db import models
+
+    rows = (
+        db.query(models.PredictionFeedback.id, models.Ticket.subject, models.Ticket.body, models.PredictionFeedback.category)
+        .join(models.TicketPrediction, models.PredictionFeedback.prediction_id == models.TicketPrediction.id)
+        .join(models.Ticket, models.TicketPrediction.ticket_id == models.Ticket.id)
+        .filter(models.PredictionFeedback.applied_version.is_(None))
+        .order_by(models.PredictionFeedback.created_at)
+        .all()
+    )
+    return [(fid, _ticket_text(subject or "", body or ""), category) for fid, subject, body, category in rows]
+
+
+def _warm_start_refit(clf, X, y, anchor: float, steps: int) -> None:
+    """
+    Minimize mean log-loss on the delta + anchor/2 * ||W - W_current||^2 by gradient descent,
+    starting from the current weights. Cost is O(steps * nnz(delta)); the anchor keeps the
+    model close to what it learned from the full history. Intercepts (class priors) stay fixed:
+    corrections are skewed towards the classes the model gets wrong.
+    """
+    import numpy as np
+
+    classes = list(clf.classes_)
+    coef0, intercept = clf.coef_.copy(), clf.intercept_
+    coef = coef0.copy()
+    targets = np.zeros((X.shape[0], len(classes)))
+    targets[np.arange(X.shape[0]), [classes.index(label) for label in y]] = 1.0
+
+    binary = coef.shape[0] == 1
+    # Same rule as the NumPy export (app/ml/fast_model.py)
+    multinomial = not binary and getattr(clf, "multi_class", "auto") != "ovr" and clf.solver != "liblinear"
+    if binary:
+        targets = targets[:, 1:]
+
+    # TF-IDF rows are L2-normalized: the loss is (1 + anchor)-smooth in W
+    step = 1.0 / (1.0 + anchor)
+    for _ in range(steps):
+        scores = X @ coef.T + intercept
+        if multinomial:
+            scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+            proba = scores / scores.sum(axis=1, keepdims=True)
+        else:
+            proba = 1 / (1 + np.exp(-scores))
+        residual = (proba - targets) / X.shape[0]
+        coef -= step * (np.asarray(X.T @ residual).T + anchor * (coef - coef0))
+
+    clf.coef_ = coef
+
+
+def update_model(model, texts: list[str], labels: list[str]) -> tuple[str, int]:
+    """
+    Fold (texts, labels) into the fitted pipeline in place.
+    Labels the model does not know are skipped (a new category needs a full retrain).
+    Returns (method, rows used).
+    """
+    import numpy as np
+
+    clf = model.steps[-1][1]
+    classes = set(clf.classes_)
+    known = [(text, label) for text, label in zip(texts, labels) if label in classes]
+    if not known:
+        return "none", 0
+
+    X = model[:-1].transform([text for text, _ in known])
+    y = np.array([label for _, label in known])
+    if hasattr(clf, "partial_fit"):
+        clf.partial_fit(X, y)
+        return "partial_fit", len(known)
+
+    _, _, anchor, steps = feedback_settings()
+    _warm_start_refit(clf, X, y, anchor, steps)
+    return "warm_start", len(known)
+
+
+def apply_feedback(min_batch: int = 1) -> str | None:
+    """
+    Apply all pending corrections to the current model and publish the result.
+    Returns the new version, or None when there is nothing (or not enough) to apply or no model yet.
+    """
+    from app.db import models
+    from app.db.database import SessionLocal
+    from app.ml.fast_model import find_fast_model
+    from app.ml.model import get_registry
+    from app.ml.registry import MODEL_FAMILY
+
+    with _update_lock, SessionLocal() as db:
+        pending = pending_feedback(db)
+        if not pending or len(pending) < min_batch:
+            return None
+
+        registry = get_registry()
+        base = registry.current_version()
+        if not registry.path(base).exists():
+            logger.warning("Feedback pending=%s but no trained model to update", len(pending))
+            return None
+
+        # Writable copy: the update changes the coefficients in place
+        model = registry.load(base, mmap=False)
+        ids, texts, labels = zip(*pending)
+        method, used = update_model(model, list(texts), list(labels))
+
+        # Registry names are <family>-<timestamp>-<hash>; the legacy layout is a tfidf-logreg model
+        family = base.rsplit("-", 2)[0] if base else MODEL_FAMILY
+        export_fast = base is None or find_fast_model(registry.path(base).parent) is not None
+        version = registry.publish(
+            model,
+            export_fast=export_fast,
+            family=family,
+            extra={"base_version": base, "feedback_rows": used, "feedback_skipped": len(pending) - used, "update": method},
+        )
+
+        db.query(models.PredictionFeedback).filter(models.PredictionFeedback.id.in_(ids)).update(
+            {models.PredictionFeedback.applied_version: version}, synchronize_session=False
+        )
+        db.commit()
+
+    logger.info("Feedback applied version=%s base=%s method=%s rows=%s skipped=%s", version, base, method, used, len(pending) - used)
+
+    # This worker swaps the model in now; other workers follow via ARTIFACT_POLL_SECONDS
+    reloader = artifacts.get_reloaders().get("classifier_model")
+    if reloader is not None:
+        reloader.trigger()
+    return version
+
+
+def _run_updater(interval: float, min_batch: int) -> None:
+    while not _updater_stop.wait(interval):
+        try:
+            apply_feedback(min_batch)
+        except Exception:
+            logger.exception("Feedback update failed")
+
+
+def start_updater() -> None:
+    """
+    Run apply_feedback every FEEDBACK_UPDATE_SECONDS (0 disables, default).
+    Enable it in one process only (or run `python -m app.ml.feedback` from a scheduler instead).
+    """
+    global _updater
+    interval, min_batch, _, _ = feedback_settings()
+    if interval <= 0 or (_updater is not None and _updater.is_alive()):
+        return
+    _updater_stop.clear()
+    _updater = threading.Thread(target=_run_updater, args=(interval, min_batch), name="feedback-updater", daemon=True)
+    _updater.start()
+
+
+def stop_updater() -> None:
+    global _updater
+    _updater_stop.set()
+    if _updater is not None:
+        _updater.join(timeout=5)
+    _updater = None
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fold pending agent feedback into the current model")
+    parser.add_argument("--min-batch", type=int, default=1, help="publish only with at least this many corrections")
+    args = parser.parse_args()
+
+    version = apply_feedback(args.min_batch)
+    print(f"Published model version {version}" if version else "Nothing to apply")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
-import joblib
+from typing import TYPE_CHECKING
 
-from sklearn.pipeline import Pipeline
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+# joblib / scikit-learn are imported inside the functions that need them (API cold start)
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+from app.core import artifacts
 
 MODEL_DIR = Path("models")
-MODEL_PATH = MODEL_DIR / "ticket_clf.joblib"
+MODEL_FILE = "ticket_clf.joblib"
+# Legacy flat layout; trained models are published to the registry (app/ml/registry.py):
+# models/versions/<version>/ + models/CURRENT
+MODEL_PATH = MODEL_DIR / MODEL_FILE
+# Version reported for a model in the legacy layout (registry versions carry their own name)
 MODEL_VERSION = "tfidf-logreg-v1"
 
 @dataclass
@@ -20,6 +27,10 @@ class MLResult:
     model_version: str = MODEL_VERSION
 
 def build_pipeline() -> Pipeline:
+    from sklearn.pipeline import Pipeline
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+
     # Simple, strong baseline for text classification
     return Pipeline(
         steps=[
@@ -28,29 +39,79 @@ def build_pipeline() -> Pipeline:
         ]
     )
 
-def save_model(model: Pipeline) -> None:
-    MODEL_DIR.mkdir(parents=True, exist_ok=True)
-    joblib.dump(model, MODEL_PATH)
+def get_registry():
+    from app.ml.registry import ModelRegistry
+    return ModelRegistry(MODEL_DIR, MODEL_FILE)
+
+def save_model(
+    model: Pipeline,
+    export_fast: bool = True,
+    data_sha256: str | None = None,
+    metrics: dict | None = None,
+    family: str | None = None,
+) -> str:
+    """
+    Publish the model to the registry as a new version and point models/CURRENT at it.
+    With export_fast, the NumPy inference artifact (ticket_clf.fast/) is written into the same version.
+    Returns the version name.
+    """
+    from app.ml.registry import MODEL_FAMILY
+
+    return get_registry().publish(
+        model, data_sha256=data_sha256, metrics=metrics, export_fast=export_fast, family=family or MODEL_FAMILY
+    )
+
+def current_model_path() -> Path:
+    return artifacts.current_dir(MODEL_DIR) / MODEL_FILE
+
+def classifier_engine() -> str:
+    """CLASSIFIER_ENGINE: fast (NumPy export when present, default) | sklearn (joblib pipeline)."""
+    engine = os.getenv("CLASSIFIER_ENGINE", "fast")
+    if engine not in ("fast", "sklearn"):
+        raise ValueError(f"Unknown CLASSIFIER_ENGINE '{engine}', expected fast or sklearn")
+    return engine
+
+def load_model(path: Path | None = None):
+    """
+    Load the model at `path` (default: current version). Returns the NumPy FastTicketModel
+    when it was exported next to the joblib file and CLASSIFIER_ENGINE=fast, else the sklearn Pipeline.
+    """
+    from app.ml.fast_model import FastTicketModel, find_fast_model
 
-def load_model() -> Pipeline | None:
-    if MODEL_PATH.exists():
-        return joblib.load(MODEL_PATH)
+    path = path or current_model_path()
+    fast_path = find_fast_model(path.parent)
+    if classifier_engine() == "fast" and fast_path is not None:
+        # No joblib / scikit-learn / scipy in the worker at all; weight arrays memory-mapped
+        return FastTicketModel.load(fast_path)
+    if path.exists():
+        import joblib
+        # Memory-mapped numpy arrays: pages are shared by all workers on the host
+        return joblib.load(path, mmap_mode="r")
     return None
 
 def predict(model: Pipeline, text: str) -> tuple[str, float]:
     # Returns (label, confidence)
-    proba = model.predict_proba([text])[0]
-    idx = int(proba.argmax())
-    label = model.classes_[idx]
-    conf = float(proba[idx])
-    return str(label), conf
+    return predict_batch(model, [text])[0]
+
+def predict_batch(model: Pipeline, texts: list[str]) -> list[tuple[str, float]]:
+    # Vectorized variant: one predict_proba call for all texts, results in input order
+    if not texts:
+        return []
+    proba = model.predict_proba(texts)
+    idx = proba.argmax(axis=1)
+    return [
+        (str(model.classes_[i]), float(row[i]))
+        for row, i in zip(proba, idx)
+    ]
+
+# Known categories and their default priority (1 = highest)
+CATEGORY_PRIORITIES = {
+    "incident": 1,
+    "access": 2,
+    "billing": 3,
+    "general": 4,
+}
 
 def priority_from_category(category: str) -> int:
     # Simple mapping 
-    mapping = {
-        "incident": 1,
-        "access": 2,
-        "billing": 3,
-        "general": 4,
-    }
-    return int(mapping.get(category, 4))
+    return int(CATEGORY_PRIORITIES.get(category, 4))
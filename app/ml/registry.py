@@ -0,0 +1,149 @@
+"""
+Local model registry on top of the versioned artifact layout:
+
+    models/versions/<version>/ticket_clf.joblib   sklearn pipeline
+    models/versions/<version>/ticket_clf.fast/    NumPy export (fast engine), one .npy per array
+    models/versions/<version>/metadata.json       training data hash, metrics, timestamp
+    models/CURRENT                                active version
+
+Version names fit TicketPrediction.model_version (40 chars), e.g. tfidf-logreg-20261018T101500-3f2a9c1d.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.core import artifacts
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+METADATA_FILE = "metadata.json"
+MODEL_FAMILY = "tfidf-logreg"
+
+
+def file_sha256(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, root: str | Path, model_file: str = "ticket_clf.joblib"):
+        self.root = Path(root)
+        self.model_file = model_file
+
+    def publish(
+        self,
+        model: Pipeline,
+        data_sha256: str | None = None,
+        metrics: dict | None = None,
+        export_fast: bool = True,
+        family: str = MODEL_FAMILY,
+        extra: dict | None = None,
+    ) -> str:
+        """
+        Write a new version (joblib + optional NumPy export + metadata) and make it current.
+        MODEL_REGISTRY_KEEP (default 10) older versions stay loadable by name.
+        """
+        import joblib
+        from app.ml.fast_model import FAST_MODEL_FILE, export_fast_model
+
+        staging = artifacts.staging_dir(self.root)
+        path = staging / self.model_file
+        # Uncompressed, so load(mmap=True) can map the numpy arrays
+        joblib.dump(model, path)
+        if export_fast:
+            export_fast_model(model, staging / FAST_MODEL_FILE)
+
+        created_at = datetime.now(timezone.utc)
+        version = f"{family}-{created_at:%Y%m%dT%H%M%S}-{file_sha256(path)[:8]}"
+        metadata = {
+            "version": version,
+            "created_at": created_at.isoformat(),
+            "data_sha256": data_sha256,
+            "metrics": metrics or {},
+            "files": sorted(p.name for p in staging.iterdir()),
+            **(extra or {}),
+        }
+        (staging / METADATA_FILE).write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+
+        artifacts.publish(self.root, staging, version, keep=int(os.getenv("MODEL_REGISTRY_KEEP", "10")))
+        return version
+
+    def current_version(self) -> str | None:
+        return artifacts.current_version(self.root)
+
+    def path(self, version: str | None = None) -> Path:
+        """Model file of a version (default: current; legacy flat layout when nothing is published)."""
+        version = version or self.current_version()
+        return artifacts.version_dir(self.root, version) / self.model_file
+
+    def metadata(self, version: str) -> dict:
+        path = artifacts.version_dir(self.root, version) / METADATA_FILE
+        if not path.exists():
+            raise KeyError(f"Unknown model version '{version}'")
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def list_versions(self) -> list[dict]:
+        """Metadata of all published versions, newest first."""
+        versions_dir = self.root / artifacts.VERSIONS_DIR
+        if not versions_dir.exists():
+            return []
+        found = [
+            json.loads((p / METADATA_FILE).read_text(encoding="utf-8"))
+            for p in versions_dir.iterdir()
+            if (p / METADATA_FILE).exists()
+        ]
+        return sorted(found, key=lambda m: m["created_at"], reverse=True)
+
+    def load(self, version: str | None = None, mmap: bool = True) -> Pipeline:
+        """
+        Load the sklearn pipeline of a version by name (default: current).
+        mmap=True maps its numpy arrays read-only, so workers share the pages.
+        """
+        import joblib
+
+        path = self.path(version)
+        if not path.exists():
+            raise KeyError(f"Unknown model version '{version}'")
+        return joblib.load(path, mmap_mode="r" if mmap else None)
+
+    def activate(self, version: str) -> None:
+        """Point CURRENT at an existing version (e.g. roll back)."""
+        self.metadata(version)
+        artifacts.activate(self.root, version)
+
+
+def main() -> None:
+    import argparse
+
+    from app.ml.model import get_registry
+
+    parser = argparse.ArgumentParser(description="Inspect published models or switch the active version")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="published versions, newest first")
+    activate = sub.add_parser("activate", help="make an existing version current (e.g. roll back)")
+    activate.add_argument("version")
+    args = parser.parse_args()
+
+    registry = get_registry()
+    if args.command == "list":
+        current = registry.current_version()
+        for meta in registry.list_versions():
+            marker = "*" if meta["version"] == current else " "
+            macro_f1 = meta.get("metrics", {}).get("macro_f1")
+            print(f"{marker} {meta['version']}  created={meta['created_at']}  macro_f1={macro_f1}  data={str(meta.get('data_sha256'))[:12]}")
+    else:
+        registry.activate(args.version)
+        print(f"Active model version: {args.version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,207 @@
 from __future__ import annotations
 
+import argparse
 import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import StratifiedKFold, cross_val_predict
 from sklearn.metrics import classification_report, f1_score
 
-from app.ml.model import build_pipeline, save_model
+from app.ml.model import MODEL_DIR, build_pipeline, save_model
+from app.ml.registry import file_sha256
 
 DATA_PATH = "data/sample_tickets.csv"
 REPORTS_DIR = Path("reports")
 METRICS_PATH = REPORTS_DIR / "metrics.json"
 
-def main() -> None:
-    df = pd.read_csv(DATA_PATH)
+# Streaming mode: stateless hashing features + SGD logistic regression, fitted chunk by chunk
+STREAMING_FAMILY = "hashing-sgd"
+DEFAULT_CHUNKSIZE = 50_000
+DEFAULT_N_FEATURES = 2 ** 18
+
+# Labelled history in the database: ticket text + its most recent prediction,
+# with the latest agent correction (prediction_feedback) taking precedence
+_DB_QUERY = """
+SELECT t.subject, t.body, COALESCE(
+    (SELECT f.category FROM prediction_feedback f WHERE f.prediction_id = p.id ORDER BY f.created_at DESC LIMIT 1),
+    p.category
+) AS category
+FROM tickets t
+JOIN ticket_predictions p ON p.ticket_id = t.id
+WHERE p.created_at = (SELECT MAX(created_at) FROM ticket_predictions WHERE ticket_id = t.id)
+ORDER BY t.created_at, t.id
+"""
+
+
+def _peak_memory_mb() -> dict[str, float | None]:
+    """Peak RSS of this process and of its largest finished worker process (None on Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return {"main": None, "workers": None}
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        name: round(resource.getrusage(who).ru_maxrss * scale / 2 ** 20, 1)
+        for name, who in (("main", resource.RUSAGE_SELF), ("workers", resource.RUSAGE_CHILDREN))
+    }
+
+
+def build_streaming_pipeline(n_features: int = DEFAULT_N_FEATURES):
+    from sklearn.pipeline import Pipeline
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.linear_model import SGDClassifier
+
+    # No vocabulary to hold in memory; unigrams + bigrams like the batch TF-IDF model
+    return Pipeline(
+        steps=[
+            ("hashing", HashingVectorizer(ngram_range=(1, 2), n_features=n_features, alternate_sign=False)),
+            ("clf", SGDClassifier(loss="log_loss", alpha=1e-5, random_state=42)),
+        ]
+    )
+
+
+def iter_chunks(source: str, data_path: str, chunksize: int) -> Iterator[tuple[list[str], np.ndarray]]:
+    """(texts, labels) chunks from the CSV or from the tickets/ticket_predictions tables."""
+    if source == "csv":
+        frames = pd.read_csv(data_path, usecols=["text", "category"], dtype=str, chunksize=chunksize)
+        for frame in frames:
+            yield frame["text"].fillna("").tolist(), frame["category"].to_numpy(dtype=str)
+    elif source == "db":
+        from app.db.database import engine
+
+        for frame in pd.read_sql_query(_DB_QUERY, engine, chunksize=chunksize):
+            # Same text the API classifies (see app/core/classifier.py)
+            texts = (frame["subject"].fillna("") + " " + frame["body"].fillna("")).str.strip()
+            yield texts.tolist(), frame["category"].to_numpy(dtype=str)
+    else:
+        raise ValueError(f"Unknown source '{source}', expected csv or db")
+
+
+def _fit_streaming(
+    source: str,
+    data_path: str,
+    chunksize: int,
+    classes: np.ndarray,
+    n_features: int,
+    n_splits: int,
+    holdout: int | None,
+    epochs: int,
+):
+    """
+    Fit on every row whose fold (row number % n_splits) is not `holdout`.
+    With a holdout fold, a second pass predicts it and returns (y_true, y_pred) as class indices;
+    without one, returns the fitted pipeline. Memory is bounded by one chunk plus the coefficients.
+    """
+    model = build_streaming_pipeline(n_features)
+    vectorizer, clf = model.named_steps["hashing"], model.named_steps["clf"]
+    rng = np.random.default_rng(42)
+
+    for _ in range(epochs):
+        start = 0
+        for texts, labels in iter_chunks(source, data_path, chunksize):
+            rows = np.arange(len(labels))
+            if holdout is not None:
+                rows = rows[(start + rows) % n_splits != holdout]
+            start += len(labels)
+            if not len(rows):
+                continue
+            # Sources are often sorted (by category, by date); SGD needs mixed batches
+            rows = rng.permutation(rows)
+            clf.partial_fit(vectorizer.transform([texts[i] for i in rows]), labels[rows], classes=classes)
+
+    if holdout is None:
+        return model
+
+    y_true, y_pred = [], []
+    start = 0
+    for texts, labels in iter_chunks(source, data_path, chunksize):
+        rows = np.flatnonzero((start + np.arange(len(labels))) % n_splits == holdout)
+        start += len(labels)
+        if len(rows):
+            y_true.append(np.searchsorted(classes, labels[rows]))
+            y_pred.append(np.searchsorted(classes, clf.predict(vectorizer.transform([texts[i] for i in rows]))))
+    if not y_true:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    return np.concatenate(y_true), np.concatenate(y_pred)
+
+
+def _scan_labels(source: str, data_path: str, chunksize: int) -> tuple[np.ndarray, int]:
+    # partial_fit needs the full label set up front
+    classes: set[str] = set()
+    n_samples = 0
+    for _, labels in iter_chunks(source, data_path, chunksize):
+        classes.update(labels.tolist())
+        n_samples += len(labels)
+    return np.array(sorted(classes), dtype=str), n_samples
+
+
+def train_streaming(
+    source: str = "csv",
+    data_path: str = DATA_PATH,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    n_splits: int = 5,
+    n_jobs: int | None = None,
+    n_features: int = DEFAULT_N_FEATURES,
+    epochs: int = 1,
+) -> tuple[object, dict]:
+    """
+    Out-of-core training: the CV folds and the final fit each stream the data
+    in their own worker process, so they run in parallel across cores.
+    Returns (final pipeline, metrics payload).
+    """
+    classes, n_samples = _scan_labels(source, data_path, chunksize)
+    if len(classes) < 2:
+        raise ValueError(f"Need at least 2 categories to train, found {list(classes)}")
+    if n_samples < n_splits:
+        # Rows are dealt round-robin into folds: fewer rows than folds leaves some folds empty
+        raise ValueError(f"Need at least n_splits={n_splits} rows for cross-validation, found {n_samples}")
+
+    args = (source, data_path, chunksize, classes, n_features, n_splits)
+    tasks = [(*args, fold, epochs) for fold in range(n_splits)] + [(*args, None, epochs)]
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(tasks))
+
+    if n_jobs == 1:
+        results = [_fit_streaming(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_fit_streaming, *zip(*tasks)))
+
+    *folds, model = results
+    y_true = np.concatenate([fold[0] for fold in folds])
+    y_pred = np.concatenate([fold[1] for fold in folds])
+    labels = list(range(len(classes)))
+
+    print("Cross-validation report (aggregated over folds):")
+    print(classification_report(y_true, y_pred, labels=labels, target_names=classes.tolist(), zero_division=0))
+
+    payload = {
+        "mode": "streaming",
+        "source": source,
+        "n_samples": n_samples,
+        "n_splits": n_splits,
+        "n_jobs": n_jobs,
+        "chunksize": chunksize,
+        "n_features": n_features,
+        "epochs": epochs,
+        "macro_f1": float(f1_score(y_true, y_pred, labels=labels, average="macro", zero_division=0)),
+        "weighted_f1": float(f1_score(y_true, y_pred, labels=labels, average="weighted", zero_division=0)),
+        "report": classification_report(
+            y_true, y_pred, labels=labels, target_names=classes.tolist(), output_dict=True, zero_division=0
+        ),
+    }
+    return model, payload
+
+
+def train_batch(data_path: str = DATA_PATH, n_jobs: int | None = None) -> tuple[object, dict]:
+    df = pd.read_csv(data_path)
 
     X = df["text"].astype(str)
     y = df["category"].astype(str)
@@ -25,7 +212,8 @@ def main() -> None:
     n_splits = 5 if len(df) >= 40 else 3
     cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
 
-    y_pred = cross_val_predict(model, X, y, cv=cv)   
+    # Folds are independent: fit them in parallel
+    y_pred = cross_val_predict(model, X, y, cv=cv, n_jobs=n_jobs)
     report = classification_report(y, y_pred, output_dict=True, zero_division=0)
 
     macro_f1 = f1_score(y, y_pred, average="macro", zero_division=0)
@@ -33,23 +221,74 @@ def main() -> None:
 
     print("Cross-validation report (aggregated over folds):")
     print(classification_report(y, y_pred, zero_division=0))
-    print(f"macro_f1={macro_f1:.3f} weighted_f1={weighted_f1:.3f}")
 
-    # Train final model on full data and save artifact for API
+    # Train final model on full data
     model.fit(X, y)
-    save_model(model)
 
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
     payload = {
+        "mode": "batch",
         "n_samples": int(len(df)),
         "n_splits": int(n_splits),
+        "n_jobs": n_jobs,
         "macro_f1": float(macro_f1),
         "weighted_f1": float(weighted_f1),
         "report": report,
     }
+    return model, payload
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Train the ticket classifier and publish it to the model registry")
+    parser.add_argument("--streaming", action="store_true", help="out-of-core: hashing features + partial-fit SGD, read in chunks")
+    parser.add_argument("--source", choices=("csv", "db"), default="csv", help="streaming input: CSV file or tickets/ticket_predictions tables")
+    parser.add_argument("--data", default=DATA_PATH, help="CSV with text,category columns")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per streamed chunk")
+    parser.add_argument("--n-splits", type=int, default=5, help="CV folds (streaming mode)")
+    parser.add_argument("--n-jobs", type=int, default=None, help="parallel worker processes (default: all cores)")
+    parser.add_argument("--n-features", type=int, default=DEFAULT_N_FEATURES, help="hashing space size (streaming mode)")
+    parser.add_argument("--epochs", type=int, default=1, help="passes over the data (streaming mode)")
+    args = parser.parse_args(argv)
+
+    if args.source == "db" and not args.streaming:
+        parser.error("--source db requires --streaming")
+
+    started = time.perf_counter()
+    if args.streaming:
+        model, payload = train_streaming(
+            source=args.source,
+            data_path=args.data,
+            chunksize=args.chunksize,
+            n_splits=args.n_splits,
+            n_jobs=args.n_jobs,
+            n_features=args.n_features,
+            epochs=args.epochs,
+        )
+    else:
+        model, payload = train_batch(args.data, n_jobs=args.n_jobs if args.n_jobs is not None else -1)
+    payload["wall_seconds"] = round(time.perf_counter() - started, 3)
+    payload["peak_memory_mb"] = _peak_memory_mb()
+
+    print(
+        f"macro_f1={payload['macro_f1']:.3f} weighted_f1={payload['weighted_f1']:.3f} "
+        f"wall_seconds={payload['wall_seconds']} peak_memory_mb={payload['peak_memory_mb']}"
+    )
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
     METRICS_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
     print(f"Saved metrics to {METRICS_PATH}")
-    print("Saved model to models/ticket_clf.joblib")
+
+    # Publish to the model registry with its metadata (plus the compact NumPy export
+    # used by the fast inference engine); the API reports this version on predictions.
+    # The hashing model has no vocabulary to export: it is served by the sklearn pipeline.
+    data_sha256 = file_sha256(args.data) if args.source == "csv" else None
+    version = save_model(
+        model,
+        export_fast=not args.streaming,
+        data_sha256=data_sha256,
+        metrics=payload,
+        family=STREAMING_FAMILY if args.streaming else None,
+    )
+    print(f"Published model version {version} to {MODEL_DIR}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,117 @@
+"""
+Benchmark FAISS index types: recall@k against exact (flat) search and query latency.
+
+Vectors come from the saved index in faiss_store/ (or random data with --synthetic),
+queries are a sample of those vectors with a little noise.
+
+Usage:
+    python -m app.rag.bench_index --types flat ivf_flat ivf_pq hnsw --nprobe 4 16 64 --ef-search 32 64 128
+    python -m app.rag.bench_index --synthetic 50000 --out reports/index_bench.json
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from app.core.artifacts import current_dir
+from app.rag.faiss_index import INDEX_TYPES, build_index, build_params, search_parameters
+from app.rag.ingest import FAISS_DIR
+
+
+def _load_vectors(synthetic: int, dim: int) -> np.ndarray:
+    if synthetic:
+        return np.random.default_rng(0).standard_normal((synthetic, dim)).astype(np.float32)
+    index = faiss.read_index(str(current_dir(FAISS_DIR) / "index.faiss"))
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def _queries(vectors: np.ndarray, n: int) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    picked = vectors[rng.choice(len(vectors), size=min(n, len(vectors)), replace=False)]
+    noise = rng.standard_normal(picked.shape).astype(np.float32) * picked.std() * 0.1
+    return picked + noise
+
+
+def _run(index, queries: np.ndarray, k: int, params) -> tuple[np.ndarray, list[float]]:
+    # One query at a time, like the API does
+    found, latencies = [], []
+    for q in queries:
+        started = time.perf_counter()
+        _, ids = index.search(q[None, :], k, params=params) if params else index.search(q[None, :], k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        found.append(ids[0])
+    return np.asarray(found), latencies
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    return float(np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)]))
+
+
+def benchmark(vectors: np.ndarray, types: list[str], k: int, n_queries: int, nprobes: list[int], ef_searches: list[int]) -> list[dict]:
+    queries = _queries(vectors, n_queries)
+
+    exact, _ = build_index(vectors, {"type": "flat"})
+    truth, _ = _run(exact, queries, k, None)
+
+    results = []
+    for index_type in types:
+        started = time.perf_counter()
+        index, effective = build_index(vectors, build_params(index_type))
+        build_seconds = time.perf_counter() - started
+
+        if index_type.startswith("ivf"):
+            knobs = [{"nprobe": n} for n in nprobes]
+        elif index_type == "hnsw":
+            knobs = [{"ef_search": ef} for ef in ef_searches]
+        else:
+            knobs = [{}]
+
+        for knob in knobs:
+            found, latencies = _run(index, queries, k, search_parameters(index, **knob))
+            results.append({
+                "type": index_type,
+                "build": effective,
+                "search": knob,
+                "build_seconds": round(build_seconds, 3),
+                f"recall@{k}": round(_recall(found, truth), 4),
+                "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+                "p99_ms": round(float(np.percentile(latencies, 99)), 4),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare FAISS index types (recall@k vs exact, latency)")
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 64, 128])
+    parser.add_argument("--synthetic", type=int, default=0, help="use N random vectors instead of faiss_store/")
+    parser.add_argument("--dim", type=int, default=384, help="dimension of synthetic vectors")
+    parser.add_argument("--out", default=None, help="optional JSON report path")
+    args = parser.parse_args()
+
+    vectors = _load_vectors(args.synthetic, args.dim)
+    print(f"vectors={len(vectors)} dim={vectors.shape[1]} k={args.k}")
+
+    results = benchmark(vectors, args.types, args.k, args.queries, args.nprobe, args.ef_search)
+    for r in results:
+        knob = " ".join(f"{key}={value}" for key, value in r["search"].items()) or "-"
+        print(
+            f"{r['type']:<9} {knob:<14} recall@{args.k}={r[f'recall@{args.k}']:.4f} "
+            f"p50={r['p50_ms']:.3f}ms p99={r['p99_ms']:.3f}ms build={r['build_seconds']:.2f}s"
+        )
+
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
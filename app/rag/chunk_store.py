@@ -0,0 +1,129 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from app.core.metrics import stage
+from app.rag.faiss_index import read_index
+from app.rag.sparse import SPARSE_INDEX_FILE, BM25Index, reciprocal_rank_fusion
+
+# Written next to the index by ingest: chunk text + metadata by FAISS position.
+# Replaces unpickling index.pkl in the API: only the top-k rows are read per query,
+# and the OS page cache (SQLite mmap) is shared by all workers on the host.
+CHUNK_STORE_FILE = "chunks.sqlite3"
+
+# Map up to this many bytes of the chunk store into memory
+MMAP_BYTES = 256 * 1024 * 1024
+
+
+def write_chunk_store(faiss_dir: str | Path, index_to_docstore_id: dict, docstore) -> None:
+    """Write chunks in FAISS position order (atomic replace of the previous file)."""
+    path = Path(faiss_dir) / CHUNK_STORE_FILE
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute(
+            "CREATE TABLE chunks (position INTEGER PRIMARY KEY, chunk_id TEXT NOT NULL, text TEXT NOT NULL, metadata TEXT NOT NULL)"
+        )
+        rows = (
+            (position, doc_id, doc.page_content, json.dumps(doc.metadata, default=str))
+            for position, doc_id in sorted(index_to_docstore_id.items())
+            for doc in [docstore.search(doc_id)]
+        )
+        conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)", rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+
+
+class ChunkStore:
+    """Read-only access to chunks.sqlite3 (one connection per thread)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            conn.execute(f"PRAGMA mmap_size={MMAP_BYTES}")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def get(self, positions: list[int]) -> list[Document]:
+        """Documents for FAISS positions, in the given order (unknown positions are skipped)."""
+        if not positions:
+            return []
+        placeholders = ",".join("?" * len(positions))
+        rows = self._conn().execute(
+            f"SELECT position, text, metadata FROM chunks WHERE position IN ({placeholders})",
+            positions,
+        ).fetchall()
+        by_position = {
+            position: Document(page_content=text, metadata=json.loads(metadata))
+            for position, text, metadata in rows
+        }
+        return [by_position[p] for p in positions if p in by_position]
+
+
+class MmapVectorStore:
+    """
+    Minimal read-only replacement for the LangChain FAISS store used by the API:
+    vector index (memory-mapped for flat / IVF, see faiss_index.read_index) + chunk store on disk,
+    plus the BM25 index over the same chunks when ingest wrote one.
+    """
+
+    def __init__(self, index, chunks: ChunkStore, embedding_function: Embeddings, sparse: BM25Index | None = None):
+        self.index = index
+        self.chunks = chunks
+        self.embedding_function = embedding_function
+        self.sparse = sparse
+
+    @classmethod
+    def load(cls, faiss_dir: str | Path, embeddings: Embeddings, mmap: bool = True) -> "MmapVectorStore":
+        faiss_dir = Path(faiss_dir)
+        index = read_index(faiss_dir, mmap)
+        sparse = BM25Index.load(faiss_dir) if (faiss_dir / SPARSE_INDEX_FILE).exists() else None
+        return cls(index, ChunkStore(faiss_dir / CHUNK_STORE_FILE), embeddings, sparse)
+
+    def _dense_positions(self, query: str, k: int, params=None) -> list[int]:
+        vector = np.asarray([self.embedding_function.embed_query(query)], dtype=np.float32)
+        with stage("vector_search"):
+            if params is None:
+                _, indices = self.index.search(vector, k)
+            else:
+                _, indices = self.index.search(vector, k, params=params)
+        return [int(i) for i in indices[0] if i != -1]
+
+    def similarity_search(self, query: str, k: int = 4, params=None) -> list[Document]:
+        return self.chunks.get(self._dense_positions(query, k, params))
+
+    def hybrid_search(self, query: str, k: int = 4, sparse_weight: float = 0.5, candidates: int = 20, params=None) -> list[Document]:
+        """
+        Fuse dense (FAISS) and sparse (BM25) rankings with weighted reciprocal rank fusion.
+        Falls back to dense search when there is no BM25 index or sparse_weight is 0.
+        """
+        if self.sparse is None or sparse_weight <= 0:
+            return self.similarity_search(query, k=k, params=params)
+
+        candidates = max(candidates, k)
+        dense = self._dense_positions(query, candidates, params)
+        sparse = self.sparse.search(query, candidates)
+        return self.chunks.get(reciprocal_rank_fusion(dense, sparse, sparse_weight)[:k])
+
+
+def chunk_store_exists(faiss_dir: str | Path) -> bool:
+    return (Path(faiss_dir) / CHUNK_STORE_FILE).exists()
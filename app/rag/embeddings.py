@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Same model for ingestion and queries (vectors must be comparable)
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# EMBEDDING_BACKEND values
+BACKENDS = ("sentence-transformers", "torch-int8", "onnx")
+
+
+class MiniLMEmbeddings(Embeddings):
+    """
+    SentenceTransformer embeddings on CPU with an explicit batch size
+    (the torch thread count is process-wide and set by get_embeddings).
+
+    quantize=True applies torch dynamic int8 quantization to the Linear layers,
+    which is typically ~2x faster on CPU with near-identical vectors
+    (verify with `python -m app.rag.parity`).
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, batch_size: int = 32, quantize: bool = False):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(model_name, device="cpu")
+        if quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        self.model = model
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        # Same preprocessing as LangChain's SentenceTransformerEmbeddings (keeps old indexes compatible)
+        texts = [t.replace("\n", " ") for t in texts]
+        vectors = self.model.encode(texts, batch_size=self.batch_size, show_progress_bar=False, convert_to_numpy=True)
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+class OnnxMiniLMEmbeddings(Embeddings):
+    """
+    MiniLM on ONNX Runtime (optional dependency: `pip install optimum[onnxruntime]`).
+    Reproduces the sentence-transformers pipeline: mean pooling + L2 normalization.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, batch_size: int = 32, threads: int = 0):
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_BACKEND=onnx requires `pip install optimum[onnxruntime]`"
+            ) from e
+
+        repo = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+        session_options = onnxruntime.SessionOptions()
+        if threads > 0:
+            session_options.intra_op_num_threads = threads
+
+        self.tokenizer = AutoTokenizer.from_pretrained(repo)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(repo, export=True, session_options=session_options)
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        texts = [t.replace("\n", " ") for t in texts]
+        out = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            encoded = self.tokenizer(batch, padding=True, truncation=True, max_length=256, return_tensors="np")
+            hidden = self.model(**encoded).last_hidden_state
+
+            # Mean pooling over real tokens, then L2 normalization
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            out.extend(pooled.tolist())
+        return out
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+def embedding_backend() -> str:
+    backend = os.getenv("EMBEDDING_BACKEND", "sentence-transformers")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}', expected one of {BACKENDS}")
+    return backend
+
+
+def _set_torch_threads(threads: int) -> None:
+    import torch
+
+    torch.set_num_threads(threads)
+
+
+def get_embeddings(backend: str | None = None) -> Embeddings:
+    """
+    Build the embedding model used by ingestion and queries.
+
+    EMBEDDING_BACKEND: sentence-transformers (fp32, default) | torch-int8 | onnx
+    EMBEDDING_BATCH_SIZE: texts per forward pass
+    EMBEDDING_THREADS: CPU threads for inference (0 = library default). For the torch backends this
+    is torch's process-wide intra-op pool, so it also applies to the cross-encoder re-ranker;
+    onnx sets it on its own session only.
+    """
+    backend = backend or embedding_backend()
+    batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    threads = int(os.getenv("EMBEDDING_THREADS", "0"))
+
+    if backend == "onnx":
+        return OnnxMiniLMEmbeddings(EMBEDDING_MODEL, batch_size=batch_size, threads=threads)
+    if threads > 0:
+        _set_torch_threads(threads)
+    return MiniLMEmbeddings(
+        EMBEDDING_MODEL,
+        batch_size=batch_size,
+        quantize=(backend == "torch-int8"),
+    )
@@ -0,0 +1,3 @@
+class IndexNotReadyError(RuntimeError):
+    """Raised when FAISS index is not available (ingest not run)."""
+    pass
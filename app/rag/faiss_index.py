@@ -0,0 +1,180 @@
+import json
+import logging
+import math
+import os
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Written next to the index by ingest: effective build params + default search knobs
+INDEX_PARAMS_FILE = "index_params.json"
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+INDEX_FILE = "index.faiss"
+# Flat index vectors as a plain .npy, so the API can memory-map them (see MmapFlatIndex)
+FLAT_VECTORS_FILE = "vectors.npy"
+
+
+def build_params(index_type: str | None = None) -> dict:
+    """
+    Index settings requested via env:
+    FAISS_INDEX_TYPE: flat (exact, default) | ivf_flat | ivf_pq | hnsw
+    FAISS_NLIST: IVF clusters
+    FAISS_PQ_M / FAISS_PQ_NBITS: PQ sub-quantizers / bits per code
+    FAISS_HNSW_M / FAISS_EF_CONSTRUCTION: HNSW graph degree / build-time beam
+    """
+    index_type = index_type or os.getenv("FAISS_INDEX_TYPE", "flat")
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown FAISS_INDEX_TYPE '{index_type}', expected one of {INDEX_TYPES}")
+
+    params = {"type": index_type}
+    if index_type in ("ivf_flat", "ivf_pq"):
+        params["nlist"] = int(os.getenv("FAISS_NLIST", "256"))
+    if index_type == "ivf_pq":
+        params["pq_m"] = int(os.getenv("FAISS_PQ_M", "16"))
+        params["pq_nbits"] = int(os.getenv("FAISS_PQ_NBITS", "8"))
+    if index_type == "hnsw":
+        params["hnsw_m"] = int(os.getenv("FAISS_HNSW_M", "32"))
+        params["ef_construction"] = int(os.getenv("FAISS_EF_CONSTRUCTION", "200"))
+    return params
+
+
+DEFAULT_NPROBE = 16
+DEFAULT_EF_SEARCH = 64
+
+
+def search_defaults(saved: dict | None = None) -> dict:
+    """
+    Search-time knobs (apply to IVF / HNSW only), env > saved with the index > built-in default:
+    FAISS_NPROBE: IVF clusters visited per query (recall vs latency)
+    FAISS_EF_SEARCH: HNSW search beam width
+    """
+    saved = saved or {}
+    return {
+        "nprobe": int(os.getenv("FAISS_NPROBE", saved.get("nprobe", DEFAULT_NPROBE))),
+        "ef_search": int(os.getenv("FAISS_EF_SEARCH", saved.get("ef_search", DEFAULT_EF_SEARCH))),
+    }
+
+
+def _largest_divisor_at_most(n: int, limit: int) -> int:
+    return max(d for d in range(1, max(limit, 1) + 1) if n % d == 0)
+
+
+def build_index(vectors: np.ndarray, params: dict) -> tuple[faiss.Index, dict]:
+    """
+    Build a FAISS index of the requested type over `vectors` (L2, like the default flat index).
+    Params are clamped to what the data size allows; the effective params are returned.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, d = vectors.shape
+    index_type = params["type"]
+    effective = dict(params)
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(d)
+
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(d, params["hnsw_m"])
+        index.hnsw.efConstruction = params["ef_construction"]
+
+    else:
+        # IVF training needs at least one point per cluster (FAISS recommends ~39)
+        nlist = max(1, min(params["nlist"], n // 39 or 1))
+        effective["nlist"] = nlist
+        quantizer = faiss.IndexFlatL2(d)
+
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, d, nlist, faiss.METRIC_L2)
+        else:
+            # m must divide the dimension; codebooks need >= 2**nbits training points
+            pq_m = _largest_divisor_at_most(d, params["pq_m"])
+            pq_nbits = max(1, min(params["pq_nbits"], int(math.log2(max(n, 2)))))
+            effective.update(pq_m=pq_m, pq_nbits=pq_nbits)
+            index = faiss.IndexIVFPQ(quantizer, d, nlist, pq_m, pq_nbits)
+
+        index.train(vectors)
+
+    if effective != params:
+        logger.warning("FAISS params clamped for %s vectors: requested=%s effective=%s", n, params, effective)
+
+    index.add(vectors)
+    return index, effective
+
+
+def apply_search_params(index: faiss.Index, nprobe: int | None = None, ef_search: int | None = None) -> None:
+    """Set search-time knobs on an index (no-op for knobs the index type does not have)."""
+    if nprobe is not None:
+        try:
+            faiss.extract_index_ivf(index).nprobe = nprobe
+        except (RuntimeError, TypeError):
+            pass  # not an IVF index (TypeError: not a FAISS index, e.g. MmapFlatIndex)
+    if ef_search is not None and hasattr(index, "hnsw"):
+        index.hnsw.efSearch = ef_search
+
+
+def search_parameters(index: faiss.Index, nprobe: int | None = None, ef_search: int | None = None):
+    """
+    Per-query FAISS SearchParameters (thread-safe alternative to mutating the shared index).
+    Returns None when no knob applies to this index type.
+    """
+    if nprobe is not None and isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(nprobe=nprobe)
+    if ef_search is not None and isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=ef_search)
+    return None
+
+
+def write_params(faiss_dir: str | Path, params: dict) -> None:
+    payload = {"build": params, "search": search_defaults()}
+    (Path(faiss_dir) / INDEX_PARAMS_FILE).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def read_params(faiss_dir: str | Path) -> dict:
+    """Saved params; indexes built before this file existed are exact flat indexes."""
+    path = Path(faiss_dir) / INDEX_PARAMS_FILE
+    if not path.exists():
+        return {"build": {"type": "flat"}, "search": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+class MmapFlatIndex:
+    """
+    Exact L2 search over vectors.npy mapped read-only: the index-like subset the API uses
+    (search / ntotal / d). faiss.read_index copies a flat index into the heap even with
+    IO_FLAG_MMAP; here the vectors stay in the OS page cache, shared by all workers.
+    """
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+        self.ntotal, self.d = vectors.shape
+
+    def search(self, x: np.ndarray, k: int, params=None) -> tuple[np.ndarray, np.ndarray]:
+        # Missing neighbours are padded with -1, as faiss does; params (nprobe / efSearch) do not apply
+        return faiss.knn(np.ascontiguousarray(x, dtype=np.float32), self.vectors, k, metric=faiss.METRIC_L2)
+
+
+def write_flat_vectors(faiss_dir: str | Path, index: faiss.Index) -> None:
+    """Write the vectors of an exact L2 index as vectors.npy (other index types: nothing to write)."""
+    if not (isinstance(index, faiss.IndexFlat) and index.metric_type == faiss.METRIC_L2 and index.ntotal):
+        return
+    vectors = faiss.rev_swig_ptr(index.get_xb(), index.ntotal * index.d).reshape(index.ntotal, index.d)
+    np.save(Path(faiss_dir) / FLAT_VECTORS_FILE, vectors)
+
+
+def read_index(faiss_dir: str | Path, mmap: bool = True):
+    """
+    Load the index for serving. With mmap:
+    - flat: vectors.npy via np.load(mmap_mode="r") (MmapFlatIndex), nothing copied at startup
+    - IVF: index.faiss with IO_FLAG_MMAP, the inverted lists stay in the mapped file
+    - HNSW: read into memory (faiss 1.7.4 copies it regardless of IO_FLAG_MMAP)
+    """
+    faiss_dir = Path(faiss_dir)
+    if mmap and (faiss_dir / FLAT_VECTORS_FILE).exists():
+        return MmapFlatIndex(np.load(faiss_dir / FLAT_VECTORS_FILE, mmap_mode="r"))
+    ivf = read_params(faiss_dir)["build"]["type"].startswith("ivf")
+    flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap and ivf else 0
+    return faiss.read_index(str(faiss_dir / INDEX_FILE), flags)
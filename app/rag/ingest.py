@@ -1,60 +1,317 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import SentenceTransformerEmbeddings
 from langchain_community.vectorstores import FAISS
 
+from app.core import artifacts
+from app.core.logging_config import configure_logging
+from app.rag.chunk_store import write_chunk_store
+from app.rag.embeddings import EMBEDDING_MODEL, embedding_backend, get_embeddings
+from app.rag.faiss_index import build_index, build_params, read_params, write_flat_vectors, write_params
+from app.rag.sparse import write_sparse_index
+from app.rag.versioning import write_index_version
+
+logger = logging.getLogger(__name__)
+
 # Folder with your knowledge base files (pdf/md/txt)
 KB_PATH = Path("kb")
 
 # Directory where FAISS index + metadata will be saved
+# (each run publishes faiss_store/versions/<version>/ and moves faiss_store/CURRENT to it)
 FAISS_DIR = Path("faiss_store")
 
+# Per-file content hashes + chunk ids of the last ingest (enables incremental runs)
+MANIFEST_FILE = "manifest.json"
+
+CHUNK_SIZE = 800
+CHUNK_OVERLAP = 150
+
+SUPPORTED_SUFFIXES = {".pdf", ".md", ".txt"}
+
+
+def _kb_files() -> list[Path]:
+    return sorted(p for p in KB_PATH.glob("*") if p.suffix.lower() in SUPPORTED_SUFFIXES)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_file(path: Path):
+    """Load one KB file into LangChain Document objects."""
+    if path.suffix.lower() == ".pdf":
+        # Each PDF page becomes a separate Document
+        return PyPDFLoader(str(path)).load()
+    # One file -> one Document (then  split)
+    return TextLoader(str(path), encoding="utf-8").load()
+
+
+def _load_file_timed(path: Path):
+    # Runs in a worker process: never raise, report the error instead
+    started = time.perf_counter()
+    try:
+        return load_file(path), time.perf_counter() - started, None
+    except Exception as e:
+        return [], time.perf_counter() - started, f"{type(e).__name__}: {e}"
+
+
+def _default_workers() -> int:
+    return int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1)))
+
+
+def load_files(paths: list[Path], workers: int | None = None) -> tuple[dict, dict]:
+    """
+    Parse files in parallel across a process pool.
 
-def load_documents():
+    Returns ({path: documents} for loaded files, {path: error} for failed ones).
+    Output order follows `paths`, so results are deterministic for any worker count.
+    A failing file is reported and skipped; it does not abort the run.
+    """
+    workers = _default_workers() if workers is None else workers
+    workers = max(1, min(workers, len(paths)))
+
+    if workers == 1:
+        results = map(_load_file_timed, paths)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_load_file_timed, paths)
+
+    loaded, failed = {}, {}
+    try:
+        for path, (docs, seconds, error) in zip(paths, results):
+            if error:
+                logger.error("Failed to load file=%s seconds=%.3f error=%s", path.name, seconds, error)
+                failed[path] = error
+            else:
+                logger.info("Loaded file=%s documents=%s seconds=%.3f", path.name, len(docs), seconds)
+                loaded[path] = docs
+    finally:
+        if workers > 1:
+            pool.shutdown()
+
+    return loaded, failed
+
+
+def load_documents(workers: int | None = None):
     """Load all KB files into LangChain Document objects."""
-    docs = []
-    for path in KB_PATH.glob("*"):
-        if path.suffix.lower() == ".pdf":
-            # Each PDF page becomes a separate Document
-            docs.extend(PyPDFLoader(str(path)).load())
-        elif path.suffix.lower() in {".md", ".txt"}:
-            # One file -> one Document (then  split)
-            docs.extend(TextLoader(str(path), encoding="utf-8").load())
-    return docs
-
-
-def ingest():
+    loaded, _ = load_files(_kb_files(), workers=workers)
+    return [doc for docs in loaded.values() for doc in docs]
+
+
+def _splitter() -> RecursiveCharacterTextSplitter:
+    # Split text into overlapping chunks to preserve context
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+    )
+
+
+def _chunk_file(path: Path, docs, file_hash: str, splitter: RecursiveCharacterTextSplitter):
+    """
+    Split one loaded file. Chunk ids are derived from (path, content hash, position),
+    so they stay stable as long as the file does not change.
+    """
+    chunks = splitter.split_documents(docs)
+    prefix = hashlib.sha256(f"{path.name}:{file_hash}".encode("utf-8")).hexdigest()[:16]
+    ids = [f"{prefix}-{i}" for i in range(len(chunks))]
+    for chunk, chunk_id in zip(chunks, ids):
+        chunk.metadata["chunk_id"] = chunk_id
+    return chunks, ids
+
+
+def _manifest_config() -> dict:
+    # If any of these change, existing vectors are not comparable -> full rebuild
+    return {
+        "embedding_model": EMBEDDING_MODEL,
+        "embedding_backend": embedding_backend(),
+        "index": build_params(),
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+    }
+
+
+def _read_manifest(index_dir: Path) -> dict | None:
+    path = index_dir / MANIFEST_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_manifest(index_dir: Path, files: dict) -> None:
+    payload = {**_manifest_config(), "files": files}
+    (index_dir / MANIFEST_FILE).write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _save(store: FAISS, files: dict, index_params: dict) -> str:
+    # Write a complete new version next to the active one; the API keeps serving the old
+    # version until CURRENT is switched (atomically) and reloads in the background
+    staging = artifacts.staging_dir(FAISS_DIR)
+    store.save_local(str(staging))
+    # Chunk text/metadata by position, read by the API instead of unpickling index.pkl
+    write_chunk_store(staging, store.index_to_docstore_id, store.docstore)
+    # Exact index: vectors as .npy, memory-mapped by the API (index.faiss stays for incremental ingest)
+    write_flat_vectors(staging, store.index)
+    # BM25 over the same chunks (same positions) for hybrid retrieval
+    write_sparse_index(staging, [
+        store.docstore.search(store.index_to_docstore_id[i]).page_content for i in range(store.index.ntotal)
+    ])
+    _write_manifest(staging, files)
+    write_params(staging, index_params)
+
+    # Content hash lets the API invalidate cached retrieval results for older indexes
+    version = write_index_version(staging)
+    artifacts.publish(FAISS_DIR, staging, version)
+    return version
+
+
+def ingest(incremental: bool = False, workers: int | None = None):
     """
     Offline ingestion step:
     - load KB documents
     - split into chunks
     - compute embeddings
-    - build FAISS index
-    - save index to disk (faiss_store/)
+    - build FAISS index (flat, IVF or HNSW; FAISS_INDEX_TYPE)
+    - build a BM25 index over the same chunks (bm25.npz)
+    - save index + chunk store (chunks.sqlite3) as a new version in faiss_store/versions/
+      and switch faiss_store/CURRENT to it
+    - write manifest (per-file content hash + chunk ids) and index version (content hash)
+
+    With incremental=True only new/changed files are embedded and vectors of
+    deleted/changed files are removed, so the cost scales with the change set.
+    Falls back to a full rebuild if there is no usable manifest.
+
+    Files are parsed in parallel (`workers` processes, default INGEST_WORKERS or CPU count).
+    Files that fail to load are reported and left out (or keep their previous vectors).
     """
-    documents = load_documents()
+    # Local embedding model (runs on mymachine; backend from EMBEDDING_BACKEND)
+    embeddings = get_embeddings()
+    splitter = _splitter()
 
-    # Split text into overlapping chunks to preserve context
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=800,
-        chunk_overlap=150,
+    current = {path.name: (path, _file_sha256(path)) for path in _kb_files()}
+
+    active_dir = artifacts.current_dir(FAISS_DIR)
+    index_exists = (active_dir / "index.faiss").exists()
+    manifest = _read_manifest(active_dir) if incremental and index_exists else None
+    if manifest is not None and {k: manifest.get(k) for k in _manifest_config()} != _manifest_config():
+        print("Ingest settings changed since last run; doing a full rebuild")
+        manifest = None
+
+    if manifest is None:
+        _full_ingest(current, embeddings, splitter, workers)
+        return
+
+    store = FAISS.load_local(str(active_dir), embeddings=embeddings, allow_dangerous_deserialization=True)
+    files = dict(manifest["files"])
+
+    removed = [name for name in files if name not in current]
+    changed = [name for name, (_, file_hash) in current.items() if name in files and files[name]["sha256"] != file_hash]
+    added = [name for name in current if name not in files]
+
+    if not (removed or changed or added):
+        print(f"KB unchanged; index at {FAISS_DIR} is up to date")
+        return
+
+    # Only the flat index renumbers on delete like LangChain's index_to_docstore_id does:
+    # HNSW cannot remove vectors, IVF remove_ids keeps the old ids (positions would drift
+    # away from the chunk store). Appending is fine for every type.
+    if (removed or changed) and manifest["index"]["type"] != "flat":
+        print(f"{manifest['index']['type']} index cannot drop vectors in place; doing a full rebuild")
+        _full_ingest(current, embeddings, splitter, workers)
+        return
+
+    loaded, failed = load_files([current[name][0] for name in changed + added], workers=workers)
+
+    # A modified file that fails to load keeps its previous vectors
+    changed = [name for name in changed if current[name][0] in loaded]
+    added = [name for name in added if current[name][0] in loaded]
+
+    # Drop vectors of deleted and modified files
+    stale_ids = [chunk_id for name in removed + changed for chunk_id in files[name]["chunk_ids"]]
+    if stale_ids:
+        store.delete(stale_ids)
+    for name in removed:
+        del files[name]
+
+    # Embed only new and modified files
+    new_chunks, new_ids = [], []
+    for name in changed + added:
+        path, file_hash = current[name]
+        file_chunks, file_ids = _chunk_file(path, loaded[path], file_hash, splitter)
+        new_chunks.extend(file_chunks)
+        new_ids.extend(file_ids)
+        files[name] = {"sha256": file_hash, "chunk_ids": file_ids}
+
+    if new_chunks:
+        store.add_documents(new_chunks, ids=new_ids)
+
+    version = _save(store, files, read_params(active_dir)["build"])
+    print(
+        f"Incremental ingest: +{len(added)} new, ~{len(changed)} changed, -{len(removed)} removed files; "
+        f"embedded {len(new_chunks)} chunks, removed {len(stale_ids)} (version {version})"
     )
-    chunks = splitter.split_documents(documents)
+    _report_failures(failed)
 
-    # Local embedding model (runs on mymachine; uses PyTorch)
-    embeddings = SentenceTransformerEmbeddings(model_name="all-MiniLM-L6-v2")
+
+def _full_ingest(current: dict, embeddings, splitter: RecursiveCharacterTextSplitter, workers: int | None) -> None:
+    loaded, failed = load_files([path for path, _ in current.values()], workers=workers)
+
+    chunks, ids, files = [], [], {}
+    for name, (path, file_hash) in current.items():
+        if path not in loaded:
+            continue
+        file_chunks, file_ids = _chunk_file(path, loaded[path], file_hash, splitter)
+        chunks.extend(file_chunks)
+        ids.extend(file_ids)
+        files[name] = {"sha256": file_hash, "chunk_ids": file_ids}
 
     # Build FAISS vector index from documents + embeddings
-    store = FAISS.from_documents(chunks, embedding=embeddings)
+    store = FAISS.from_documents(chunks, embedding=embeddings, ids=ids)
+
+    # Swap the exact flat index for the configured ANN index (FAISS_INDEX_TYPE)
+    params = build_params()
+    if params["type"] != "flat":
+        vectors = store.index.reconstruct_n(0, store.index.ntotal)
+        store.index, params = build_index(vectors, params)
+
+    version = _save(store, files, params)
 
-    # Persist index to disk
-    FAISS_DIR.mkdir(parents=True, exist_ok=True)
-    store.save_local(str(FAISS_DIR))
+    print(f"Ingested {len(chunks)} chunks into FAISS at {FAISS_DIR} (index {params['type']}, version {version})")
+    _report_failures(failed)
 
-    print(f"Ingested {len(chunks)} chunks into FAISS at {FAISS_DIR}")
+
+def _report_failures(failed: dict) -> None:
+    if failed:
+        print(f"{len(failed)} file(s) could not be loaded and were skipped:")
+        for path, error in failed.items():
+            print(f"  - {path.name}: {error}")
 
 
 if __name__ == "__main__":
-    ingest()
+    parser = argparse.ArgumentParser(description="Build the FAISS index from the knowledge base in kb/")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only embed new/changed files and remove deleted ones (uses faiss_store/manifest.json)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="processes used to parse files (default: INGEST_WORKERS or CPU count)",
+    )
+    args = parser.parse_args()
+
+    configure_logging()
+    ingest(incremental=args.incremental, workers=args.workers)
@@ -0,0 +1,111 @@
+"""
+Parity check for embedding backends.
+
+Compares a candidate backend (e.g. torch-int8 or onnx) with the fp32
+sentence-transformers model on the KB chunks and sample ticket texts:
+- cosine similarity of query vectors
+- overlap of top-k retrieved chunks
+- embedding throughput
+
+Usage:
+    python -m app.rag.parity --backend torch-int8 --k 3
+Exits with code 1 if the candidate is outside the tolerance.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.rag.embeddings import get_embeddings
+from app.rag.ingest import _splitter, load_documents
+
+QUERIES_PATH = "data/sample_tickets.csv"
+
+
+def _normalize(vectors: list[list[float]]) -> np.ndarray:
+    arr = np.asarray(vectors, dtype=np.float32)
+    return arr / np.clip(np.linalg.norm(arr, axis=1, keepdims=True), 1e-12, None)
+
+
+def _corpus(max_queries: int) -> tuple[list[str], list[str]]:
+    """KB chunks (as ingest splits them) and sample ticket texts used as queries."""
+    chunks = [c.page_content for c in _splitter().split_documents(load_documents())]
+    queries = pd.read_csv(QUERIES_PATH)["text"].astype(str).tolist()[:max_queries]
+    return chunks, queries
+
+
+def _embed(backend: str, chunks: list[str], queries: list[str]) -> tuple[np.ndarray, np.ndarray, float]:
+    embeddings = get_embeddings(backend)
+    started = time.perf_counter()
+    chunk_vecs = embeddings.embed_documents(chunks)
+    query_vecs = embeddings.embed_documents(queries)
+    elapsed = time.perf_counter() - started
+    throughput = (len(chunks) + len(queries)) / elapsed if elapsed > 0 else float("inf")
+    return _normalize(chunk_vecs), _normalize(query_vecs), throughput
+
+
+def _top_k(chunk_vecs: np.ndarray, query_vecs: np.ndarray, k: int) -> np.ndarray:
+    # FAISS uses L2 on raw vectors; on normalized vectors this ranks the same as cosine
+    scores = query_vecs @ chunk_vecs.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def parity_metrics(
+    ref_chunks: np.ndarray, ref_queries: np.ndarray, cand_chunks: np.ndarray, cand_queries: np.ndarray, k: int
+) -> dict:
+    """Per-query cosine (normalized vectors) and top-k overlap of the candidate vs the reference."""
+    cosine = np.sum(ref_queries * cand_queries, axis=1)
+
+    ref_top = _top_k(ref_chunks, ref_queries, k)
+    cand_top = _top_k(cand_chunks, cand_queries, k)
+    overlap = [len(set(a) & set(b)) / k for a, b in zip(ref_top, cand_top)]
+
+    return {
+        "cosine_min": float(cosine.min()),
+        "cosine_mean": float(cosine.mean()),
+        "topk_overlap_mean": float(np.mean(overlap)),
+    }
+
+
+def within_tolerance(result: dict, min_cosine: float, min_overlap: float) -> bool:
+    return result["cosine_min"] >= min_cosine and result["topk_overlap_mean"] >= min_overlap
+
+
+def compare(backend: str, k: int = 3, max_queries: int = 200) -> dict:
+    chunks, queries = _corpus(max_queries)
+
+    ref_chunks, ref_queries, ref_tps = _embed("sentence-transformers", chunks, queries)
+    cand_chunks, cand_queries, cand_tps = _embed(backend, chunks, queries)
+
+    return {
+        "backend": backend,
+        "chunks": len(chunks),
+        "queries": len(queries),
+        "k": k,
+        **parity_metrics(ref_chunks, ref_queries, cand_chunks, cand_queries, k),
+        "throughput_fp32": ref_tps,
+        "throughput_candidate": cand_tps,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare an embedding backend with the fp32 model")
+    parser.add_argument("--backend", default="torch-int8", help="candidate EMBEDDING_BACKEND")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="min per-query cosine vs fp32")
+    parser.add_argument("--min-overlap", type=float, default=0.9, help="min mean top-k overlap vs fp32")
+    args = parser.parse_args(argv)
+
+    result = compare(args.backend, k=args.k)
+    for key, value in result.items():
+        print(f"{key}={value:.4f}" if isinstance(value, float) else f"{key}={value}")
+
+    ok = within_tolerance(result, args.min_cosine, args.min_overlap)
+    print("PARITY OK" if ok else "PARITY FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
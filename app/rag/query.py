@@ -1,6 +1,20 @@
-from langchain_community.embeddings import SentenceTransformerEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_community.vectorstores import FAISS
 import os
+import threading
+
+import numpy as np
+
+from app.core import artifacts
+from app.core.metrics import stage
+from app.core.utils import normalize_text, sha256_text
+from app.rag.cache import TTLCache
+from app.rag.chunk_store import MmapVectorStore, chunk_store_exists
+from app.rag.embeddings import get_embeddings
+from app.rag.errors import IndexNotReadyError
+from app.rag.rerank import rerank, rerank_settings
+from app.rag.faiss_index import apply_search_params, read_params, search_defaults, search_parameters
+from app.rag.versioning import read_index_version
 
 # Directory where FAISS index was saved by ingest.py
 FAISS_DIR = os.getenv("FAISS_DIR", "faiss_store")
@@ -8,21 +22,124 @@ FAISS_DIR = os.getenv("FAISS_DIR", "faiss_store")
 # Cache objects so we don't reload model/index on every request
 _embeddings = None
 _store = None
+_store_version = None
+_embedding_cache = None
+_retrieval_cache = None
+# Guards swapping (_store, _store_version) together on hot reload
+_store_lock = threading.Lock()
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embedding model and caches query embeddings.
+
+    Key = sha256 of the normalized query text, so the same ticket answered twice
+    (or a retried email) is embedded only once. Document embeddings are not cached.
+    """
 
-class IndexNotReadyError(RuntimeError):
-    """Raised when FAISS index is not available (ingest not run)."""
-    pass
+    def __init__(self, inner: Embeddings, cache: TTLCache):
+        self.inner = inner
+        self.cache = cache
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        normalized = normalize_text(text)
+        key = sha256_text(normalized)
+
+        vector = self.cache.get(key)
+        if vector is None:
+            # Embed the normalized text so every key maps to exactly one vector
+            with stage("embedding"):
+                vector = self.inner.embed_query(normalized)
+            self.cache.set(key, vector)
+        return vector
 
 def reset_rag_cache():
     """Used by tests to force reloading FAISS index with a different FAISS_DIR."""
-    global _embeddings, _store
+    global _embeddings, _store, _store_version, _embedding_cache
     _embeddings = None
     _store = None
+    _store_version = None
+    _embedding_cache = None
+    _get_retrieval_cache().clear()
+
+def _get_embedding_cache() -> TTLCache:
+    """
+    Query-embedding cache.
+    EMBED_CACHE_SIZE: max cached queries (0 disables)
+    EMBED_CACHE_TTL_SECONDS: entry lifetime
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = TTLCache(
+            max_size=int(os.getenv("EMBED_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("EMBED_CACHE_TTL_SECONDS", "3600")),
+        )
+    return _embedding_cache
+
+def _get_retrieval_cache() -> TTLCache:
+    """
+    Cache of top-k search results keyed by (normalized question hash, search settings, index version).
+    RETRIEVAL_CACHE_SIZE: max cached results (0 disables)
+    RETRIEVAL_CACHE_TTL_SECONDS: entry lifetime
+    """
+    global _retrieval_cache
+    if _retrieval_cache is None:
+        _retrieval_cache = TTLCache(
+            max_size=int(os.getenv("RETRIEVAL_CACHE_SIZE", "512")),
+            ttl_seconds=float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "3600")),
+        )
+    return _retrieval_cache
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the RAG caches."""
+    return {
+        "query_embeddings": _get_embedding_cache().stats(),
+        "retrieval": _get_retrieval_cache().stats(),
+    }
     
 def _get_faiss_dir() -> str:
     # Read ENV at runtime (important for tests/CI/Docker)
     return os.getenv("FAISS_DIR", "faiss_store")
 
+def _get_embeddings() -> Embeddings:
+    global _embeddings
+    if _embeddings is None:
+        _embeddings = CachedEmbeddings(get_embeddings(), _get_embedding_cache())
+    return _embeddings
+
+def _load_store(faiss_dir: str):
+    """Load the active index version under `faiss_dir`; returns (store, version)."""
+    index_dir = artifacts.current_dir(faiss_dir)
+    try:
+        if chunk_store_exists(index_dir):
+            # Index (flat / IVF memory-mapped unless FAISS_MMAP=0) + on-disk chunk store:
+            # near-constant startup, pages shared by all workers via the OS cache
+            store = MmapVectorStore.load(
+                index_dir,
+                embeddings=_get_embeddings(),
+                mmap=os.getenv("FAISS_MMAP", "1") == "1",
+            )
+        else:
+            # Indexes built before the chunk store existed: FAISS index + pickled docstore
+            # allow_dangerous_deserialization=True is needed because LangChain stores metadata via pickle
+            store = FAISS.load_local(
+                str(index_dir),
+                embeddings=_get_embeddings(),
+                allow_dangerous_deserialization=True,
+            )
+        version = read_index_version(index_dir)
+
+        # Default nprobe / efSearch for ANN indexes (saved by ingest, env overrides)
+        apply_search_params(store.index, **search_defaults(read_params(index_dir)["search"]))
+    except Exception as e:
+        # Make API return a clean 400 instead of 500
+        raise IndexNotReadyError(
+            f"FAISS index not found or cannot be loaded from '{faiss_dir}'. Run ingest first."
+        ) from e
+    return store, version
+
 def _get_store():
     """
     Lazy-load and cache:
@@ -31,39 +148,107 @@ def _get_store():
 
     This is important for performance and stability in FastAPI.
     """
-    global _embeddings, _store
+    global _store, _store_version
 
-    if _embeddings is None:
-        _embeddings = SentenceTransformerEmbeddings(model_name="all-MiniLM-L6-v2")
+    _get_embeddings()
 
     if _store is None:
-        faiss_dir = _get_faiss_dir()
-        try:
-            # Loads FAISS index + docstore from disk
-            # allow_dangerous_deserialization=True is needed because LangChain stores metadata via pickle
-            _store = FAISS.load_local(
-                faiss_dir,
-                embeddings=_embeddings,
-                allow_dangerous_deserialization=True,
-            )
-        except Exception as e:
-            # Make API return a clean 400 instead of 500
-            raise IndexNotReadyError(
-                f"FAISS index not found or cannot be loaded from '{FAISS_DIR}'. Run ingest first."
-            ) from e
+        store, version = _load_store(_get_faiss_dir())
+        with _store_lock:
+            _store, _store_version = store, version
 
     return _store
 
+def reload_store() -> str:
+    """
+    Load the version CURRENT points to and swap it in (runs in a background thread).
+    Requests already searching keep the old store; no cache flush is needed
+    because retrieval results are keyed by index version.
+    """
+    global _store, _store_version
+    store, version = _load_store(_get_faiss_dir())
+    with _store_lock:
+        _store, _store_version = store, version
+    return version
+
+def store_version() -> str | None:
+    return _store_version
+
+artifacts.register(artifacts.HotReloader("faiss_index", _get_faiss_dir, store_version, reload_store))
+
 
-def rag_answer(question: str, k: int = 3) -> dict:
+def _search_with_params(store: FAISS, question: str, k: int, params) -> list:
+    # Same as FAISS.similarity_search, but with per-query FAISS search parameters
+    vector = np.asarray([store.embedding_function.embed_query(question)], dtype=np.float32)
+    with stage("vector_search"):
+        _, indices = store.index.search(vector, k, params=params)
+    return [
+        store.docstore.search(store.index_to_docstore_id[int(i)])
+        for i in indices[0]
+        if i != -1
+    ]
+
+
+def _hybrid_settings() -> tuple[float, int]:
     """
-    Retrieve top-k relevant KB chunks using FAISS similarity search
-    and return a simple extractive answer + sources.
+    HYBRID_SPARSE_WEIGHT: share of BM25 in the rank fusion (0 = dense only, 1 = BM25 only)
+    HYBRID_CANDIDATES: candidates taken from each side before fusion
+    """
+    weight = float(os.getenv("HYBRID_SPARSE_WEIGHT", "0.5"))
+    candidates = int(os.getenv("HYBRID_CANDIDATES", "20"))
+    return min(max(weight, 0.0), 1.0), candidates
+
+
+def rag_answer(
+    question: str,
+    k: int = 3,
+    nprobe: int | None = None,
+    ef_search: int | None = None,
+    sparse_weight: float | None = None,
+) -> dict:
     """
-    store = _get_store()
+    Retrieve top-k relevant KB chunks (FAISS similarity fused with BM25 when available,
+    optionally re-ranked by a cross-encoder within RERANK_BUDGET_MS)
+    and return a simple extractive answer + sources + whether re-ranking ran.
+
+    nprobe / ef_search override the index defaults for this query (IVF / HNSW indexes only).
+    sparse_weight overrides HYBRID_SPARSE_WEIGHT for this query.
+    """
+    _get_store()
+    # Snapshot store + version together, a hot reload may swap them at any time
+    with _store_lock:
+        store, version = _store, _store_version
+
+    default_weight, hybrid_candidates = _hybrid_settings()
+    sparse_weight = default_weight if sparse_weight is None else sparse_weight
+    rerank_enabled, rerank_candidates, rerank_budget_ms = rerank_settings()
+
+    # With re-ranking, retrieve a larger candidate set and let the cross-encoder pick the best k
+    n = max(k, rerank_candidates) if rerank_enabled else k
+
+    # Repeated questions against the same index skip embedding and search entirely
+    cache = _get_retrieval_cache()
+    cache_key = (sha256_text(normalize_text(question)), n, nprobe, ef_search, sparse_weight, version)
+    docs = cache.get(cache_key)
+    if docs is None:
+        params = search_parameters(store.index, nprobe, ef_search) if (nprobe or ef_search) else None
+        if isinstance(store, MmapVectorStore):
+            # Exact tokens (error codes, product names) come from BM25, paraphrases from FAISS
+            docs = store.hybrid_search(question, k=n, sparse_weight=sparse_weight, candidates=hybrid_candidates, params=params)
+        elif params is None:
+            # Similarity search returns k most similar chunks (legacy index: timing includes embedding)
+            with stage("vector_search"):
+                docs = store.similarity_search(question, k=n)
+        else:
+            docs = _search_with_params(store, question, n, params)
+        cache.set(cache_key, docs)
 
-    # Similarity search returns k most similar chunks
-    docs = store.similarity_search(question, k=k)
+    reranked = False
+    if rerank_enabled:
+        with stage("rerank"):
+            docs, reranked = rerank(question, docs, k, rerank_budget_ms)
+    else:
+        docs = docs[:k]
 
     # Join retrieved chunks into a single context
     context = "\n\n".join(d.page_content for d in docs)
@@ -87,4 +272,5 @@ def rag_answer(question: str, k: int = 3) -> dict:
     return {
         "answer": answer,
         "sources": sources,
+        "reranked": reranked,
     }
@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Small local cross-encoder (~22M params), scores (query, chunk) pairs jointly
+RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+_reranker = None
+_reranker_lock = threading.Lock()
+
+
+def rerank_settings() -> tuple[bool, int, float]:
+    """
+    RERANK_ENABLED: 1 turns the cross-encoder stage on (off by default)
+    RERANK_CANDIDATES: retrieved candidates scored by the cross-encoder
+    RERANK_BUDGET_MS: per-request scoring budget; over budget -> retrieval order is kept
+    """
+    enabled = os.getenv("RERANK_ENABLED", "0") == "1"
+    candidates = int(os.getenv("RERANK_CANDIDATES", "20"))
+    budget_ms = float(os.getenv("RERANK_BUDGET_MS", "150"))
+    return enabled, candidates, budget_ms
+
+
+class Reranker:
+    """
+    Scores candidates in small batches and keeps a running estimate of the cost per pair,
+    so it can stop before a batch that would not fit in the remaining budget.
+    """
+
+    def __init__(self, predict: Callable[[list[tuple[str, str]]], list[float]], batch_size: int = 8):
+        self._predict = predict
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self.seconds_per_pair: float | None = None
+
+    def _observe(self, pairs: int, seconds: float) -> None:
+        per_pair = seconds / max(pairs, 1)
+        with self._lock:
+            # Exponential moving average; the first observation seeds it
+            previous = self.seconds_per_pair
+            self.seconds_per_pair = per_pair if previous is None else 0.8 * previous + 0.2 * per_pair
+
+    def score(self, query: str, texts: list[str], deadline: float) -> list[float] | None:
+        """Scores for all texts, or None if the budget (perf_counter deadline) does not allow it."""
+        scores: list[float] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            estimate = self.seconds_per_pair
+            if estimate is not None and time.perf_counter() + estimate * len(batch) > deadline:
+                return None
+
+            started = time.perf_counter()
+            scores.extend(float(s) for s in self._predict([(query, text) for text in batch]))
+            self._observe(len(batch), time.perf_counter() - started)
+        return scores
+
+
+def get_reranker() -> Reranker:
+    global _reranker
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None:
+                from sentence_transformers import CrossEncoder
+
+                model = CrossEncoder(RERANK_MODEL, device="cpu", max_length=256)
+                _reranker = Reranker(lambda pairs: model.predict(pairs, show_progress_bar=False))
+    return _reranker
+
+
+def rerank(query: str, docs: list, k: int, budget_ms: float, reranker: Reranker | None = None) -> tuple[list, bool]:
+    """
+    Re-order retrieved docs by cross-encoder score and keep the best k.
+    Returns (docs, reranked); when the budget would be exceeded (or scoring fails)
+    the retrieval order is returned with reranked=False.
+    """
+    if len(docs) <= 1:
+        return docs[:k], False
+
+    try:
+        # Model load (first call, normally done by warm-up) does not count against the budget
+        reranker = reranker or get_reranker()
+        deadline = time.perf_counter() + budget_ms / 1000
+        scores = reranker.score(query, [d.page_content for d in docs], deadline)
+    except Exception:
+        logger.exception("Re-ranking failed, keeping retrieval order")
+        scores = None
+
+    if scores is None:
+        return docs[:k], False
+
+    order = sorted(range(len(docs)), key=lambda i: -scores[i])
+    return [docs[i] for i in order[:k]], True
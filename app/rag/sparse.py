@@ -0,0 +1,105 @@
+import re
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+# Written next to the index by ingest: BM25 postings over the same chunks (by FAISS position)
+SPARSE_INDEX_FILE = "bm25.npz"
+
+# Keeps exact tokens such as error codes ("812", "0x80070005") and policy ids
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[._-][a-z0-9]+)*")
+
+# Standard RRF constant: dampens the influence of the very first ranks
+RRF_K = 60
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def write_sparse_index(faiss_dir: str | Path, texts: list[str], k1: float = 1.2, b: float = 0.75) -> None:
+    """
+    Build BM25 postings for `texts` (position i = FAISS position i) and save them.
+    Per-posting BM25 weights are precomputed, so a query is a few array lookups + adds.
+    """
+    doc_terms = [Counter(tokenize(text)) for text in texts]
+    doc_len = np.array([sum(terms.values()) for terms in doc_terms], dtype=np.float32)
+    avgdl = float(doc_len.mean()) if len(texts) else 0.0
+
+    postings: dict[str, tuple[list[int], list[int]]] = {}
+    for position, terms in enumerate(doc_terms):
+        for term, tf in terms.items():
+            plist = postings.setdefault(term, ([], []))
+            plist[0].append(position)
+            plist[1].append(tf)
+
+    n = len(texts)
+    terms = sorted(postings)
+    df = np.array([len(postings[term][0]) for term in terms], dtype=np.float32)
+    offsets = np.concatenate([[0], np.cumsum(df, dtype=np.int64)])
+    doc_ids = np.array([p for term in terms for p in postings[term][0]], dtype=np.int32)
+    tf = np.array([f for term in terms for f in postings[term][1]], dtype=np.float32)
+
+    # BM25 term weight per posting: idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+    idf = np.repeat(np.log(1 + (n - df + 0.5) / (df + 0.5)), df.astype(np.int64))
+    norm = k1 * (1 - b + b * doc_len[doc_ids] / avgdl) if avgdl else np.full_like(tf, k1)
+    weights = (idf * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+
+    np.savez(
+        Path(faiss_dir) / SPARSE_INDEX_FILE,
+        terms=np.array(terms, dtype=str),
+        offsets=offsets,
+        doc_ids=doc_ids,
+        weights=weights,
+        n_docs=np.array([n], dtype=np.int64),
+    )
+
+
+class BM25Index:
+    """In-memory BM25 postings (loaded from bm25.npz)."""
+
+    def __init__(self, terms: np.ndarray, offsets: np.ndarray, doc_ids: np.ndarray, weights: np.ndarray, n_docs: int):
+        self._term_ids = {str(term): i for i, term in enumerate(terms)}
+        self._offsets = offsets
+        self._doc_ids = doc_ids
+        self._weights = weights
+        self.n_docs = n_docs
+
+    @classmethod
+    def load(cls, faiss_dir: str | Path) -> "BM25Index":
+        data = np.load(Path(faiss_dir) / SPARSE_INDEX_FILE)
+        return cls(data["terms"], data["offsets"], data["doc_ids"], data["weights"], int(data["n_docs"][0]))
+
+    def search(self, query: str, k: int) -> list[int]:
+        """Positions of the top-k chunks by BM25 score (only chunks sharing a term with the query)."""
+        slices = [
+            (self._offsets[i], self._offsets[i + 1])
+            for i in (self._term_ids.get(term) for term in set(tokenize(query)))
+            if i is not None
+        ]
+        if not slices:
+            return []
+
+        # Sum the precomputed weights per chunk in C (bincount), then partial top-k
+        doc_ids = np.concatenate([self._doc_ids[start:end] for start, end in slices])
+        weights = np.concatenate([self._weights[start:end] for start, end in slices])
+        scores = np.bincount(doc_ids, weights=weights, minlength=self.n_docs)
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        return sorted(matched.tolist(), key=lambda p: (-scores[p], p))
+
+
+def reciprocal_rank_fusion(dense: list[int], sparse: list[int], sparse_weight: float) -> list[int]:
+    """
+    Weighted RRF: score(d) = (1 - w) / (RRF_K + rank_dense) + w / (RRF_K + rank_sparse).
+    Rank-based, so BM25 and L2 scores need no calibration against each other.
+    """
+    scores: dict[int, float] = {}
+    for rank, position in enumerate(dense, start=1):
+        scores[position] = scores.get(position, 0.0) + (1 - sparse_weight) / (RRF_K + rank)
+    for rank, position in enumerate(sparse, start=1):
+        scores[position] = scores.get(position, 0.0) + sparse_weight / (RRF_K + rank)
+    return sorted(scores, key=lambda p: -scores[p])
@@ -0,0 +1,33 @@
+import hashlib
+from pathlib import Path
+
+# Written next to the FAISS artifacts by ingest; identifies the index content
+VERSION_FILE = "index.version"
+
+
+def compute_index_version(faiss_dir: str | Path) -> str:
+    """Content hash over all index files in `faiss_dir` (sorted by name)."""
+    faiss_dir = Path(faiss_dir)
+    digest = hashlib.sha256()
+    for path in sorted(faiss_dir.iterdir()):
+        if not path.is_file() or path.name == VERSION_FILE:
+            continue
+        digest.update(path.name.encode("utf-8"))
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def write_index_version(faiss_dir: str | Path) -> str:
+    version = compute_index_version(faiss_dir)
+    (Path(faiss_dir) / VERSION_FILE).write_text(version, encoding="utf-8")
+    return version
+
+
+def read_index_version(faiss_dir: str | Path) -> str:
+    """Version written by ingest; computed on the fly for indexes built before versioning existed."""
+    version_file = Path(faiss_dir) / VERSION_FILE
+    if version_file.exists():
+        return version_file.read_text(encoding="utf-8").strip()
+    return compute_index_version(faiss_dir)
@@ -0,0 +1,123 @@
+"""
+Offline stand-in for Azure OpenAI chat completions, for benchmarking /answer without network.
+
+    python -m benchmarks.fake_openai --port 8099 --latency-ms 800 --jitter-ms 200
+
+Point the API at it:
+
+    AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8099 AZURE_OPENAI_API_KEY=fake AZURE_OPENAI_DEPLOYMENT=fake
+
+Non-streaming calls answer after the configured latency; streaming calls spread the same
+latency over the chunks (the first chunk after FAKE_OPENAI_TTFT_MS).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+ANSWER = (
+    "Thank you for reaching out. Based on our internal procedures [1], please follow the steps "
+    "described in the referenced document. If the issue persists, reply to this message and "
+    "we will escalate it to the responsible team."
+)
+
+app = FastAPI(title="Fake Azure OpenAI")
+
+
+def latency_settings() -> tuple[float, float, float]:
+    """
+    FAKE_OPENAI_LATENCY_MS: total time of a completion
+    FAKE_OPENAI_JITTER_MS: uniform +/- jitter added to it
+    FAKE_OPENAI_TTFT_MS: time to the first streamed chunk
+    """
+    latency = float(os.getenv("FAKE_OPENAI_LATENCY_MS", "800"))
+    jitter = float(os.getenv("FAKE_OPENAI_JITTER_MS", "0"))
+    ttft = float(os.getenv("FAKE_OPENAI_TTFT_MS", "200"))
+    return latency, jitter, ttft
+
+
+def _total_seconds() -> float:
+    latency, jitter, _ = latency_settings()
+    return max(0.0, latency + random.uniform(-jitter, jitter)) / 1000
+
+
+def _completion(deployment: str) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": deployment,
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": ANSWER}},
+        ],
+        "usage": {"prompt_tokens": 400, "completion_tokens": len(ANSWER.split()), "total_tokens": 400 + len(ANSWER.split())},
+    }
+
+
+def _chunk(completion_id: str, deployment: str, delta: dict, finish_reason: str | None = None) -> str:
+    event = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": deployment,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(event)}\n\n"
+
+
+async def _stream(deployment: str):
+    _, _, ttft = latency_settings()
+    total = _total_seconds()
+    first = min(ttft / 1000, total)
+    words = ANSWER.split(" ")
+    per_chunk = (total - first) / max(len(words) - 1, 1)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+    await asyncio.sleep(first)
+    yield _chunk(completion_id, deployment, {"role": "assistant", "content": ""})
+    for i, word in enumerate(words):
+        if i:
+            await asyncio.sleep(per_chunk)
+        yield _chunk(completion_id, deployment, {"content": word if i == 0 else f" {word}"})
+    yield _chunk(completion_id, deployment, {}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/openai/deployments/{deployment}/chat/completions")
+async def chat_completions(deployment: str, request: Request):
+    payload = await request.json()
+    if payload.get("stream"):
+        return StreamingResponse(_stream(deployment), media_type="text/event-stream")
+    await asyncio.sleep(_total_seconds())
+    return _completion(deployment)
+
+
+def main() -> None:
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Azure OpenAI chat completions endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, help="total completion time (FAKE_OPENAI_LATENCY_MS)")
+    parser.add_argument("--jitter-ms", type=float, help="+/- jitter (FAKE_OPENAI_JITTER_MS)")
+    parser.add_argument("--ttft-ms", type=float, help="time to first streamed chunk (FAKE_OPENAI_TTFT_MS)")
+    args = parser.parse_args()
+
+    for name, value in (("LATENCY", args.latency_ms), ("JITTER", args.jitter_ms), ("TTFT", args.ttft_ms)):
+        if value is not None:
+            os.environ[f"FAKE_OPENAI_{name}_MS"] = str(value)
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
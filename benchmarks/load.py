@@ -0,0 +1,275 @@
+"""
+Load test for the API: closed-loop async workers send a weighted mix of requests for a fixed time.
+
+    python -m benchmarks.load --base-url http://localhost:8000 --concurrency 16 --duration 30 \
+        --mix login=1,create=2,classify=5,answer=2
+
+Reports RPS and p50/p95/p99 latency per endpoint and writes them (with the git commit)
+to reports/bench/; `--compare <earlier.json>` prints the change against a previous run.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import subprocess
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+REPORTS_DIR = Path("reports") / "bench"
+DEFAULT_MIX = {"login": 1, "create": 2, "classify": 5, "answer": 2}
+PASSWORD = "BenchPassword123"
+SEED_TEXTS = [
+    ("VPN does not work", "I cannot login to VPN since morning, error 812."),
+    ("Invoice question", "Our last invoice has a wrong billing address."),
+    ("Service is down", "Critical outage, users cannot access the portal."),
+    ("Password reset", "My account is locked after too many attempts."),
+    ("New laptop", "Please order a laptop for a new colleague starting Monday."),
+]
+
+
+@dataclass
+class Session:
+    # Shared state created once before the run
+    email: str
+    token: str
+    ticket_ids: list[str] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """'login=1,classify=5' -> {'login': 1.0, 'classify': 5.0}"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}', expected one of {sorted(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("Request mix needs at least one positive weight")
+    return mix
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile of an ascending list (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _ticket_payload(rng: random.Random) -> dict:
+    subject, body = rng.choice(SEED_TEXTS)
+    # Unique text per ticket, so each of the --tickets tickets is a distinct cache key
+    return {"channel": "email", "subject": subject, "body": f"{body} (ref {rng.randrange(10**9)})"}
+
+
+async def _login(client: httpx.AsyncClient, session: Session, rng: random.Random) -> httpx.Response:
+    return await client.post("/auth/login", json={"email": session.email, "password": PASSWORD})
+
+
+async def _create(client: httpx.AsyncClient, session: Session, rng: random.Random) -> httpx.Response:
+    return await client.post("/tickets", json=_ticket_payload(rng), headers=session.headers)
+
+
+async def _classify(client: httpx.AsyncClient, session: Session, rng: random.Random) -> httpx.Response:
+    return await client.post(f"/tickets/{rng.choice(session.ticket_ids)}/classify", headers=session.headers)
+
+
+async def _answer(client: httpx.AsyncClient, session: Session, rng: random.Random) -> httpx.Response:
+    return await client.post(f"/tickets/{rng.choice(session.ticket_ids)}/answer", headers=session.headers)
+
+
+ENDPOINTS = {
+    "login": _login,
+    "create": _create,
+    "classify": _classify,
+    "answer": _answer,
+}
+
+
+async def setup_session(client: httpx.AsyncClient, tickets: int, seed: int = 0) -> Session:
+    """Register a fresh benchmark user, log in and create the tickets used by classify/answer."""
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    r = await client.post("/auth/register", json={"email": email, "password": PASSWORD, "full_name": "Benchmark"})
+    r.raise_for_status()
+    r = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    r.raise_for_status()
+    session = Session(email=email, token=r.json()["access_token"])
+
+    rng = random.Random(seed)
+    for _ in range(tickets):
+        r = await client.post("/tickets", json=_ticket_payload(rng), headers=session.headers)
+        r.raise_for_status()
+        session.ticket_ids.append(r.json()["id"])
+    return session
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    session: Session,
+    mix: dict[str, float],
+    rng: random.Random,
+    measure_from: float,
+    deadline: float,
+    samples: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            ok = (await ENDPOINTS[name](client, session, rng)).status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        finished = time.perf_counter()
+        # Requests started during warm-up (or finished after the deadline) are not counted
+        if started < measure_from or finished > deadline:
+            continue
+        if ok:
+            samples[name].append((finished - started) * 1000)
+        else:
+            errors[name] += 1
+
+
+def summarize(samples: dict[str, list[float]], errors: dict[str, int], seconds: float) -> dict:
+    def stats(latencies: list[float], failed: int) -> dict:
+        latencies = sorted(latencies)
+        return {
+            "requests": len(latencies),
+            "errors": failed,
+            "rps": round(len(latencies) / seconds, 2) if seconds else None,
+            "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            **{f"p{q}_ms": _round(percentile(latencies, q)) for q in (50, 95, 99)},
+            "max_ms": _round(latencies[-1] if latencies else None),
+        }
+
+    endpoints = {name: stats(samples[name], errors[name]) for name in samples}
+    everything = [latency for latencies in samples.values() for latency in latencies]
+    return {"endpoints": endpoints, "total": stats(everything, sum(errors.values()))}
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 2)
+
+
+async def run_benchmark(
+    client: httpx.AsyncClient,
+    mix: dict[str, float],
+    concurrency: int = 16,
+    duration: float = 30.0,
+    warmup: float = 5.0,
+    tickets: int = 50,
+    seed: int = 0,
+) -> dict:
+    """
+    Run `concurrency` closed-loop workers for warmup + duration seconds against `client`
+    (base_url set, or an ASGI transport) and return the per-endpoint summary.
+    """
+    session = await setup_session(client, tickets, seed)
+    samples: dict[str, list[float]] = {name: [] for name in mix}
+    errors: dict[str, int] = {name: 0 for name in mix}
+
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+    await asyncio.gather(*(
+        _worker(client, session, mix, random.Random(seed + i + 1), measure_from, deadline, samples, errors)
+        for i in range(concurrency)
+    ))
+    return summarize(samples, errors, duration)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict) -> list[str]:
+    """One line per endpoint: RPS and p95 of the current run vs the baseline."""
+    lines = []
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if not before:
+            continue
+        parts = []
+        for key in ("rps", "p95_ms"):
+            if before[key] and now[key] is not None:
+                parts.append(f"{key}={before[key]} -> {now[key]} ({(now[key] - before[key]) / before[key]:+.1%})")
+        lines.append(f"{name:<9} " + "  ".join(parts))
+    return lines
+
+
+def _print_table(summary: dict) -> None:
+    print(f"{'endpoint':<9} {'requests':>9} {'errors':>7} {'rps':>8} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9}")
+    for name, s in [*summary["endpoints"].items(), ("total", summary["total"])]:
+        print(f"{name:<9} {s['requests']:>9} {s['errors']:>7} {s['rps']!s:>8} {s['p50_ms']!s:>9} {s['p95_ms']!s:>9} {s['p99_ms']!s:>9}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test the Ticket Copilot API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent closed-loop workers")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds of load before measuring")
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()), help="endpoint weights, e.g. classify=5,answer=1")
+    parser.add_argument("--tickets", type=int, default=50, help="tickets created up front for classify/answer")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout (seconds)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=REPORTS_DIR, help="directory for the JSON result")
+    parser.add_argument("--compare", type=Path, help="earlier result JSON to compare against")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+
+    async def _run() -> dict:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+            return await run_benchmark(client, mix, args.concurrency, args.duration, args.warmup, args.tickets, args.seed)
+
+    started_at = datetime.now(timezone.utc)
+    summary = asyncio.run(_run())
+    commit = _git_commit()
+    result = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "git_commit": commit,
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "mix": mix,
+            "tickets": args.tickets,
+        },
+        **summary,
+    }
+
+    _print_table(summary)
+    args.out.mkdir(parents=True, exist_ok=True)
+    path = args.out / f"bench-{started_at:%Y%m%dT%H%M%S}-{(commit or 'nogit')[:8]}.json"
+    path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"Saved results to {path}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"Compared to {args.compare} (commit {str(baseline['meta'].get('git_commit'))[:8]}):")
+        for line in compare(baseline, result):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
 import os
 import imaplib
 import email
+import json
+import uuid
 from email.header import decode_header
 from email.message import Message
 from email.utils import parseaddr
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 import requests
 from dotenv import load_dotenv
@@ -183,7 +185,34 @@ def login_and_get_token() -> Optional[str]:
     return token
 
 
-def create_ticket(subject: str, body: str, sender_name: str, token: str) -> Optional[str]:
+def api_headers(token: str, request_id: Optional[str] = None) -> dict:
+    """
+    Auth header, plus X-Request-ID when given: the API then uses it as its request id
+    (AuditLog.request_id, API log lines), so all calls made for one email share it.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    if request_id:
+        headers["X-Request-ID"] = request_id
+    return headers
+
+
+def log_server_timing(endpoint: str, response: requests.Response, timings: Optional[str] = None) -> None:
+    """
+    Log the API's per-stage timing breakdown for one call (Server-Timing header,
+    e.g. "auth;dur=1.2, db_fetch;dur=0.4, inference;dur=0.3, total;dur=5.1").
+    """
+    logger.info(
+        "API call timing",
+        extra={
+            "endpoint": endpoint,
+            "request_id": response.headers.get("X-Request-ID"),
+            "status_code": response.status_code,
+            "server_timing": timings or response.headers.get("Server-Timing"),
+        },
+    )
+
+
+def create_ticket(subject: str, body: str, sender_name: str, token: str, request_id: Optional[str] = None) -> Optional[str]:
     """
     Create a new ticket via the backend API.
 
@@ -198,7 +227,7 @@ def create_ticket(subject: str, body: str, sender_name: str, token: str) -> Opti
         "body": enriched_body,
     }
 
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = api_headers(token, request_id)
 
     try:
         response = requests.post(
@@ -211,6 +240,8 @@ def create_ticket(subject: str, body: str, sender_name: str, token: str) -> Opti
         logger.exception("Failed to create ticket", exc_info=exc)
         return None
 
+    log_server_timing("create_ticket", response)
+
     if response.status_code != 200:
         logger.error("Ticket creation failed", extra={"status_code": response.status_code, "response": response.text})
         return None
@@ -220,36 +251,103 @@ def create_ticket(subject: str, body: str, sender_name: str, token: str) -> Opti
     return ticket_id
 
 
-def classify_ticket(ticket_id: str, token: str) -> dict:
+def classify_ticket(ticket_id: str, token: str, request_id: Optional[str] = None) -> dict:
     """
     Run ticket classification and return the API response.
     """
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = api_headers(token, request_id)
 
     response = requests.post(
         f"{API_BASE}/tickets/{ticket_id}/classify",
         headers=headers,
         timeout=30,
     )
+    log_server_timing("classify", response)
     response.raise_for_status()
     return response.json()
 
 
-def answer_ticket(ticket_id: str, token: str) -> dict:
+def answer_ticket(ticket_id: str, token: str, request_id: Optional[str] = None) -> dict:
     """
     Generate a suggested reply using RAG + LLM.
     """
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = api_headers(token, request_id)
 
     response = requests.post(
         f"{API_BASE}/tickets/{ticket_id}/answer",
         headers=headers,
         timeout=60,
     )
+    log_server_timing("answer", response)
     response.raise_for_status()
     return response.json()
 
 
+def iter_sse_events(lines: Iterable[str]) -> Iterator[tuple[str, dict]]:
+    """
+    Parse a Server-Sent Events stream into (event, data) pairs.
+    Data lines are JSON, as sent by /tickets/{id}/answer/stream.
+    """
+    event = "message"
+    data_lines = []
+
+    for line in lines:
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event = "message"
+            data_lines = []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+    if data_lines:
+        yield event, json.loads("\n".join(data_lines))
+
+
+def answer_ticket_stream(
+    ticket_id: str,
+    token: str,
+    on_token: Optional[Callable[[str], None]] = None,
+    request_id: Optional[str] = None,
+) -> dict:
+    """
+    Generate a suggested reply via the streaming endpoint.
+
+    `on_token` is called with each text chunk as it arrives.
+    Returns the same shape as answer_ticket().
+    """
+    headers = {**api_headers(token, request_id), "Accept": "text/event-stream"}
+
+    response = requests.post(
+        f"{API_BASE}/tickets/{ticket_id}/answer/stream",
+        headers=headers,
+        timeout=60,
+        stream=True,
+    )
+    response.raise_for_status()
+
+    result = {"ticket_id": ticket_id, "suggested_answer": "", "sources": [], "answer_mode": "unknown"}
+    for event, data in iter_sse_events(response.iter_lines(decode_unicode=True)):
+        if event == "sources":
+            result["sources"] = data["sources"]
+        elif event == "token":
+            if on_token:
+                on_token(data["text"])
+        elif event == "done":
+            result["suggested_answer"] = data["suggested_answer"]
+            result["answer_mode"] = data["answer_mode"]
+            # The Server-Timing header was sent before the LLM ran; `done` has the full breakdown
+            log_server_timing("answer_stream", response, data.get("timings"))
+        elif event == "error":
+            raise RuntimeError(f"Answer stream failed: {data.get('detail')}")
+
+    return result
+
+
 def process_unread_emails(limit: int = 3, verbose: bool = True) -> None:
     """
     Connect to the mailbox, fetch a few unread emails, and process them.
@@ -330,28 +428,33 @@ def process_unread_emails(limit: int = 3, verbose: bool = True) -> None:
             logger.warning("Skipping email without plain text body", extra={"subject": subject})
             continue
 
-        ticket_id = create_ticket(subject, body, sender_name, token)
+        # One id for all API calls made for this email, to find them in the API logs / audit log
+        request_id = str(uuid.uuid4())
+
+        ticket_id = create_ticket(subject, body, sender_name, token, request_id)
         if not ticket_id:
             continue
 
-        classification = classify_ticket(ticket_id, token)
-        answer = answer_ticket(ticket_id, token)
+        classification = classify_ticket(ticket_id, token, request_id)
+
+        # User-facing output: show only the generated reply, streamed as it is generated
+        print("\nGenerated reply:\n")
+        answer = answer_ticket_stream(
+            ticket_id, token, on_token=lambda text: print(text, end="", flush=True), request_id=request_id
+        )
         suggested_reply = answer["suggested_answer"]
+        print("\n" + "-" * 80 + "\n")
 
         save_generated_reply(ticket_id, sender_name, subject, suggested_reply)
 
         if message_id:
             save_processed_id(message_id)
 
-        # User-facing output: show only the generated reply
-        print("\nGenerated reply:\n")
-        print(suggested_reply)
-        print("\n" + "-" * 80 + "\n")
-
         logger.info(
             "Email processed successfully",
             extra={
                 "ticket_id": ticket_id,
+                "request_id": request_id,
                 "category": classification.get("category"),
                 "priority": classification.get("priority"),
                 "answer_mode": answer.get("answer_mode"),
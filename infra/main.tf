@@ -76,6 +76,18 @@ resource "azurerm_container_app" "api" {
       cpu    = 0.5
       memory = "1Gi"
 
+      # No traffic until warm-up (model, embeddings, FAISS index) has finished
+      readiness_probe {
+        transport = "HTTP"
+        port      = 8000
+        path      = "/health/ready"
+      }
+
+      liveness_probe {
+        transport = "HTTP"
+        port      = 8000
+        path      = "/health/live"
+      }
 
       env {
         name  = "FAISS_DIR"
@@ -8,6 +8,9 @@ from fastapi.testclient import TestClient
 # Use a dedicated SQLite database for tests only
 os.environ["DATABASE_URL"] = "sqlite:///./test_ticketcopilot.db"
 
+# Tests load models lazily (or fake them); skip the startup warm-up
+os.environ["WARMUP_ON_STARTUP"] = "0"
+
 # Make project root importable
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
@@ -27,6 +27,40 @@ def test_create_ticket_and_classify(client, auth_headers):
     assert pred["model_version"] in ["rules-v0", "tfidf-logreg-v1"]
 
 
+def test_batch_classify_returns_results_in_order(client, auth_headers):
+    headers = auth_headers(email="api6@example.com")
+
+    ticket_ids = []
+    for subject, body in [
+        ("VPN does not work", "I cannot login to VPN since morning."),
+        ("Invoice question", "Our last invoice has a wrong billing address."),
+        ("Service is down", "Critical outage, cannot access systems"),
+    ]:
+        r = client.post("/tickets", json={"subject": subject, "body": body}, headers=headers)
+        assert r.status_code == 200
+        ticket_ids.append(r.json()["id"])
+
+    r2 = client.post("/tickets/classify:batch", json={"ticket_ids": ticket_ids}, headers=headers)
+    assert r2.status_code == 200
+
+    preds = r2.json()
+    assert [p["ticket_id"] for p in preds] == ticket_ids
+    for pred in preds:
+        assert pred["category"] in ["access", "incident", "billing", "general"]
+        assert pred["model_version"] in ["rules-v0", "tfidf-logreg-v1"]
+
+
+def test_batch_classify_rejects_foreign_ticket(client, auth_headers):
+    owner_headers = auth_headers(email="api7@example.com")
+    other_headers = auth_headers(email="api8@example.com")
+
+    r = client.post("/tickets", json={"subject": "Private", "body": "Owner only"}, headers=owner_headers)
+    ticket_id = r.json()["id"]
+
+    r2 = client.post("/tickets/classify:batch", json={"ticket_ids": [ticket_id]}, headers=other_headers)
+    assert r2.status_code == 403
+
+
 def test_get_missing_ticket_returns_404(client, auth_headers):
     headers = auth_headers(email="api2@example.com")
 
@@ -100,3 +134,52 @@ def test_answer_works_when_index_exists(client, auth_headers):
 
 
 
+
+
+def test_answer_stream_sends_sources_tokens_and_done(client, auth_headers, monkeypatch):
+    headers = auth_headers(email="api9@example.com")
+
+    def fake_rag_answer(question, k=3):
+        return {
+            "answer": "Based on internal procedures:\n\nRestart the VPN client and sign in again.",
+            "sources": [{"source": "kb/vpn_procedure.pdf", "snippet": "Restart the VPN client"}],
+        }
+
+    monkeypatch.setattr("app.api.routes.rag_answer", fake_rag_answer)
+    monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+
+    r = client.post("/tickets", json={"subject": "VPN", "body": "VPN is broken"}, headers=headers)
+    ticket_id = r.json()["id"]
+
+    r2 = client.post(f"/tickets/{ticket_id}/answer/stream", headers=headers)
+    assert r2.status_code == 200
+    assert r2.headers["content-type"].startswith("text/event-stream")
+
+    from email_ingest.ingest_mailbox import iter_sse_events
+
+    events = list(iter_sse_events(r2.text.splitlines()))
+    names = [name for name, _ in events]
+
+    assert names[0] == "sources"
+    assert names[-1] == "done"
+    assert "token" in names
+
+    done = events[-1][1]
+    assert done["answer_mode"] == "extractive"
+    assert "".join(data["text"] for name, data in events if name == "token").strip() == done["suggested_answer"]
+
+
+def test_admin_reload_requires_admin_token(client, monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert client.post("/admin/reload").status_code == 404
+
+    monkeypatch.setenv("ADMIN_TOKEN", "secret-admin-token")
+    assert client.post("/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    r = client.post(
+        "/admin/reload",
+        json={"artifacts": ["classifier_model"]},
+        headers={"X-Admin-Token": "secret-admin-token"},
+    )
+    assert r.status_code == 202
+    assert list(r.json()["triggered"]) == ["classifier_model"]
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from prometheus_client import REGISTRY
+
+from app.core.batching import MicroBatcher
+
+
+def test_micro_batcher_returns_each_caller_its_result():
+    seen_sizes = []
+
+    def double(items):
+        seen_sizes.append(len(items))
+        return [x * 2 for x in items]
+
+    batcher = MicroBatcher(double, window_ms=50, max_batch_size=8)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = [pool.submit(lambda x=x: batcher.submit(x).result(timeout=5)) for x in range(32)]
+        results = [f.result() for f in futures]
+
+    assert results == [x * 2 for x in range(32)]
+    assert max(seen_sizes) <= 8
+    assert len(seen_sizes) < 32
+
+    stats = batcher.stats()
+    assert stats["items"] == 32
+    assert stats["batches"] == len(seen_sizes)
+
+
+def test_micro_batcher_propagates_errors():
+    def boom(items):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(boom, window_ms=1, max_batch_size=4)
+
+    with pytest.raises(ValueError, match="model failed"):
+        batcher.submit("x").result(timeout=5)
+
+
+def test_micro_batcher_fails_callers_when_results_are_missing():
+    batcher = MicroBatcher(lambda items: items[:-1], window_ms=50, max_batch_size=4, name="short-batcher")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(lambda x=x: batcher.submit(x).result(timeout=5)) for x in range(4)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="results for"):
+                future.result()
+
+    assert REGISTRY.get_sample_value("ticketcopilot_batches_total", {"batcher": "short-batcher", "outcome": "error"}) >= 1
+    assert REGISTRY.get_sample_value("ticketcopilot_batch_size_sum", {"batcher": "short-batcher"}) == 4
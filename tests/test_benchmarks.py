@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import classifier
+from app.main import app
+from benchmarks import fake_openai
+from benchmarks.load import compare, parse_mix, percentile, run_benchmark
+
+
+def test_percentile_and_mix_parsing():
+    values = [float(v) for v in range(1, 101)]
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50.0, 95.0, 99.0)
+    assert percentile([], 50) is None
+
+    assert parse_mix("login=1,classify=5") == {"login": 1.0, "classify": 5.0}
+    with pytest.raises(ValueError):
+        parse_mix("login=1,unknown=2")
+
+
+def test_run_benchmark_against_the_app():
+    # Model load is not what this test measures
+    classifier._get_model()
+
+    async def _run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run_benchmark(
+                client, {"login": 1, "create": 1, "classify": 2}, concurrency=4, duration=2.0, warmup=0.5, tickets=3
+            )
+
+    summary = asyncio.run(_run())
+
+    assert set(summary["endpoints"]) == {"login", "create", "classify"}
+    for stats in summary["endpoints"].values():
+        assert stats["errors"] == 0
+        assert stats["requests"] > 0
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    assert summary["total"]["requests"] == sum(s["requests"] for s in summary["endpoints"].values())
+
+    faster = json.loads(json.dumps(summary))
+    faster["endpoints"]["login"]["rps"] *= 2
+    assert compare(summary, faster)[0].startswith("login")
+
+
+def test_fake_openai_completion_and_stream(monkeypatch):
+    monkeypatch.setenv("FAKE_OPENAI_LATENCY_MS", "0")
+    monkeypatch.setenv("FAKE_OPENAI_TTFT_MS", "0")
+    client = TestClient(fake_openai.app)
+    url = "/openai/deployments/fake/chat/completions?api-version=2024-02-15-preview"
+
+    r = client.post(url, json={"messages": []})
+    assert r.json()["choices"][0]["message"]["content"] == fake_openai.ANSWER
+
+    r = client.post(url, json={"messages": [], "stream": True})
+    events = [line[len("data: "):] for line in r.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    text = "".join(json.loads(e)["choices"][0]["delta"].get("content", "") for e in events[:-1])
+    assert text == fake_openai.ANSWER
@@ -5,6 +5,7 @@ from email_ingest.ingest_mailbox import (
     create_ticket,
     classify_ticket,
     answer_ticket,
+    answer_ticket_stream,
 )
 
 
@@ -96,4 +97,36 @@ def test_answer_ticket_uses_bearer_token(mock_post):
     assert result["answer_mode"] == "llm"
 
     _, kwargs = mock_post.call_args
-    assert kwargs["headers"]["Authorization"] == "Bearer jwt-token"
\ No newline at end of file
+    assert kwargs["headers"]["Authorization"] == "Bearer jwt-token"
+
+@patch("email_ingest.ingest_mailbox.requests.post")
+def test_answer_ticket_stream_collects_events(mock_post):
+    mock_response = Mock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.iter_lines.return_value = iter([
+        "event: sources",
+        'data: {"ticket_id": "ticket-123", "sources": [{"source": "kb/vpn.md", "snippet": "..."}]}',
+        "",
+        "event: token",
+        'data: {"text": "Hello Thomas, "}',
+        "",
+        "event: token",
+        'data: {"text": "please try again."}',
+        "",
+        "event: done",
+        'data: {"answer_mode": "llm", "suggested_answer": "Hello Thomas, please try again."}',
+        "",
+    ])
+    mock_post.return_value = mock_response
+
+    tokens = []
+    result = answer_ticket_stream("ticket-123", "jwt-token", on_token=tokens.append)
+
+    assert tokens == ["Hello Thomas, ", "please try again."]
+    assert result["suggested_answer"] == "Hello Thomas, please try again."
+    assert result["answer_mode"] == "llm"
+    assert result["sources"][0]["source"] == "kb/vpn.md"
+
+    _, kwargs = mock_post.call_args
+    assert kwargs["headers"]["Authorization"] == "Bearer jwt-token"
+    assert kwargs["stream"] is True
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from app.rag import embeddings, parity
+
+
+class _Recorder:
+    """Stands in for a model class (torch / onnxruntime are optional): records constructor kwargs."""
+
+    def __init__(self, *args, **kwargs):
+        self.args, self.kwargs = args, kwargs
+
+
+def test_embedding_backend_rejects_unknown_values(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_BACKEND", "openvino")
+    with pytest.raises(ValueError, match="Unknown EMBEDDING_BACKEND 'openvino'"):
+        embeddings.embedding_backend()
+
+    monkeypatch.setenv("EMBEDDING_BACKEND", "onnx")
+    assert embeddings.embedding_backend() == "onnx"
+
+
+def test_get_embeddings_passes_batch_size_and_threads(monkeypatch):
+    torch_threads = []
+    monkeypatch.setattr(embeddings, "MiniLMEmbeddings", _Recorder)
+    monkeypatch.setattr(embeddings, "OnnxMiniLMEmbeddings", _Recorder)
+    monkeypatch.setattr(embeddings, "_set_torch_threads", torch_threads.append)
+    monkeypatch.setenv("EMBEDDING_BATCH_SIZE", "8")
+    monkeypatch.setenv("EMBEDDING_THREADS", "3")
+
+    int8 = embeddings.get_embeddings("torch-int8")
+    assert int8.kwargs == {"batch_size": 8, "quantize": True}
+    # torch threads are process-wide: applied by the factory, not per model object
+    assert torch_threads == [3]
+
+    onnx = embeddings.get_embeddings("onnx")
+    assert onnx.kwargs == {"batch_size": 8, "threads": 3}
+    assert torch_threads == [3]
+
+    monkeypatch.setenv("EMBEDDING_THREADS", "0")
+    fp32 = embeddings.get_embeddings("sentence-transformers")
+    assert fp32.kwargs == {"batch_size": 8, "quantize": False}
+    assert torch_threads == [3]
+
+
+def test_parity_metrics_cosine_and_top_k_overlap():
+    chunks = np.eye(4, dtype=np.float32)
+    queries = np.array([[1, 0.5, 0.2, 0], [0, 0, 1, 0.5]], dtype=np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    assert parity._top_k(chunks, queries, 2).tolist() == [[0, 1], [2, 3]]
+
+    same = parity.parity_metrics(chunks, queries, chunks, queries, k=2)
+    assert same["cosine_min"] == pytest.approx(1.0)
+    assert same["topk_overlap_mean"] == 1.0
+
+    # Candidate swaps chunks 1 and 2: query 0 keeps 1 of its 2 neighbours, query 1 as well
+    swapped = chunks[[0, 2, 1, 3]]
+    result = parity.parity_metrics(chunks, queries, swapped, queries, k=2)
+    assert result["topk_overlap_mean"] == 0.5
+
+    assert parity.within_tolerance({"cosine_min": 0.99, "topk_overlap_mean": 0.9}, 0.98, 0.9)
+    assert not parity.within_tolerance({"cosine_min": 0.97, "topk_overlap_mean": 1.0}, 0.98, 0.9)
+    assert not parity.within_tolerance({"cosine_min": 1.0, "topk_overlap_mean": 0.8}, 0.98, 0.9)
+
+
+class _NoisyEmbeddings(Embeddings):
+    """Deterministic vectors per text; `noise` perturbs them like a lower-precision backend."""
+
+    def __init__(self, noise: float):
+        self.noise = noise
+
+    def embed_documents(self, texts):
+        out = []
+        for text in texts:
+            seed = sum(map(ord, text))
+            vector = np.random.default_rng(seed).standard_normal(32)
+            vector += self.noise * np.random.default_rng(seed + 1).standard_normal(32)
+            out.append(vector.tolist())
+        return out
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+@pytest.mark.parametrize(("noise", "exit_code"), [(0.01, 0), (2.0, 1)])
+def test_parity_main_exit_code(monkeypatch, noise, exit_code):
+    chunks = [f"chunk {i}: {'abcdefgh'[i % 8] * (i + 1)}" for i in range(40)]
+    queries = [f"ticket {i} {'xyz'[i % 3] * i}" for i in range(20)]
+    monkeypatch.setattr(parity, "_corpus", lambda max_queries: (chunks, queries))
+    monkeypatch.setattr(
+        parity, "get_embeddings",
+        lambda backend: _NoisyEmbeddings(0.0 if backend == "sentence-transformers" else noise),
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        parity.main(["--backend", "torch-int8", "--k", "3"])
+    assert exit_info.value.code == exit_code
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+
+import anyio.to_thread
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core import executors
+from app.main import app
+
+
+class _Concurrency:
+    """Max number of calls seen running at the same time."""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.running -= 1
+
+
+@pytest.fixture()
+def cpu_pool_size(monkeypatch):
+    # The pool is created on first use with the size from the env
+    def _set(size: int):
+        monkeypatch.setenv("CPU_POOL_SIZE", str(size))
+        executors.shutdown_executors()
+
+    yield _set
+    executors.shutdown_executors()
+
+
+def test_run_cpu_is_bounded_by_cpu_pool_size(cpu_pool_size):
+    cpu_pool_size(2)
+    seen = _Concurrency()
+
+    def work():
+        with seen:
+            time.sleep(0.05)
+
+    async def _run():
+        await asyncio.gather(*(executors.run_cpu(work) for _ in range(8)))
+
+    asyncio.run(_run())
+    assert seen.peak == 2
+
+
+def test_llm_semaphore_is_bounded_by_llm_max_concurrency(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "3")
+    seen = _Concurrency()
+
+    async def call():
+        async with executors.llm_semaphore():
+            with seen:
+                await asyncio.sleep(0.02)
+
+    async def _run():
+        await asyncio.gather(*(call() for _ in range(10)))
+
+    # One semaphore per event loop
+    asyncio.run(_run())
+    assert seen.peak == 3
+
+
+def test_configure_threadpool_sets_sync_pool_size(monkeypatch):
+    monkeypatch.setenv("SYNC_POOL_SIZE", "7")
+
+    async def _run():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        before = limiter.total_tokens
+        executors.configure_threadpool()
+        try:
+            return limiter.total_tokens
+        finally:
+            limiter.total_tokens = before
+
+    assert asyncio.run(_run()) == 7
+
+
+def test_cheap_endpoints_answer_while_answer_saturates_the_cpu_pool(cpu_pool_size, auth_headers, client, monkeypatch):
+    cpu_pool_size(1)
+    headers = auth_headers(email="executors1@example.com")
+    ticket_id = client.post("/tickets", json={"subject": "VPN", "body": "VPN is broken"}, headers=headers).json()["id"]
+
+    def slow_rag_answer(question, k=3):
+        time.sleep(0.3)
+        return {"answer": "Restart the VPN client.", "sources": []}
+
+    monkeypatch.setattr("app.api.routes.rag_answer", slow_rag_answer)
+    monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+
+    async def _run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as http:
+            # 4 answers x 0.3 s on a 1-thread CPU pool: busy for ~1.2 s
+            answers = [asyncio.create_task(http.post(f"/tickets/{ticket_id}/answer", headers=headers)) for _ in range(4)]
+            await asyncio.sleep(0.1)
+
+            started = time.perf_counter()
+            r = await http.get(f"/tickets/{ticket_id}", headers=headers)
+            cheap_seconds = time.perf_counter() - started
+            cpu_busy = REGISTRY.get_sample_value("ticketcopilot_cpu_tasks_in_flight")
+
+            return r, cheap_seconds, cpu_busy, await asyncio.gather(*answers)
+
+    r, cheap_seconds, cpu_busy, answers = asyncio.run(_run())
+
+    assert r.status_code == 200
+    assert cpu_busy >= 3  # the answers were still queued on the CPU pool
+    assert cheap_seconds < 0.25
+    assert [a.status_code for a in answers] == [200] * 4
+
+
+def test_batch_classify_runs_the_model_on_the_cpu_pool(client, auth_headers, monkeypatch):
+    headers = auth_headers(email="executors2@example.com")
+    ticket_id = client.post("/tickets", json={"subject": "VPN", "body": "VPN is broken"}, headers=headers).json()["id"]
+
+    offloaded = []
+    original = executors.run_cpu
+
+    async def spy(fn, *args, **kwargs):
+        offloaded.append(fn.__name__)
+        return await original(fn, *args, **kwargs)
+
+    monkeypatch.setattr("app.api.routes.run_cpu", spy)
+
+    r = client.post("/tickets/classify:batch", json={"ticket_ids": [ticket_id, ticket_id]}, headers=headers)
+
+    assert r.status_code == 200
+    assert [p["ticket_id"] for p in r.json()] == [ticket_id, ticket_id]
+    assert offloaded == ["classify_tickets"]
@@ -0,0 +1,78 @@
+import sys
+
+import faiss
+import numpy as np
+import pytest
+
+from app.rag.faiss_index import (
+    INDEX_FILE, MmapFlatIndex, build_index, read_index, read_params, search_parameters, write_flat_vectors, write_params,
+)
+
+
+def _vectors(n=400, d=16):
+    return np.random.default_rng(0).standard_normal((n, d)).astype(np.float32)
+
+
+def test_build_index_clamps_params_to_data_size():
+    index, effective = build_index(_vectors(), {"type": "ivf_pq", "nlist": 256, "pq_m": 6, "pq_nbits": 8})
+
+    assert index.ntotal == 400
+    assert effective["nlist"] == 400 // 39
+    assert 16 % effective["pq_m"] == 0
+    assert effective["pq_nbits"] <= 8
+
+
+def test_ivf_with_all_clusters_matches_exact_search():
+    vectors = _vectors()
+    exact, _ = build_index(vectors, {"type": "flat"})
+    ivf, _ = build_index(vectors, {"type": "ivf_flat", "nlist": 10})
+
+    _, truth = exact.search(vectors[:50], 3)
+    _, full = ivf.search(vectors[:50], 3, params=search_parameters(ivf, nprobe=10))
+
+    # Visiting every cluster is exact search
+    assert (full == truth).all()
+    assert search_parameters(exact, nprobe=10) is None
+
+
+def test_params_round_trip(tmp_path):
+    assert read_params(tmp_path)["build"] == {"type": "flat"}
+
+    write_params(tmp_path, {"type": "hnsw", "hnsw_m": 32, "ef_construction": 200})
+
+    saved = read_params(tmp_path)
+    assert saved["build"]["type"] == "hnsw"
+    assert saved["search"]["ef_search"] == 64
+
+
+def _private_rss_mb() -> float:
+    # Anonymous (heap) pages only: mapped file pages are shared with the OS cache and other workers
+    for line in open("/proc/self/status"):
+        if line.startswith("RssAnon:"):
+            return int(line.split()[1]) / 1024
+    raise AssertionError("RssAnon missing")
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc/self/status")
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat"])
+def test_mmap_load_does_not_copy_vectors_into_the_heap(tmp_path, index_type):
+    vectors = np.random.default_rng(0).random((50_000, 384), dtype=np.float32)  # ~73 MB
+    index, params = build_index(vectors, {"type": index_type, "nlist": 16})
+    faiss.write_index(index, str(tmp_path / INDEX_FILE))
+    write_flat_vectors(tmp_path, index)
+    write_params(tmp_path, params)
+    _, expected = index.search(vectors[:5], 3, params=search_parameters(index, nprobe=16))
+    del index
+
+    before = _private_rss_mb()
+    served = read_index(tmp_path)
+    _, got = served.search(vectors[:5], 3, params=search_parameters(served, nprobe=16))
+    grown = _private_rss_mb() - before
+
+    assert (got == expected).all()
+    assert grown < 10, f"{grown:.0f} MB copied into the heap"
+    if index_type == "flat":
+        assert isinstance(served, MmapFlatIndex) and isinstance(served.vectors, np.memmap)
+
+    # FAISS_MMAP=0 reads the index into process memory
+    assert isinstance(read_index(tmp_path, mmap=False), faiss.Index)
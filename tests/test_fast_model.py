@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from app.ml.fast_model import FastTicketModel, export_fast_model
+from app.ml.model import build_pipeline, predict_batch
+
+EXTRA_TEXTS = [
+    "",
+    "???",
+    "VPN VPN vpn error 812 error 812",
+    "Completely unrelated words zebra quantum",
+    "Invoice\nbilling  PAYMENT failed twice",
+]
+
+
+def _texts_and_labels():
+    df = pd.read_csv("data/sample_tickets.csv")
+    return df["text"].astype(str).tolist(), df["category"].astype(str).tolist()
+
+
+def _assert_parity(pipeline, tmp_path, texts):
+    export_fast_model(pipeline, tmp_path / "model")
+    fast = FastTicketModel.load(tmp_path / "model")
+
+    np.testing.assert_allclose(fast.predict_proba(texts), pipeline.predict_proba(texts), rtol=0, atol=1e-9)
+    assert list(fast.classes_) == list(pipeline.classes_)
+    fast_preds, sklearn_preds = predict_batch(fast, texts), predict_batch(pipeline, texts)
+    assert [label for label, _ in fast_preds] == [label for label, _ in sklearn_preds]
+
+
+def test_fast_model_matches_sklearn_pipeline(tmp_path):
+    texts, labels = _texts_and_labels()
+    pipeline = build_pipeline().fit(texts, labels)
+
+    _assert_parity(pipeline, tmp_path, texts + EXTRA_TEXTS)
+
+
+def test_fast_model_matches_sublinear_and_binary_variants(tmp_path):
+    texts, labels = _texts_and_labels()
+    binary = ["access" if label == "access" else "other" for label in labels]
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 3), sublinear_tf=True, min_df=1)),
+        ("clf", LogisticRegression(max_iter=1000)),
+    ]).fit(texts, binary)
+
+    _assert_parity(pipeline, tmp_path, texts + EXTRA_TEXTS)
+
+
+def test_fast_model_weights_are_memory_mapped_and_legacy_npz_loads(tmp_path):
+    texts, labels = _texts_and_labels()
+    pipeline = build_pipeline().fit(texts, labels)
+    export_fast_model(pipeline, tmp_path / "model")
+
+    fast = FastTicketModel.load(tmp_path / "model")
+    # Read-only views of the mapped files: shared page cache, nothing copied per worker
+    for array in (fast._idf, fast._coef_t):
+        assert isinstance(array.base, np.memmap) and not array.flags.writeable
+
+    # Versions published before the .npy layout shipped a single .npz
+    config = json.loads((tmp_path / "model" / "config.json").read_text(encoding="utf-8"))
+    arrays = {name: np.load(tmp_path / "model" / f"{name}.npy") for name in ("terms", "idf", "coef_t", "intercept", "classes")}
+    np.savez(tmp_path / "legacy.npz", **arrays, **{key: np.asarray(value) for key, value in config.items()})
+
+    legacy = FastTicketModel.load(tmp_path / "legacy.npz")
+    np.testing.assert_allclose(legacy.predict_proba(texts), fast.predict_proba(texts), rtol=0, atol=0)
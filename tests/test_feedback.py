@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from app.core import classifier
+from app.db import models
+from app.db.database import SessionLocal
+from app.ml import feedback
+from app.ml import model as ml_model
+from app.ml.model import build_pipeline
+from app.ml.train import build_streaming_pipeline
+
+CORRECTED = ("Printer", "The office printer keeps jamming on every page")
+
+
+def _sample():
+    df = pd.read_csv("data/sample_tickets.csv")
+    return df["text"].astype(str), df["category"].astype(str)
+
+
+def _use_models_dir(tmp_path, monkeypatch):
+    models_dir = tmp_path / "models"
+    monkeypatch.setattr(ml_model, "MODEL_DIR", models_dir)
+    monkeypatch.setattr(classifier, "MODEL_DIR", models_dir)
+    monkeypatch.setattr(classifier, "_model", None)
+    return ml_model.get_registry()
+
+
+def _classified_ticket(client, headers, subject, body) -> dict:
+    r = client.post("/tickets", json={"subject": subject, "body": body}, headers=headers)
+    return client.post(f"/tickets/{r.json()['id']}/classify", headers=headers).json()
+
+
+def _record_corrections(n: int, category: str) -> None:
+    with SessionLocal() as db:
+        ticket = models.Ticket(subject=CORRECTED[0], body=CORRECTED[1])
+        prediction = models.TicketPrediction(ticket=ticket, category="general", priority=4, confidence=0.5)
+        db.add_all([ticket, prediction])
+        db.flush()
+        for _ in range(n):
+            db.add(models.PredictionFeedback(prediction_id=prediction.id, category=category, priority=3))
+        db.commit()
+
+
+def _proba(model, text: str, category: str) -> float:
+    return float(model.predict_proba([text])[0][list(model.classes_).index(category)])
+
+
+def test_feedback_endpoint_records_correction(client, auth_headers):
+    headers = auth_headers(email="fb1@example.com")
+    pred = _classified_ticket(client, headers, "Invoice", "Please resend the invoice for March")
+    assert pred["prediction_id"]
+
+    r = client.post(f"/predictions/{pred['prediction_id']}/feedback", json={"category": "billing"}, headers=headers)
+    assert r.status_code == 201
+    body = r.json()
+    assert (body["category"], body["priority"], body["applied_version"]) == ("billing", 3, None)
+
+    with SessionLocal() as db:
+        assert db.query(models.AuditLog).filter_by(action="ticket.feedback").count() == 1
+
+    assert client.post(f"/predictions/{pred['prediction_id']}/feedback", json={"category": "hardware"}, headers=headers).status_code == 422
+    assert client.post("/predictions/missing/feedback", json={"category": "billing"}, headers=headers).status_code == 404
+
+    other = auth_headers(email="fb2@example.com")
+    r = client.post(f"/predictions/{pred['prediction_id']}/feedback", json={"category": "billing"}, headers=other)
+    assert r.status_code == 403
+
+
+def test_apply_feedback_refits_lr_on_delta_and_publishes(tmp_path, monkeypatch):
+    registry = _use_models_dir(tmp_path, monkeypatch)
+    X, y = _sample()
+    base = ml_model.save_model(build_pipeline().fit(X, y))
+    text = classifier._ticket_text(*CORRECTED)
+    before = _proba(registry.load(base), text, "billing")
+
+    assert feedback.apply_feedback() is None
+    _record_corrections(5, "billing")
+    assert feedback.apply_feedback(min_batch=10) is None
+
+    version = feedback.apply_feedback()
+    assert version.startswith("tfidf-logreg-") and registry.current_version() == version
+    meta = registry.metadata(version)
+    assert (meta["base_version"], meta["feedback_rows"], meta["update"]) == (base, 5, "warm_start")
+    assert "ticket_clf.fast" in meta["files"]
+
+    updated = registry.load(version)
+    assert _proba(updated, text, "billing") > before
+    # Anchored to the previous weights: the rest of the training set is still classified the same
+    assert np.mean(updated.predict(X) == registry.load(base).predict(X)) > 0.9
+
+    with SessionLocal() as db:
+        assert {f.applied_version for f in db.query(models.PredictionFeedback)} == {version}
+    assert feedback.apply_feedback() is None
+
+
+def test_apply_feedback_partial_fits_streaming_model(tmp_path, monkeypatch):
+    registry = _use_models_dir(tmp_path, monkeypatch)
+    X, y = _sample()
+    model = build_streaming_pipeline()
+    model.named_steps["clf"].partial_fit(model[:-1].transform(X), y, classes=sorted(set(y)))
+    base = ml_model.save_model(model, export_fast=False, family="hashing-sgd")
+
+    _record_corrections(3, "billing")
+    _record_corrections(1, "hardware")
+    version = feedback.apply_feedback()
+
+    meta = registry.metadata(version)
+    assert version.startswith("hashing-sgd-")
+    assert (meta["base_version"], meta["update"], meta["feedback_rows"], meta["feedback_skipped"]) == (base, "partial_fit", 3, 1)
+    assert "ticket_clf.fast" not in meta["files"]
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Loaded on first use / by the background warm-up, never while the API starts
+HEAVY_MODULES = {
+    "langchain",
+    "langchain_community",
+    "langchain_core",
+    "faiss",
+    "torch",
+    "sentence_transformers",
+    "openai",
+    "sklearn",
+    "scipy",
+    "joblib",
+    "numpy",
+    "pandas",
+}
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time (microseconds) per module from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).resolve().parents[1],
+        env={**os.environ, "DATABASE_URL": "sqlite:///./test_ticketcopilot.db"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_api_startup_does_not_import_heavy_dependencies():
+    times = _import_times("app.main")
+
+    loaded = sorted({name.split(".")[0] for name in times} & HEAVY_MODULES)
+    slowest = sorted(times.items(), key=lambda item: -item[1])[:10]
+    assert loaded == [], f"heavy modules imported by app.main: {loaded}; slowest imports: {slowest}"
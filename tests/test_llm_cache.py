@@ -0,0 +1,63 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.llm import synthesis
+from app.llm.cache import AnswerCache, reset_answer_cache
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=" Please reconnect the VPN [1]. ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_answer_cache_persists_and_evicts(tmp_path):
+    path = tmp_path / "llm.sqlite3"
+
+    cache = AnswerCache(path, ttl_seconds=60, max_entries=2)
+    cache.set("a", "answer a")
+    cache.set("b", "answer b")
+    cache.set("c", "answer c")
+
+    # A fresh instance (e.g. after a restart) sees the same entries
+    reopened = AnswerCache(path, ttl_seconds=60, max_entries=2)
+    assert reopened.get("a") is None
+    assert reopened.get("c") == "answer c"
+
+
+def test_answer_cache_expires_entries(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.llm.cache.time.time", lambda: now[0])
+
+    cache = AnswerCache(tmp_path / "llm.sqlite3", ttl_seconds=10, max_entries=10)
+    cache.set("a", "answer a")
+    assert cache.get("a") == "answer a"
+
+    now[0] += 11
+    assert cache.get("a") is None
+
+
+def test_synthesize_answer_async_uses_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_DEPLOYMENT", "gpt-test")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    reset_answer_cache()
+
+    completions = FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(synthesis, "get_async_client", lambda: client)
+
+    sources = [{"source": "kb/vpn.md", "snippet": "Reconnect the VPN client."}]
+
+    first = asyncio.run(synthesis.synthesize_answer_async("VPN down", sources))
+    second = asyncio.run(synthesis.synthesize_answer_async("VPN down", sources))
+
+    assert first.text == second.text == "Please reconnect the VPN [1]."
+    assert first.cached is False
+    assert second.cached is True
+    assert completions.calls == 1
+
+    reset_answer_cache()
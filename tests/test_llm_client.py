@@ -0,0 +1,41 @@
+import asyncio
+
+from app.llm import client as llm_client
+
+
+def test_get_client_is_reused_until_settings_change(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "key-1")
+
+    first = llm_client.get_client()
+    assert first is not None
+    assert llm_client.get_client() is first
+
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "key-2")
+    second = llm_client.get_client()
+    assert second is not first
+    assert llm_client.get_client() is second
+
+    asyncio.run(llm_client.close_clients())
+
+
+def test_get_client_returns_none_when_not_configured(monkeypatch):
+    monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+    monkeypatch.delenv("AZURE_OPENAI_API_KEY", raising=False)
+
+    assert llm_client.get_client() is None
+
+
+def test_async_client_is_reused_within_event_loop(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "key-1")
+
+    async def build_twice():
+        a = llm_client.get_async_client()
+        b = llm_client.get_async_client()
+        await llm_client.close_clients()
+        return a, b
+
+    a, b = asyncio.run(build_twice())
+    assert a is not None
+    assert a is b
@@ -0,0 +1,64 @@
+from prometheus_client import REGISTRY
+
+from app.core.metrics import instrument_sessions, stage
+from app.db.database import SessionLocal
+
+
+def _value(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_reports_routes_and_stages(client, auth_headers):
+    headers = auth_headers(email="metrics1@example.com")
+    route = "/tickets/{ticket_id}/classify"
+    before_requests = _value("http_requests_total", method="POST", route=route, status="200")
+    before_inference = _value("ticketcopilot_stage_duration_seconds_count", stage="inference")
+    before_commits = _value("ticketcopilot_stage_duration_seconds_count", stage="db_commit")
+
+    r = client.post("/tickets", json={"subject": "VPN", "body": "cannot login to vpn"}, headers=headers)
+    client.post(f"/tickets/{r.json()['id']}/classify", headers=headers)
+
+    assert _value("http_requests_total", method="POST", route=route, status="200") == before_requests + 1
+    assert _value("http_request_duration_seconds_count", method="POST", route=route) >= 1
+    assert _value("ticketcopilot_stage_duration_seconds_count", stage="inference") == before_inference + 1
+    # Ticket insert + prediction/audit insert
+    assert _value("ticketcopilot_stage_duration_seconds_count", stage="db_commit") >= before_commits + 2
+    assert _value("http_requests_in_flight") == 0
+
+    text = client.get("/metrics").text
+    assert 'http_requests_total{method="POST",route="/tickets/{ticket_id}/classify",status="200"}' in text
+    assert "ticketcopilot_stage_duration_seconds_bucket" in text
+    assert _value("ticketcopilot_batch_size_count", batcher="classify-batcher") >= 1
+
+    client.get("/no/such/path")
+    assert _value("http_requests_total", method="GET", route="unmatched", status="404") >= 1
+
+
+def test_metrics_token(client, monkeypatch):
+    monkeypatch.setenv("METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+
+def test_stage_and_cache_metrics():
+    from app.rag.cache import TTLCache
+    import app.rag.query as rag_query
+
+    before = _value("ticketcopilot_stage_duration_seconds_count", stage="llm")
+    with stage("llm"):
+        pass
+    assert _value("ticketcopilot_stage_duration_seconds_count", stage="llm") == before + 1
+
+    instrument_sessions(SessionLocal)  # idempotent
+
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    original = rag_query._retrieval_cache
+    rag_query._retrieval_cache = cache
+    try:
+        assert _value("ticketcopilot_cache_hits_total", cache="retrieval") == 1
+        assert _value("ticketcopilot_cache_hit_ratio", cache="retrieval") == 0.5
+    finally:
+        rag_query._retrieval_cache = original
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from app.core import classifier
+from app.ml import model as ml_model
+from app.ml.model import build_pipeline
+from app.ml.registry import ModelRegistry
+
+
+def _fitted():
+    df = pd.read_csv("data/sample_tickets.csv")
+    return build_pipeline().fit(df["text"].astype(str), df["category"].astype(str))
+
+
+def test_publish_records_metadata_and_loads_versions_by_name(tmp_path):
+    registry = ModelRegistry(tmp_path / "models")
+    model = _fitted()
+
+    first = registry.publish(model, data_sha256="a" * 64, metrics={"macro_f1": 0.8})
+    second = registry.publish(model, data_sha256="b" * 64, metrics={"macro_f1": 0.9}, family="tfidf-logreg-x")
+
+    assert len(first) <= 40 and len(second) <= 40
+    assert registry.current_version() == second
+    assert [m["version"] for m in registry.list_versions()] == [second, first]
+
+    meta = registry.metadata(first)
+    assert meta["data_sha256"] == "a" * 64
+    assert meta["metrics"]["macro_f1"] == 0.8
+    assert {"ticket_clf.joblib", "ticket_clf.fast"} <= set(meta["files"])
+
+    loaded = registry.load(first, mmap=True)
+    assert list(loaded.predict(["vpn is down"])) == list(model.predict(["vpn is down"]))
+
+    registry.activate(first)
+    assert registry.current_version() == first
+    with pytest.raises(KeyError):
+        registry.activate("does-not-exist")
+
+
+def test_predictions_report_the_published_version(tmp_path, monkeypatch):
+    models_dir = tmp_path / "models"
+    monkeypatch.setattr(ml_model, "MODEL_DIR", models_dir)
+    monkeypatch.setattr(classifier, "MODEL_DIR", models_dir)
+    monkeypatch.setattr(classifier, "_model", None)
+
+    version = ml_model.save_model(_fitted())
+
+    [result] = classifier.classify_tickets([("VPN", "cannot login to vpn")])
+    assert result.model_version == version
+
+    monkeypatch.setattr(classifier, "_model", None)
@@ -0,0 +1,92 @@
+from app.rag.cache import TTLCache
+from app.rag.query import CachedEmbeddings
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text):
+        self.calls.append(text)
+        return [float(len(text))]
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.rag.cache.time.monotonic", lambda: now[0])
+
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    now[0] += 6
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cached_embeddings_reuse_normalized_query():
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner, TTLCache(max_size=10, ttl_seconds=60))
+
+    first = embeddings.embed_query("VPN  does not work\n")
+    second = embeddings.embed_query("vpn does not work")
+
+    assert first == second
+    assert inner.calls == ["vpn does not work"]
+
+
+class FakeDoc:
+    def __init__(self, text):
+        self.page_content = text
+        self.metadata = {"source": "kb/vpn.md"}
+
+
+class FakeStore:
+    def __init__(self):
+        self.searches = 0
+
+    def similarity_search(self, question, k):
+        self.searches += 1
+        return [FakeDoc("Restart the VPN client.")]
+
+
+def test_retrieval_cache_is_keyed_by_index_version(monkeypatch):
+    from app.rag import query as rag_query
+
+    rag_query.reset_rag_cache()
+    store = FakeStore()
+    monkeypatch.setattr(rag_query, "_embeddings", CountingEmbeddings())
+    monkeypatch.setattr(rag_query, "_store", store)
+    monkeypatch.setattr(rag_query, "_store_version", "v1")
+
+    first = rag_query.rag_answer("VPN does not work")
+    second = rag_query.rag_answer("vpn  does not work")
+    assert first == second
+    assert store.searches == 1
+
+    # A rebuilt index has a new version, so the old result is not reused
+    monkeypatch.setattr(rag_query, "_store_version", "v2")
+    rag_query.rag_answer("VPN does not work")
+    assert store.searches == 2
+
+    rag_query.reset_rag_cache()
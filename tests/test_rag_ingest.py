@@ -0,0 +1,187 @@
+import json
+
+from langchain_community.embeddings import DeterministicFakeEmbedding
+
+from app.core import artifacts
+from app.rag import ingest
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    embedded: list = []
+
+    def embed_documents(self, texts):
+        CountingEmbeddings.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def _setup(tmp_path, monkeypatch):
+    kb = tmp_path / "kb"
+    kb.mkdir()
+    monkeypatch.setattr(ingest, "KB_PATH", kb)
+    monkeypatch.setattr(ingest, "FAISS_DIR", tmp_path / "faiss_store")
+    monkeypatch.setattr(ingest, "get_embeddings", lambda: CountingEmbeddings(size=16))
+    CountingEmbeddings.embedded = []
+    return kb
+
+
+def test_incremental_ingest_embeds_only_changed_files(tmp_path, monkeypatch):
+    kb = _setup(tmp_path, monkeypatch)
+    (kb / "vpn.md").write_text("Restart the VPN client.", encoding="utf-8")
+    (kb / "billing.md").write_text("Invoices are sent monthly.", encoding="utf-8")
+    (kb / "password.md").write_text("Reset passwords in the portal.", encoding="utf-8")
+
+    ingest.ingest()
+    assert len(CountingEmbeddings.embedded) == 3
+
+    (kb / "vpn.md").write_text("Reinstall the VPN client.", encoding="utf-8")
+    (kb / "password.md").unlink()
+    (kb / "email.md").write_text("Outlook needs a restart.", encoding="utf-8")
+    CountingEmbeddings.embedded = []
+
+    ingest.ingest(incremental=True)
+
+    assert sorted(CountingEmbeddings.embedded) == ["Outlook needs a restart.", "Reinstall the VPN client."]
+
+    index_dir = artifacts.current_dir(tmp_path / "faiss_store")
+    manifest = json.loads((index_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert sorted(manifest["files"]) == ["billing.md", "email.md", "vpn.md"]
+
+    store = ingest.FAISS.load_local(
+        str(index_dir), embeddings=CountingEmbeddings(size=16), allow_dangerous_deserialization=True
+    )
+    texts = sorted(store.docstore.search(i).page_content for i in store.index_to_docstore_id.values())
+    assert texts == ["Invoices are sent monthly.", "Outlook needs a restart.", "Reinstall the VPN client."]
+
+
+def test_incremental_ingest_without_changes_is_a_no_op(tmp_path, monkeypatch):
+    kb = _setup(tmp_path, monkeypatch)
+    (kb / "vpn.md").write_text("Restart the VPN client.", encoding="utf-8")
+
+    ingest.ingest(incremental=True)  # no manifest yet -> full build
+    version = artifacts.current_version(tmp_path / "faiss_store")
+    CountingEmbeddings.embedded = []
+
+    ingest.ingest(incremental=True)
+
+    assert CountingEmbeddings.embedded == []
+    assert artifacts.current_version(tmp_path / "faiss_store") == version
+
+
+def test_parallel_loading_keeps_order_and_reports_errors(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"doc{i}.md"
+        path.write_text(f"Document number {i}", encoding="utf-8")
+        paths.append(path)
+
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    paths.insert(2, broken)
+
+    loaded, failed = ingest.load_files(paths, workers=3)
+
+    assert list(loaded) == [p for p in paths if p != broken]
+    assert [docs[0].page_content for docs in loaded.values()] == [f"Document number {i}" for i in range(4)]
+    assert list(failed) == [broken]
+
+
+def test_chunk_store_matches_pickled_docstore(tmp_path, monkeypatch):
+    from langchain_community.vectorstores import FAISS
+
+    from app.rag.chunk_store import MmapVectorStore
+
+    kb = _setup(tmp_path, monkeypatch)
+    for name in ["vpn", "billing", "password", "email"]:
+        (kb / f"{name}.md").write_text(f"How to fix {name} issues.", encoding="utf-8")
+    ingest.ingest()
+
+    # Positions shift when vectors are removed; the chunk store must follow
+    (kb / "billing.md").unlink()
+    ingest.ingest(incremental=True)
+
+    embeddings = CountingEmbeddings(size=16)
+    index_dir = artifacts.current_dir(ingest.FAISS_DIR)
+    pickled = FAISS.load_local(str(index_dir), embeddings=embeddings, allow_dangerous_deserialization=True)
+    mmapped = MmapVectorStore.load(index_dir, embeddings=embeddings)
+
+    for question in ["vpn", "email issues"]:
+        expected = pickled.similarity_search(question, k=3)
+        got = mmapped.similarity_search(question, k=3)
+        assert [d.page_content for d in got] == [d.page_content for d in expected]
+        assert [d.metadata for d in got] == [d.metadata for d in expected]
+
+
+def test_new_index_version_is_swapped_in_by_background_reload(tmp_path, monkeypatch):
+    from app.rag import query as rag_query
+
+    kb = _setup(tmp_path, monkeypatch)
+    (kb / "vpn.md").write_text("Restart the VPN client.", encoding="utf-8")
+    ingest.ingest()
+
+    monkeypatch.setenv("FAISS_DIR", str(ingest.FAISS_DIR))
+    monkeypatch.setattr(rag_query, "get_embeddings", lambda: CountingEmbeddings(size=16))
+    rag_query.reset_rag_cache()
+
+    assert "Restart the VPN client." in rag_query.rag_answer("vpn", k=1)["answer"]
+    old_store, old_version = rag_query._store, rag_query.store_version()
+
+    (kb / "vpn.md").write_text("Reinstall the VPN client.", encoding="utf-8")
+    ingest.ingest(incremental=True)
+
+    reloader = artifacts.get_reloaders()["faiss_index"]
+    assert reloader.is_stale()
+    assert artifacts.check_for_updates() == ["faiss_index"]
+    reloader.wait(timeout=10)
+
+    assert reloader.status()["last_error"] is None
+    assert rag_query.store_version() == artifacts.current_version(ingest.FAISS_DIR) != old_version
+    assert "Reinstall the VPN client." in rag_query.rag_answer("vpn", k=1)["answer"]
+
+    # The previous store object is untouched, so searches that started on it still complete
+    assert old_store.similarity_search("vpn", k=1)[0].page_content == "Restart the VPN client."
+
+    rag_query.reset_rag_cache()
+
+
+def test_hybrid_search_finds_exact_error_code(tmp_path, monkeypatch):
+    from app.rag.chunk_store import MmapVectorStore
+
+    kb = _setup(tmp_path, monkeypatch)
+    (kb / "vpn.md").write_text("VPN error 812 means the connection was blocked by policy.", encoding="utf-8")
+    for i in range(10):
+        (kb / f"other{i}.md").write_text(f"General procedure number {i} for tickets.", encoding="utf-8")
+    ingest.ingest()
+
+    store = MmapVectorStore.load(artifacts.current_dir(ingest.FAISS_DIR), embeddings=CountingEmbeddings(size=16))
+    assert store.sparse is not None
+    assert store.sparse.search("error 812", k=3)[0] == store.sparse.search("812", k=1)[0]
+
+    # Random fake embeddings cannot match the code; BM25-only fusion must
+    docs = store.hybrid_search("I get error 812", k=1, sparse_weight=1.0)
+    assert docs[0].page_content.startswith("VPN error 812")
+
+
+def test_incremental_ingest_keeps_ivf_positions_aligned(tmp_path, monkeypatch):
+    from app.rag.chunk_store import MmapVectorStore
+
+    monkeypatch.setenv("FAISS_INDEX_TYPE", "ivf_flat")
+    kb = _setup(tmp_path, monkeypatch)
+    texts = {f"doc{i}.md": f"Procedure number {i} for ticket type {i}." for i in range(1, 6)}
+    for name, text in texts.items():
+        (kb / name).write_text(text, encoding="utf-8")
+    ingest.ingest()
+
+    # IVF remove_ids keeps the original vector ids, so deletes must not shift positions
+    (kb / "doc1.md").unlink()
+    del texts["doc1.md"]
+    (kb / "doc3.md").write_text("Procedure number 3, revised.", encoding="utf-8")
+    texts["doc3.md"] = "Procedure number 3, revised."
+    (kb / "doc6.md").write_text("Procedure number 6 for new tickets.", encoding="utf-8")
+    texts["doc6.md"] = "Procedure number 6 for new tickets."
+    ingest.ingest(incremental=True)
+
+    index_dir = artifacts.current_dir(ingest.FAISS_DIR)
+    assert json.loads((index_dir / "index_params.json").read_text(encoding="utf-8"))["build"]["type"] == "ivf_flat"
+    store = MmapVectorStore.load(index_dir, embeddings=CountingEmbeddings(size=16))
+    for text in texts.values():
+        assert [d.page_content for d in store.similarity_search(text, k=1)] == [text]
@@ -0,0 +1,78 @@
+import logging
+
+from app.core.request_context import format_timings, record_timing, start_request, end_request
+from app.db import models
+from app.db.database import SessionLocal
+from email_ingest.ingest_mailbox import iter_sse_events
+
+
+def _server_timing(header: str) -> dict[str, float]:
+    # "auth;dur=1.2, db_fetch;dur=0.4" -> {"auth": 1.2, "db_fetch": 0.4}
+    entries = (part.strip().split(";dur=") for part in header.split(","))
+    return {name: float(dur) for name, dur in entries}
+
+
+def _audit(action: str) -> models.AuditLog:
+    with SessionLocal() as db:
+        return db.query(models.AuditLog).filter_by(action=action).one()
+
+
+def test_classify_returns_server_timing_and_audits_it(client, auth_headers, caplog):
+    headers = auth_headers(email="timing1@example.com")
+    r = client.post("/tickets", json={"subject": "VPN", "body": "cannot login to vpn"}, headers=headers)
+    ticket_id = r.json()["id"]
+
+    with caplog.at_level(logging.INFO, logger="app.api.request_context"):
+        r = client.post(f"/tickets/{ticket_id}/classify", headers={**headers, "X-Request-ID": "mail-42"})
+
+    assert r.status_code == 200
+    assert r.headers["X-Request-ID"] == "mail-42"
+    timing = _server_timing(r.headers["Server-Timing"])
+    assert {"auth", "db_fetch", "inference", "db_commit", "total"} <= set(timing)
+    assert timing["total"] >= timing["inference"]
+
+    audit = _audit("ticket.classify")
+    assert audit.request_id == "mail-42"
+    assert "timings=auth:" in audit.details and "inference:" in audit.details
+    assert any("request_id=mail-42" in m and "db_commit:" in m for m in caplog.messages)
+
+
+def test_invalid_request_id_is_replaced(client):
+    r = client.get("/health/live", headers={"X-Request-ID": "bad id\twith spaces"})
+    assert r.status_code == 200
+    assert r.headers["X-Request-ID"] != "bad id\twith spaces"
+    assert len(r.headers["X-Request-ID"]) == 36
+    assert _server_timing(r.headers["Server-Timing"]).keys() == {"total"}
+
+
+def test_answer_stream_audits_full_breakdown(client, auth_headers, monkeypatch):
+    headers = auth_headers(email="timing2@example.com")
+
+    def fake_rag_answer(question, k=3):
+        return {"answer": "Restart the VPN client.", "sources": [{"source": "kb/vpn.pdf", "snippet": "Restart"}]}
+
+    monkeypatch.setattr("app.api.routes.rag_answer", fake_rag_answer)
+    monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+
+    r = client.post("/tickets", json={"subject": "VPN", "body": "VPN is broken"}, headers=headers)
+    r = client.post(f"/tickets/{r.json()['id']}/answer/stream", headers={**headers, "X-Request-ID": "mail-43"})
+
+    done = list(iter_sse_events(r.text.splitlines()))[-1][1]
+    assert "auth:" in done["timings"] and "total:" in done["timings"]
+
+    audit = _audit("ticket.answer")
+    assert audit.request_id == "mail-43"
+    assert "answer_mode=extractive" in audit.details and "timings=auth:" in audit.details
+
+
+def test_timings_are_noops_outside_a_request():
+    record_timing("inference", 0.5)
+    assert format_timings() == ""
+
+    token = start_request("job-1")
+    try:
+        record_timing("inference", 0.002)
+        record_timing("inference", 0.001)
+        assert format_timings().startswith("inference:3.0,total:")
+    finally:
+        end_request(token)
@@ -0,0 +1,39 @@
+import time
+
+from app.rag.rerank import Reranker, rerank
+
+
+class Doc:
+    def __init__(self, text):
+        self.page_content = text
+        self.metadata = {}
+
+
+def _keyword_scores(pairs):
+    # Fake cross-encoder: relevance = how often the query's last word appears
+    return [text.count(query.split()[-1]) for query, text in pairs]
+
+
+def test_rerank_reorders_candidates_within_budget():
+    docs = [Doc("printer setup"), Doc("vpn client"), Doc("vpn vpn error 812"), Doc("billing")]
+
+    ranked, reranked = rerank("issue with vpn", docs, k=2, budget_ms=1000, reranker=Reranker(_keyword_scores))
+
+    assert reranked is True
+    assert [d.page_content for d in ranked] == ["vpn vpn error 812", "vpn client"]
+
+
+def test_rerank_keeps_retrieval_order_when_over_budget():
+    def slow_scores(pairs):
+        time.sleep(0.02)
+        return _keyword_scores(pairs)
+
+    reranker = Reranker(slow_scores, batch_size=2)
+    docs = [Doc("printer setup"), Doc("vpn client"), Doc("vpn vpn error 812"), Doc("billing")]
+
+    # First batch measures the cost; the second would not fit in 25 ms
+    ranked, reranked = rerank("issue with vpn", docs, k=2, budget_ms=25, reranker=reranker)
+
+    assert reranked is False
+    assert [d.page_content for d in ranked] == ["printer setup", "vpn client"]
+    assert reranker.seconds_per_pair is not None
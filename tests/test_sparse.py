@@ -0,0 +1,23 @@
+from app.rag.sparse import BM25Index, reciprocal_rank_fusion, tokenize, write_sparse_index
+
+
+def test_tokenize_keeps_codes_and_ids():
+    assert tokenize("VPN error 812 (0x80070005), policy SEC-12.3") == ["vpn", "error", "812", "0x80070005", "policy", "sec-12.3"]
+
+
+def test_bm25_ranks_rare_exact_term_first(tmp_path):
+    texts = ["vpn connection steps", "vpn error 812 blocked by policy", "vpn client install", "printer setup"]
+    write_sparse_index(tmp_path, texts)
+    index = BM25Index.load(tmp_path)
+
+    assert index.search("vpn 812", k=2)[0] == 1
+    assert index.search("unknown words", k=2) == []
+
+
+def test_reciprocal_rank_fusion_weights_both_rankings():
+    dense, sparse = [1, 2, 3], [3, 4]
+
+    assert reciprocal_rank_fusion(dense, sparse, sparse_weight=0.0)[:3] == [1, 2, 3]
+    # 3 is in both lists, so it wins once BM25 has equal say
+    assert reciprocal_rank_fusion(dense, sparse, sparse_weight=0.5)[0] == 3
+    assert reciprocal_rank_fusion(dense, sparse, sparse_weight=1.0)[:2] == [3, 4]
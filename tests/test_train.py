@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml import train
+from app.ml.registry import ModelRegistry
+
+SAMPLE = Path("data/sample_tickets.csv").resolve()
+
+
+def _repeated_csv(tmp_path, times=20) -> str:
+    path = tmp_path / "tickets.csv"
+    pd.concat([pd.read_csv(SAMPLE)] * times).to_csv(path, index=False)
+    return str(path)
+
+
+def test_streaming_training_folds_in_parallel(tmp_path):
+    data = _repeated_csv(tmp_path)
+
+    model, payload = train.train_streaming(data_path=data, chunksize=100, n_splits=3, n_jobs=2, epochs=3)
+
+    assert payload["mode"] == "streaming"
+    assert payload["n_samples"] == 48 * 20
+    assert payload["n_jobs"] == 2
+    assert sum(payload["report"][c]["support"] for c in ("access", "billing", "general", "incident")) == 48 * 20
+    assert payload["macro_f1"] > 0.5
+    assert list(model.predict(["VPN connection fails with error 812"])) == ["access"]
+
+
+def test_streaming_training_needs_a_row_per_fold(tmp_path):
+    data = tmp_path / "tiny.csv"
+    pd.read_csv(SAMPLE).groupby("category").head(1).head(3).to_csv(data, index=False)
+
+    with pytest.raises(ValueError, match="n_splits=5 rows .* found 3"):
+        train.train_streaming(data_path=str(data), n_splits=5, n_jobs=1)
+
+    # A fold with no rows predicts nothing rather than failing to concatenate
+    classes = np.array(sorted(pd.read_csv(data)["category"]))
+    y_true, y_pred = train._fit_streaming("csv", str(data), 100, classes, 2**10, 5, holdout=4, epochs=1)
+    assert y_true.size == y_pred.size == 0
+
+
+def test_streaming_cli_writes_timings_and_publishes(tmp_path, monkeypatch):
+    data = _repeated_csv(tmp_path, times=5)
+    monkeypatch.chdir(tmp_path)
+
+    train.main(["--streaming", "--data", data, "--chunksize", "64", "--n-jobs", "1", "--n-splits", "3"])
+
+    metrics = json.loads((tmp_path / "reports" / "metrics.json").read_text(encoding="utf-8"))
+    assert metrics["wall_seconds"] > 0
+    assert set(metrics["peak_memory_mb"]) == {"main", "workers"}
+
+    registry = ModelRegistry(tmp_path / "models")
+    version = registry.current_version()
+    assert version.startswith(train.STREAMING_FAMILY)
+    assert registry.metadata(version)["metrics"]["mode"] == "streaming"
+    assert "ticket_clf.fast" not in registry.metadata(version)["files"]
@@ -0,0 +1,69 @@
+from app.core import warmup
+
+
+def _use_components(monkeypatch, components):
+    monkeypatch.setattr(warmup, "COMPONENTS", components)
+    monkeypatch.setattr(warmup, "_finished", warmup.threading.Event())
+    monkeypatch.setattr(warmup, "_components", {})
+    monkeypatch.setenv("WARMUP_RETRY_DELAY_SECONDS", "0")
+
+
+def test_ready_turns_green_after_warmup(client, monkeypatch):
+    calls = []
+    _use_components(monkeypatch, [
+        ("classifier_model", lambda: calls.append("model")),
+        ("reranker", lambda: "skipped"),
+    ])
+
+    assert client.get("/health/live").status_code == 200
+    assert client.get("/health/ready").status_code == 503
+
+    warmup.run_warmup()
+
+    r = client.get("/health/ready")
+    assert r.status_code == 200
+    components = r.json()["components"]
+    assert calls == ["model"]
+    assert components["classifier_model"]["status"] == "ok"
+    assert components["classifier_model"]["seconds"] >= 0
+    assert components["reranker"]["status"] == "skipped"
+
+
+def test_failed_component_keeps_readiness_red_after_retries(client, monkeypatch):
+    calls = []
+
+    def failing():
+        calls.append("embeddings")
+        raise RuntimeError("model file corrupt")
+
+    _use_components(monkeypatch, [("classifier_model", lambda: None), ("embeddings", failing)])
+    monkeypatch.setenv("WARMUP_RETRIES", "2")
+
+    warmup.run_warmup()
+
+    r = client.get("/health/ready")
+    assert r.status_code == 503
+    components = r.json()["components"]
+    assert components["classifier_model"]["status"] == "ok"
+    assert components["embeddings"]["status"] == "error"
+    assert components["embeddings"]["attempts"] == 3
+    assert "model file corrupt" in components["embeddings"]["error"]
+    assert len(calls) == 3
+
+
+def test_component_that_recovers_on_retry_is_ready(client, monkeypatch):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("blob storage timeout")
+
+    _use_components(monkeypatch, [("faiss_index", flaky)])
+
+    warmup.run_warmup()
+
+    r = client.get("/health/ready")
+    assert r.status_code == 200
+    component = r.json()["components"]["faiss_index"]
+    assert (component["status"], component["attempts"]) == ("ok", 2)
@@ -1,3 +1,5 @@
+import json
+
 import requests
 import streamlit as st
 import os
@@ -83,6 +85,40 @@ def login_user(email: str, password: str) -> bool:
     return False
 
 
+def stream_answer(ticket_id: str, headers: dict, state: dict):
+    """
+    Consume /tickets/{id}/answer/stream (Server-Sent Events).
+    Yields answer text chunks for st.write_stream; sources and answer mode are stored in `state`.
+    """
+    with requests.post(
+        f"{API_BASE}/tickets/{ticket_id}/answer/stream",
+        headers={**headers, "Accept": "text/event-stream"},
+        timeout=60,
+        stream=True,
+    ) as response:
+        if response.status_code != 200:
+            state["error"] = response.text
+            return
+
+        event, data_lines = "message", []
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[len("data:"):].strip())
+            elif line == "" and data_lines:
+                data = json.loads("\n".join(data_lines))
+                if event == "sources":
+                    state["sources"] = data["sources"]
+                elif event == "token":
+                    yield data["text"]
+                elif event == "done":
+                    state["answer_mode"] = data["answer_mode"]
+                elif event == "error":
+                    state["error"] = data.get("detail", "Answer generation failed")
+                event, data_lines = "message", []
+
+
 def logout_user() -> None:
     """
     Clear the current session authentication state.
@@ -224,20 +260,6 @@ if analyze:
 
     cls = cls_resp.json()
 
-    # Step 3: Generate grounded answer
-    with st.spinner("Generating grounded response..."):
-        ans_resp = requests.post(
-            f"{API_BASE}/tickets/{ticket_id}/answer",
-            headers=headers,
-            timeout=60,
-        )
-
-    if ans_resp.status_code != 200:
-        st.error(f"Failed to generate suggested response: {ans_resp.text}")
-        st.stop()
-
-    ans = ans_resp.json()
-
     # Save ticket summary in session history
     st.session_state.ticket_history.append(
         {
@@ -248,20 +270,27 @@ if analyze:
         }
     )
 
-    st.success("Ticket analyzed successfully.")
-
     st.subheader("Ticket Details")
     st.code(ticket_id, language=None)
 
     metric_col1, metric_col2, metric_col3 = st.columns(3)
     metric_col1.metric("Category", cls["category"])
     metric_col2.metric("Priority", cls["priority"])
-    metric_col3.metric("Answer Mode", ans.get("answer_mode", "unknown"))
+    answer_mode_slot = metric_col3.empty()
 
+    # Step 3: Generate grounded answer (streamed as it is generated)
     st.subheader("Suggested Response")
-    st.write(ans["suggested_answer"])
+    answer_state = {"sources": [], "answer_mode": "unknown"}
+    st.write_stream(stream_answer(ticket_id, headers, answer_state))
+
+    if "error" in answer_state:
+        st.error(f"Failed to generate suggested response: {answer_state['error']}")
+        st.stop()
+
+    answer_mode_slot.metric("Answer Mode", answer_state["answer_mode"])
+    st.success("Ticket analyzed successfully.")
 
     st.subheader("Knowledge Sources")
-    for idx, src in enumerate(ans["sources"], start=1):
+    for idx, src in enumerate(answer_state["sources"], start=1):
         with st.expander(f"Source {idx}: {src['source']}"):
-            st.write(src["snippet"])
\ No newline at end of file
+            st.write(src["snippet"])